@@ -0,0 +1,299 @@
+import json
+import hashlib
+import numpy as np
+from typing import Dict, Tuple
+
+from app.models.CalibrationColumns import CalibrationColumns, POLARIZATION_CODES
+
+# RNXC v2 二进制校准文件布局(全部小端，按64字节对齐):
+#
+#   [文件头 64B] 幻数'RNXC' + 版本(2) + 点数 + 元数据/列表偏移
+#   [列表 N×48B] 每列: 名称 + dtype + 偏移 + 字节数
+#   [元数据]     JSON(UTF-8)
+#   [列数据块]   freq/theta/.../reference_power为float64，polarization为int8编码
+#   [文件尾 32B] 前面所有字节的MD5 + 结束幻数'RNXE'
+#
+# 版本字节与v1位于同一偏移，读取时据此区分格式。
+# 列数据块可直接用np.memmap映射为数组，无需逐点解析，多个进程可只读共享同一文件。
+#
+# v1布局(只读): 幻数'RNXC' + 版本(1) + 4字节元数据长度 + JSON元数据 + 每点8个float32；
+# 元数据ref_power为'REFList'时每点额外包含float32参考功率和6字节极化字符串。
+
+MAGIC = b'RNXC'
+FOOTER_MAGIC = b'RNXE'
+VERSION = 2
+ALIGNMENT = 64
+
+HEADER_DTYPE = np.dtype([
+    ('magic', 'S4'),
+    ('version', 'u1'),
+    ('flags', 'u1'),
+    ('reserved', '<u2'),
+    ('count', '<u8'),           # 数据点数
+    ('table_offset', '<u8'),    # 列表偏移
+    ('column_count', '<u4'),    # 列数
+    ('meta_length', '<u4'),     # 元数据字节数
+    ('meta_offset', '<u8'),     # 元数据偏移
+    ('footer_offset', '<u8'),   # 文件尾偏移
+    ('padding', 'V16'),
+])
+
+COLUMN_ENTRY_DTYPE = np.dtype([
+    ('name', 'S24'),
+    ('dtype', 'S8'),
+    ('offset', '<u8'),
+    ('nbytes', '<u8'),
+])
+
+FOOTER_DTYPE = np.dtype([
+    ('md5', 'u1', (16,)),
+    ('magic', 'S4'),
+    ('padding', 'V12'),
+])
+
+COLUMN_DTYPES = {name: np.dtype('<f8') for name in CalibrationColumns.FLOAT_COLUMNS}
+COLUMN_DTYPES['polarization'] = np.dtype('i1')
+
+V1_POINT_DTYPE = np.dtype([(name, '<f4') for name in CalibrationColumns.FLOAT_COLUMNS[:8]])
+V1_REFLIST_POINT_DTYPE = np.dtype(V1_POINT_DTYPE.descr + [('reference_power', '<f4'), ('polarization', 'S6')])
+V1_HEADER_SIZE = 4 + 1 + 4
+
+
+def _align(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def is_v2(filepath: str) -> bool:
+    """根据文件头判断是否为v2格式"""
+    with open(filepath, 'rb') as f:
+        head = f.read(5)
+    return len(head) == 5 and head[:4] == MAGIC and head[4] == VERSION
+
+
+def write(filepath: str, columns: CalibrationColumns, meta: Dict) -> int:
+    """
+    将列式校准数据写入v2文件
+
+    整个文件先在一个NumPy缓冲区中组装(各列为整块赋值)，再一次写出
+
+    :param filepath: 目标文件路径
+    :param columns: 校准数据列
+    :param meta: 元数据(可JSON序列化)
+    :return: 写入的字节数
+    """
+    count = len(columns)
+    names = CalibrationColumns.COLUMNS
+    meta_bytes = json.dumps(meta).encode('utf-8')
+
+    # 计算布局
+    table_offset = HEADER_DTYPE.itemsize
+    meta_offset = table_offset + len(names) * COLUMN_ENTRY_DTYPE.itemsize
+    offset = _align(meta_offset + len(meta_bytes))
+    table = np.zeros(len(names), dtype=COLUMN_ENTRY_DTYPE)
+    for i, name in enumerate(names):
+        nbytes = count * COLUMN_DTYPES[name].itemsize
+        table[i] = (name.encode('ascii'), COLUMN_DTYPES[name].str.encode('ascii'), offset, nbytes)
+        offset = _align(offset + nbytes)
+    footer_offset = offset
+    total = footer_offset + FOOTER_DTYPE.itemsize
+
+    buffer = np.zeros(total, dtype=np.uint8)
+    header = buffer[:table_offset].view(HEADER_DTYPE)
+    header['magic'] = MAGIC
+    header['version'] = VERSION
+    header['count'] = count
+    header['table_offset'] = table_offset
+    header['column_count'] = len(names)
+    header['meta_length'] = len(meta_bytes)
+    header['meta_offset'] = meta_offset
+    header['footer_offset'] = footer_offset
+    buffer[table_offset:meta_offset] = table.view(np.uint8)
+    buffer[meta_offset:meta_offset + len(meta_bytes)] = np.frombuffer(meta_bytes, dtype=np.uint8)
+
+    for entry in table:
+        name = entry['name'].decode('ascii')
+        start = int(entry['offset'])
+        buffer[start:start + int(entry['nbytes'])].view(COLUMN_DTYPES[name])[:] = columns[name]
+
+    footer = buffer[footer_offset:].view(FOOTER_DTYPE)
+    footer['md5'] = np.frombuffer(hashlib.md5(buffer[:footer_offset]).digest(), dtype=np.uint8)
+    footer['magic'] = FOOTER_MAGIC
+
+    with open(filepath, 'wb') as f:
+        buffer.tofile(f)
+    return total
+
+
+def _parse_layout(buffer: np.ndarray) -> Tuple[np.void, np.ndarray]:
+    """
+    解析并检查文件头和列表(只做边界检查，不读取列数据)
+
+    :param buffer: 整个文件的uint8数组(通常为memmap)
+    :return: (文件头, 列表)
+    :raises ValueError: 文件结构无效
+    """
+    size = len(buffer)
+    if size < HEADER_DTYPE.itemsize + FOOTER_DTYPE.itemsize:
+        raise ValueError("文件过短")
+    header = buffer[:HEADER_DTYPE.itemsize].view(HEADER_DTYPE)[0]
+    if header['magic'] != MAGIC:
+        raise ValueError("无效的二进制文件格式")
+    if header['version'] != VERSION:
+        raise ValueError(f"不支持的版本号: {header['version']}")
+
+    footer_offset = int(header['footer_offset'])
+    if footer_offset + FOOTER_DTYPE.itemsize != size:
+        raise ValueError("文件大小与文件头不一致")
+    footer = buffer[footer_offset:].view(FOOTER_DTYPE)[0]
+    if footer['magic'] != FOOTER_MAGIC:
+        raise ValueError("缺少文件尾标记")
+
+    table_offset = int(header['table_offset'])
+    table_end = table_offset + int(header['column_count']) * COLUMN_ENTRY_DTYPE.itemsize
+    meta_end = int(header['meta_offset']) + int(header['meta_length'])
+    if table_end > footer_offset or meta_end > footer_offset:
+        raise ValueError("文件头偏移超出范围")
+    table = buffer[table_offset:table_end].view(COLUMN_ENTRY_DTYPE)
+
+    count = int(header['count'])
+    for entry in table:
+        name = entry['name'].decode('ascii')
+        start, nbytes = int(entry['offset']), int(entry['nbytes'])
+        if start % ALIGNMENT or start + nbytes > footer_offset:
+            raise ValueError(f"列{name}偏移无效")
+        if nbytes != count * np.dtype(entry['dtype'].decode('ascii')).itemsize:
+            raise ValueError(f"列{name}长度与点数不一致")
+    return header, table
+
+
+def _load_meta(buffer: np.ndarray, header: np.void) -> Dict:
+    start = int(header['meta_offset'])
+    return json.loads(buffer[start:start + int(header['meta_length'])].tobytes().decode('utf-8'))
+
+
+def read_meta(filepath: str) -> Dict:
+    """
+    读取并检查文件结构，只返回元数据
+
+    :raises ValueError: 文件结构无效
+    """
+    buffer = np.memmap(filepath, dtype=np.uint8, mode='r')
+    header, _ = _parse_layout(buffer)
+    return _load_meta(buffer, header)
+
+
+def read(filepath: str) -> Tuple[Dict, CalibrationColumns]:
+    """
+    以只读内存映射方式读取v2文件
+
+    各列直接映射为文件中的数组，不复制数据，读取耗时与点数无关
+
+    :param filepath: 文件路径
+    :return: (元数据, 校准数据列)
+    :raises ValueError: 文件结构无效
+    """
+    return _read_v2(np.memmap(filepath, dtype=np.uint8, mode='r'))
+
+
+def _read_v2(buffer: np.ndarray) -> Tuple[Dict, CalibrationColumns]:
+    """按列表把各列映射为数组视图"""
+    header, table = _parse_layout(buffer)
+
+    arrays = {}
+    for entry in table:
+        name = entry['name'].decode('ascii')
+        if name not in COLUMN_DTYPES:
+            continue  # 忽略未知列，便于向后扩展
+        start = int(entry['offset'])
+        arrays[name] = buffer[start:start + int(entry['nbytes'])].view(entry['dtype'].decode('ascii'))
+    if 'freq' not in arrays:
+        raise ValueError("缺少频率列")
+    return _load_meta(buffer, header), CalibrationColumns.from_arrays(**arrays)
+
+
+def verify_checksum(filepath: str) -> bool:
+    """校验文件尾记录的MD5(需要读取整个文件)"""
+    buffer = np.memmap(filepath, dtype=np.uint8, mode='r')
+    header, _ = _parse_layout(buffer)
+    footer_offset = int(header['footer_offset'])
+    footer = buffer[footer_offset:].view(FOOTER_DTYPE)[0]
+    return hashlib.md5(buffer[:footer_offset]).digest() == footer['md5'].tobytes()
+
+
+def _read_v1(buffer: np.ndarray) -> Tuple[Dict, CalibrationColumns]:
+    """
+    映射v1数据块为结构化数组，各列为字段视图(float32，不复制)
+
+    :raises ValueError: 文件结构无效
+    """
+    if len(buffer) < V1_HEADER_SIZE:
+        raise ValueError("文件过短")
+    meta_len = int.from_bytes(buffer[5:V1_HEADER_SIZE].tobytes(), 'little')
+    data_offset = V1_HEADER_SIZE + meta_len
+    if data_offset > len(buffer):
+        raise ValueError("元数据长度超出文件范围")
+    try:
+        meta = json.loads(buffer[V1_HEADER_SIZE:data_offset].tobytes().decode('utf-8'))
+    except (UnicodeDecodeError, json.JSONDecodeError):
+        raise ValueError("元数据JSON格式错误")
+
+    base_param = meta.get('base_param', {}) if isinstance(meta, dict) else {}
+    dtype = V1_REFLIST_POINT_DTYPE if base_param.get('ref_power') == 'REFList' else V1_POINT_DTYPE
+    block = buffer[data_offset:]
+    if len(block) % dtype.itemsize:
+        raise ValueError("数据大小不匹配")
+    records = block.view(dtype)
+
+    arrays = {name: records[name] for name in V1_POINT_DTYPE.names}
+    if dtype is V1_REFLIST_POINT_DTYPE:
+        arrays['reference_power'] = records['reference_power']
+        # 直接比较字节串得到极化编码，避免逐个解码字符串
+        codes = np.full(len(records), -1, dtype=np.int8)
+        for name, code in POLARIZATION_CODES.items():
+            codes[records['polarization'] == name.encode('ascii')] = code
+        arrays['polarization'] = codes
+    return meta, CalibrationColumns.from_arrays(**arrays)
+
+
+def load(filepath: str) -> Tuple[int, Dict, CalibrationColumns]:
+    """
+    读取v1或v2文件，只映射一次文件并只解析一次文件头
+
+    :param filepath: 文件路径
+    :return: (版本号, 元数据, 校准数据列)
+    :raises ValueError: 文件结构无效或版本不受支持
+    """
+    buffer = np.memmap(filepath, dtype=np.uint8, mode='r')
+    if len(buffer) < 5 or buffer[:4].tobytes() != MAGIC:
+        raise ValueError("无效的二进制文件格式")
+
+    version = int(buffer[4])
+    if version == 1:
+        meta, columns = _read_v1(buffer)
+    elif version == VERSION:
+        meta, columns = _read_v2(buffer)
+    else:
+        raise ValueError(f"不支持的版本号: {version}")
+    return version, meta, columns
+
+
+def read_header(filepath: str) -> Tuple[int, Dict, int]:
+    """
+    只读取文件头，用于建立索引等不需要数据的场合
+
+    :param filepath: 文件路径
+    :return: (版本号, 元数据, 数据点数)
+    :raises ValueError: 文件结构无效或版本不受支持
+    """
+    buffer = np.memmap(filepath, dtype=np.uint8, mode='r')
+    if len(buffer) < 5 or buffer[:4].tobytes() != MAGIC:
+        raise ValueError("无效的二进制文件格式")
+
+    version = int(buffer[4])
+    if version == VERSION:
+        header, _ = _parse_layout(buffer)
+        return version, _load_meta(buffer, header), int(header['count'])
+    if version == 1:
+        meta, columns = _read_v1(buffer)
+        return version, meta, len(columns)
+    raise ValueError(f"不支持的版本号: {version}")
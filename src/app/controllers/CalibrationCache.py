@@ -0,0 +1,158 @@
+import os
+import copy
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from app.controllers import CalibrationBinaryFormat
+from app.models.CalibrationColumns import CalibrationColumns
+
+
+class CalibrationCache:
+    """
+    已解析校准文件的LRU缓存
+
+    以(绝对路径, 修改时间, 文件大小)为键缓存元数据和列式数据，文件变化后旧条目自动失效。
+    按条目数和内存占用(内存映射的列不计入)双重限制容量，超出时淘汰最久未使用的条目。
+    可选地把解析过的CSV以RNXC v2格式落盘，进程重启后通过内存映射直接复用。
+    """
+
+    def __init__(self, max_entries: int = 32, max_bytes: int = 256 * 1024 * 1024,
+                 spill_min_points: int = 5000):
+        """
+        :param max_entries: 最多缓存的文件数
+        :param max_bytes: 缓存列数据的最大内存占用(字节)
+        :param spill_min_points: 点数达到该值的CSV才落盘
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.spill_min_points = spill_min_points
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[Tuple[int, int], Dict, CalibrationColumns]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(path: str) -> Tuple[str, Tuple[int, int]]:
+        stat = os.stat(path)
+        return os.path.abspath(path), (stat.st_mtime_ns, stat.st_size)
+
+    @staticmethod
+    def _spill_path(spill_dir: str, path: str) -> str:
+        return os.path.join(spill_dir, hashlib.sha1(path.encode('utf-8')).hexdigest() + ".bin")
+
+    def get(self, path: str, spill_dir: Optional[str] = None) -> Optional[Dict]:
+        """
+        获取缓存的解析结果
+
+        :param path: 校准文件路径
+        :param spill_dir: 落盘目录，内存未命中时尝试从该目录加载
+        :return: {'meta', 'data', 'columns'}，未命中返回None；
+                 每次返回元数据的副本和新的惰性数据点序列
+        """
+        try:
+            abspath, stamp = self._key(path)
+        except OSError:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(abspath)
+            if entry is not None and entry[0] == stamp:
+                self._entries.move_to_end(abspath)
+                self.hits += 1
+                return self._result(entry[1], entry[2])
+            if entry is not None:
+                self._evict(abspath)
+
+        loaded = self._load_spill(spill_dir, abspath, stamp) if spill_dir else None
+        with self._lock:
+            if loaded is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._insert(abspath, stamp, *loaded)
+            return self._result(*loaded)
+
+    def put(self, path: str, meta: Dict, columns: CalibrationColumns, spill_dir: Optional[str] = None):
+        """
+        缓存解析结果
+
+        :param path: 校准文件路径
+        :param meta: 解析得到的元数据(缓存其副本)
+        :param columns: 列式数据
+        :param spill_dir: 落盘目录，为None时不落盘
+        """
+        try:
+            abspath, stamp = self._key(path)
+        except OSError:
+            return
+        meta = copy.deepcopy(meta)
+        with self._lock:
+            self._insert(abspath, stamp, meta, columns)
+
+        if spill_dir and len(columns) >= self.spill_min_points and not abspath.lower().endswith('.bin'):
+            try:
+                os.makedirs(spill_dir, exist_ok=True)
+                spill_meta = {'meta': meta, 'source': {'path': abspath, 'mtime_ns': stamp[0], 'size': stamp[1]}}
+                CalibrationBinaryFormat.write(self._spill_path(spill_dir, abspath), columns, spill_meta)
+            except (OSError, TypeError, ValueError):
+                pass  # 落盘只是加速手段，失败不影响使用
+
+    def invalidate(self, path: Optional[str] = None, spill_dir: Optional[str] = None):
+        """
+        移除指定文件(或全部)的缓存
+
+        缓存的v2 BIN和落盘文件通过内存映射打开，文件被覆盖或移动前应先调用本方法释放映射
+
+        :param path: 校准文件路径，为None时清空全部缓存
+        :param spill_dir: 落盘目录，指定时同时删除该文件的落盘文件
+        """
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+                self._bytes = 0
+            else:
+                self._evict(os.path.abspath(path))
+        if path is not None and spill_dir:
+            try:
+                os.remove(self._spill_path(spill_dir, os.path.abspath(path)))
+            except OSError:
+                pass
+
+    def _insert(self, abspath: str, stamp: Tuple[int, int], meta: Dict, columns: CalibrationColumns):
+        self._evict(abspath)
+        self._entries[abspath] = (stamp, meta, columns)
+        self._bytes += columns.nbytes
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            self._evict(next(iter(self._entries)))
+
+    def _evict(self, abspath: str):
+        entry = self._entries.pop(abspath, None)
+        if entry is not None:
+            self._bytes -= entry[2].nbytes
+
+    @staticmethod
+    def _result(meta: Dict, columns: CalibrationColumns) -> Dict:
+        return {'meta': copy.deepcopy(meta), 'data': columns.points(), 'columns': columns}
+
+    def _load_spill(self, spill_dir: str, abspath: str, stamp: Tuple[int, int]):
+        """从落盘文件加载，源文件已变化的落盘文件会被删除"""
+        spill_path = self._spill_path(spill_dir, abspath)
+        if not os.path.exists(spill_path):
+            return None
+        try:
+            spill_meta, columns = CalibrationBinaryFormat.read(spill_path)
+            source = spill_meta.get('source', {})
+            if (source.get('path'), source.get('mtime_ns'), source.get('size')) == (abspath, *stamp):
+                return spill_meta['meta'], columns
+            del columns  # 先释放内存映射再删除过期的落盘文件
+            os.remove(spill_path)
+        except (OSError, ValueError, KeyError):
+            pass
+        return None
+
+
+# 进程内共享的缓存实例，所有CalibrationFileManager默认使用
+shared_cache = CalibrationCache()
@@ -0,0 +1,271 @@
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional
+
+from app.utils.FeedBands import FEED_BANDS
+
+
+class CalibrationCatalog:
+    """
+    校准文件目录索引(SQLite)
+
+    为校准目录下的每个CSV/BIN文件保存一行文件头摘要(频率范围、极化、参考功率、
+    设备序列号、点数)以及MD5校验结果。刷新时只对大小或修改时间发生变化的文件
+    重新读取文件头，查询无需打开任何校准文件。
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS calibrations (
+            path TEXT PRIMARY KEY,
+            filename TEXT NOT NULL,
+            format TEXT NOT NULL,
+            is_archived INTEGER NOT NULL DEFAULT 0,
+            size INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            indexed INTEGER NOT NULL DEFAULT 0,
+            created TEXT,
+            created_ts REAL,
+            operator TEXT,
+            polarization TEXT,
+            ref_power TEXT,
+            ref_powers TEXT,
+            start_ghz REAL,
+            stop_ghz REAL,
+            step TEXT,
+            points INTEGER,
+            antenna_model TEXT,
+            antenna_sn TEXT,
+            signal_gen_sn TEXT,
+            power_meter_sn TEXT,
+            version_notes TEXT,
+            md5 TEXT,
+            digest_verified INTEGER
+        );
+        CREATE INDEX IF NOT EXISTS idx_calibrations_created ON calibrations(created_ts);
+        CREATE INDEX IF NOT EXISTS idx_calibrations_freq ON calibrations(start_ghz, stop_ghz);
+    """
+
+    # 文件头摘要字段(由summarize回调提供)
+    SUMMARY_FIELDS = (
+        'created', 'created_ts', 'operator', 'polarization', 'ref_power', 'ref_powers',
+        'start_ghz', 'stop_ghz', 'step', 'points', 'antenna_model', 'antenna_sn',
+        'signal_gen_sn', 'power_meter_sn', 'version_notes', 'md5'
+    )
+
+    def __init__(self, db_path: str, summarize: Callable[[str], Optional[Dict]],
+                 log_callback: Optional[Callable[[str, str], None]] = None):
+        """
+        :param db_path: 索引数据库路径
+        :param summarize: 读取文件头摘要的回调，返回包含SUMMARY_FIELDS的字典，失败返回None
+        :param log_callback: 日志回调函数
+        """
+        self.db_path = db_path
+        self.summarize = summarize
+        self.log = log_callback if callable(log_callback) else (lambda msg, level="INFO": None)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._conn:
+            self._conn.executescript(self.SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    @staticmethod
+    def _stat(path: str):
+        stat = os.stat(path)
+        return stat.st_size, stat.st_mtime_ns
+
+    def _summary_row(self, path: str, size: int, mtime_ns: int) -> Dict:
+        """读取文件头摘要组成一行记录，无法解析的文件只记录文件信息"""
+        summary = None
+        try:
+            summary = self.summarize(path)
+        except Exception as e:
+            self.log(f"索引校准文件失败: {os.path.basename(path)} ({str(e)})", "WARNING")
+
+        row = {field: None for field in self.SUMMARY_FIELDS}
+        row.update({
+            'path': path,
+            'filename': os.path.basename(path),
+            'format': os.path.splitext(path)[1].lstrip('.').lower(),
+            'is_archived': int(os.path.basename(os.path.dirname(path)) == 'archive'),
+            'size': size,
+            'mtime_ns': mtime_ns,
+            'indexed': int(summary is not None),
+        })
+        if summary:
+            row.update({field: summary.get(field) for field in self.SUMMARY_FIELDS})
+        if row['created_ts'] is None:
+            row['created_ts'] = mtime_ns / 1e9
+        return row
+
+    def _upsert(self, row: Dict):
+        columns = ', '.join(row)
+        placeholders = ', '.join(f':{name}' for name in row)
+        updates = ', '.join(f'{name}=excluded.{name}' for name in row if name != 'path')
+        self._conn.execute(
+            f"INSERT INTO calibrations ({columns}) VALUES ({placeholders}) "
+            f"ON CONFLICT(path) DO UPDATE SET {updates}",
+            row
+        )
+
+    def refresh(self, paths: Iterable[str]) -> int:
+        """
+        增量刷新索引
+
+        大小和修改时间未变化的文件直接跳过；已不存在的文件从索引中移除
+
+        :param paths: 当前目录下的全部校准文件路径
+        :return: 重新读取文件头的文件数
+        """
+        start = time.perf_counter()
+        with self._lock:
+            known = {
+                row['path']: (row['size'], row['mtime_ns'], row['indexed'])
+                for row in self._conn.execute("SELECT path, size, mtime_ns, indexed FROM calibrations")
+            }
+
+            seen = set()
+            changed = 0
+            with self._conn:
+                for path in paths:
+                    path = os.path.abspath(path)
+                    seen.add(path)
+                    try:
+                        size, mtime_ns = self._stat(path)
+                    except OSError:
+                        continue
+                    if known.get(path) == (size, mtime_ns, 1):
+                        continue
+                    row = self._summary_row(path, size, mtime_ns)
+                    # 文件内容变化后之前的校验结果失效
+                    row['digest_verified'] = None
+                    self._upsert(row)
+                    changed += 1
+
+                removed = [(path,) for path in known if path not in seen]
+                if removed:
+                    self._conn.executemany("DELETE FROM calibrations WHERE path = ?", removed)
+
+        if changed or removed:
+            self.log(
+                f"校准目录索引已更新: {changed}个文件重新索引, {len(removed)}个文件移除 "
+                f"({(time.perf_counter() - start) * 1000:.0f} ms)", "DEBUG"
+            )
+        return changed
+
+    def get(self, path: str) -> Optional[Dict]:
+        """按路径获取索引记录"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM calibrations WHERE path = ?", (os.path.abspath(path),)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def record_digest(self, path: str, md5: Optional[str], verified: bool):
+        """
+        记录文件的MD5校验结果(文件尚未索引或已变化时先重新索引)
+
+        :param path: 文件路径
+        :param md5: 计算得到的MD5，为None时保留原记录
+        :param verified: 是否与文件尾记录一致
+        """
+        path = os.path.abspath(path)
+        size, mtime_ns = self._stat(path)
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT size, mtime_ns, indexed FROM calibrations WHERE path = ?", (path,)
+            ).fetchone()
+            if row is None or (row['size'], row['mtime_ns'], row['indexed']) != (size, mtime_ns, 1):
+                self._upsert(self._summary_row(path, size, mtime_ns))
+            self._conn.execute(
+                "UPDATE calibrations SET md5 = COALESCE(?, md5), digest_verified = ? WHERE path = ?",
+                (md5, int(verified), path)
+            )
+
+    def is_verified(self, path: str) -> bool:
+        """文件自上次校验通过后未发生变化"""
+        record = self.get(path)
+        if not record or not record['digest_verified']:
+            return False
+        try:
+            return (record['size'], record['mtime_ns']) == self._stat(path)
+        except OSError:
+            return False
+
+    def query(self, band: Optional[str] = None,
+              freq_ghz: Optional[float] = None,
+              polarization: Optional[str] = None,
+              ref_power: Optional[float] = None,
+              antenna_sn: Optional[str] = None,
+              since: Optional[datetime] = None,
+              until: Optional[datetime] = None,
+              text: Optional[str] = None,
+              file_format: Optional[str] = None,
+              archived: Optional[bool] = None,
+              limit: Optional[int] = None) -> List[Dict]:
+        """
+        查询校准文件，所有条件为与关系，结果按创建时间倒序
+
+        :param band: 馈源频段(X/KU/K/KA)，匹配频率范围与频段有重叠的文件
+        :param freq_ghz: 覆盖该频率的文件
+        :param polarization: 极化模式(THETA/PHI/DUAL)
+        :param ref_power: 参考功率(dBm)，匹配包含该参考功率的文件
+        :param antenna_sn: 天线序列号(包含匹配)
+        :param since: 创建时间下限
+        :param until: 创建时间上限
+        :param text: 文件名、操作员或版本说明中包含的文本
+        :param file_format: 'csv' 或 'bin'
+        :param archived: 只查询已归档(True)或未归档(False)的文件
+        :param limit: 最多返回条数
+        :return: 索引记录列表
+        """
+        clauses, params = [], []
+        if band:
+            if band.upper() not in FEED_BANDS:
+                raise ValueError(f"未知频段: {band}")
+            band_min, band_max = FEED_BANDS[band.upper()]
+            clauses.append("start_ghz <= ? AND stop_ghz >= ?")
+            params += [band_max, band_min]
+        if freq_ghz is not None:
+            clauses.append("start_ghz <= ? AND stop_ghz >= ?")
+            params += [freq_ghz, freq_ghz]
+        if polarization:
+            clauses.append("polarization = ?")
+            params.append(polarization.upper())
+        if ref_power is not None:
+            clauses.append("ref_powers LIKE ?")
+            params.append(f"%,{float(ref_power):.1f},%")
+        if antenna_sn:
+            clauses.append("antenna_sn LIKE ?")
+            params.append(f"%{antenna_sn}%")
+        if since is not None:
+            clauses.append("created_ts >= ?")
+            params.append(since.timestamp())
+        if until is not None:
+            clauses.append("created_ts <= ?")
+            params.append(until.timestamp())
+        if text:
+            clauses.append("(filename LIKE ? OR operator LIKE ? OR version_notes LIKE ?)")
+            params += [f"%{text}%"] * 3
+        if file_format:
+            clauses.append("format = ?")
+            params.append(file_format.lower())
+        if archived is not None:
+            clauses.append("is_archived = ?")
+            params.append(int(archived))
+
+        sql = "SELECT * FROM calibrations"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY created_ts DESC"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(sql, params)]
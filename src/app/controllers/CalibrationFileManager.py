@@ -7,13 +7,22 @@ import pandas as pd
 import hashlib
 import shutil
 import json
-import struct
+import mmap
+import sqlite3
 import threading
+import time
+import copy
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Tuple, Union
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from app.threads.CalibrationThread import CalibrationPoint
 from app.utils.SignalUnitConverter import SignalUnitConverter
 from app.widgets.CalibrationPanel.Model import CalibrationData
+from app.models.CalibrationColumns import CalibrationColumns, POLARIZATION_CODES
+from app.controllers.CalibrationWriteSession import CalibrationWriteSession
+from app.controllers import CalibrationBinaryFormat
+from app.controllers.CalibrationCatalog import CalibrationCatalog
+from app.controllers.CalibrationCache import shared_cache
 
 class CalibrationFileManager:
     """
@@ -33,6 +42,8 @@ class CalibrationFileManager:
         self.current_meta: Dict = {}
         self.data_points: List = []
         self._file_lock = threading.Lock()
+        self._columns = CalibrationColumns()  # 当前活动文件的数据点(用于BIN文件)
+        self._session: Optional[CalibrationWriteSession] = None  # 当前活动文件的写入会话
         self.points = 0
         
         os.makedirs(self.base_dir, exist_ok=True)
@@ -43,6 +54,15 @@ class CalibrationFileManager:
         # 创建必要的子目录
         for subdir in ["archive", "backup"]:
             os.makedirs(os.path.join(self.base_dir, subdir), exist_ok=True)
+        
+        # 校准文件目录索引(文件头摘要和MD5校验结果)
+        self.catalog = CalibrationCatalog(
+            os.path.join(self.base_dir, "catalog.sqlite3"), self._summarize_file, self.log
+        )
+        
+        # 已解析文件的共享缓存(进程内所有管理器共用)，较大的CSV解析结果落盘到cache目录
+        self.cache = shared_cache
+        self.cache_dir = os.path.join(self.base_dir, "cache")
 
     def _default_logger(self, msg: str, level: str = "INFO"):
         """默认日志记录器"""
@@ -57,35 +77,13 @@ class CalibrationFileManager:
         """将CSV数据写入BIN文件"""
         bin_path = self._generate_bin_filename(csv_path)
         
-        # 二进制文件结构：
-        # 头部: 4字节幻数(0x524E5843 'RNXC') + 1字节版本(1)
-        # 元数据: JSON格式的字符串(UTF-8编码)
-        # 数据: 每个数据点7个float32(频率 + 6个参数)
+        # 二进制文件结构(RNXC v2，详见CalibrationBinaryFormat):
+        # 固定文件头 + 列偏移表 + JSON元数据 + 64字节对齐的float64列数据块 + MD5文件尾
+        # v1文件(JSON头 + 每点8个float32)仍可读取
         
+        self._release_cached(bin_path)
         try:
-            with open(bin_path, 'wb') as f:
-                # 写入头部
-                f.write(b'RNXC')  # 幻数
-                f.write(bytes([1]))  # 版本号
-                
-                # 写入元数据
-                meta_json = json.dumps(self.current_meta).encode('utf-8')
-                f.write(len(meta_json).to_bytes(4, 'little'))  # 元数据长度
-                f.write(meta_json)  # 元数据内容
-                
-                # 写入数据点
-                for point in self._data_points:
-                    freq = round(point['freq'], 6)  # 确保频率保留6位小数
-                    data = [
-                        point['theta'], point['phi'],
-                        point['horn_gain'],
-                        point['theta_corrected'], point['phi_corrected'],
-                        point['theta_corrected_vm'], point['phi_corrected_vm']
-                    ]
-                    # 写入频率(1个float32)和7个参数(7个float32)
-                    f.write(struct.pack('f', freq))
-                    f.write(struct.pack('7f', *data))
-                
+            CalibrationBinaryFormat.write(bin_path, self._columns, self.current_meta)
             self.log(f"已生成二进制校准文件: {os.path.basename(bin_path)}", "INFO")
             return bin_path
         except Exception as e:
@@ -228,8 +226,15 @@ class CalibrationFileManager:
         # 计算总点数
         if freq_params.get("custom_freqs"):
             points = len(freq_params["custom_freqs"])
+        elif freq_params.get("step_ghz") == "Adaptive":
+            # 自适应采样的实际点数在扫描结束前未知，记录点数上限
+            points = freq_params.get("max_points", 0)
         else:
             points = int((freq_params['stop_ghz'] - freq_params['start_ghz']) / freq_params['step_ghz']) + 1
+        if (isinstance(ref_power, str) and '_' in ref_power
+                and not self._is_derived_notes(version_notes)):
+            # 多参考功率扫描: 每个频点对应多个参考功率数据行
+            points *= len(ref_power.split('_'))
 
         # 生成文件名
         step_str = "FreqList" if freq_params.get("step_ghz") == "FreqList" else f"{freq_params['step_ghz']}"
@@ -251,39 +256,17 @@ class CalibrationFileManager:
             'version_notes': version_notes,
             'file_format': 'csv+bin'
         }
-        self._data_points = []  # 重置数据点
+        self._columns = CalibrationColumns(points if isinstance(points, int) else 0)  # 重置数据点并预分配
         
-        # 生成文件头内容
-        header_content = self._generate_header()
-        
-        # 分割文件头内容为行
-        header_lines = header_content.split('\n')
-        
-        # 找到数据列标题行的位置（最后一行）
-        data_header_index = None
-        for i, line in enumerate(header_lines):
-            if line.startswith("Frequency,"):
-                data_header_index = i
-                break
-        
-        if data_header_index is not None:
-            # 在数据列标题行之前插入额外信息
-            insert_lines = []
-            if version_notes:
-                insert_lines.append(f"!VersionNotes: {version_notes}")
-            insert_lines.append(f"!BaseParams: {json.dumps(base_param)}")
-            
-            # 重新构建文件头内容
-            header_content = '\n'.join(
-                header_lines[:data_header_index] + 
-                insert_lines + 
-                [header_lines[data_header_index]] +
-                ['']
-            )
+        header_content = self._build_header()
         
-        # 写入文件
-        with self._file_lock, open(self.active_file, 'w', encoding='utf-8') as f:
-            f.write(header_content)
+        # 写入文件: 打开写入会话，直到finalize_calibration才关闭
+        self._release_cached(self.active_file)
+        with self._file_lock:
+            self._close_session()
+            self._session = CalibrationWriteSession(self.active_file)
+            self._session.write(header_content)
+            self._session.checkpoint()
         
         self.log(f"创建新校准文件: {filename}", "INFO")
         return self.active_file
@@ -301,175 +284,76 @@ class CalibrationFileManager:
         - 如果极化相同且所有数据相同，则去重
         - 如果极化不同，则合并为双极化数据
         2. 不同频率或参考功率的数据点全部保留
-        3. 自动剔除已经被合并过的文件(通过检查!VersionNotes: Merged calibration file)
+        3. 自动剔除已经被合并过的文件(通过文件头的VersionNotes判断)
+        
+        各文件并行加载，合并按(频率, 参考功率)分组后按极化透视，全程为列运算
         """
         if not file_paths:
             raise ValueError("至少需要一个校准文件")
         
-        # 检查并剔除已合并的文件
+        # 检查并剔除已合并的文件(只读取文件头，已索引且未变化的文件直接查询索引)
         filtered_file_paths = []
         for filepath in file_paths:
             try:
-                # 检查文件是否已经是合并文件
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    for line in f:
-                        if line.startswith('!VersionNotes:'):
-                            if 'Merged calibration file' in line:
-                                self.log(f"检测到已合并文件: {os.path.basename(filepath)}", "WARNING")
-                                self.log(f"跳过已合并的文件: {os.path.basename(filepath)}", "INFO")
-                                break
-                            else:
-                                filtered_file_paths.append(filepath)
-                                break
-                        elif not line.startswith('!'):  # 遇到数据行说明没有VersionNotes
-                            filtered_file_paths.append(filepath)
-                            break
+                if self._is_merged_file(filepath):
+                    self.log(f"检测到已合并文件: {os.path.basename(filepath)}", "WARNING")
+                    self.log(f"跳过已合并的文件: {os.path.basename(filepath)}", "INFO")
+                else:
+                    filtered_file_paths.append(filepath)
             except Exception as e:
                 self.log(f"检查文件{filepath}失败: {str(e)}", "WARNING")
-                continue
         
         if not filtered_file_paths:
             raise ValueError("没有有效的校准文件可以合并")
         
-        # 加载所有文件数据
-        all_data = []
+        # 并行加载所有文件(保持输入顺序，日志回到当前线程后输出)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=min(len(filtered_file_paths), os.cpu_count() or 1, 8)) as pool:
+            loaded = list(pool.map(self._load_in_worker, filtered_file_paths))
+        
+        frames = []
         all_meta = []
-        for filepath in filtered_file_paths:
-            file_data = self.load_calibration_file(filepath)
+        for filepath, (file_data, messages) in zip(filtered_file_paths, loaded):
+            for msg, level in messages:
+                self.log(msg, level)
             if file_data is None:
                 self.log(f"无法加载文件: {filepath}", "WARNING")
                 continue
-            
             all_meta.append(file_data['meta'])
-            for point in file_data['data']:
-                # 确保每个数据点包含参考功率和极化信息
-                if 'reference_power' not in point:
-                    ref_power = file_data['meta']['base_param'].get('ref_power', 0.0)
-                    if isinstance(ref_power, list):
-                        if len(ref_power) > 0:
-                            point['reference_power'] = ref_power[0]  # 取第一个值
-                        else:
-                            point['reference_power'] = 0.0  # 默认值
-                    else:
-                        point['reference_power'] = float(ref_power)  # 确保是float
-                
-                if 'polarization' not in point:
-                    point['polarization'] = file_data['meta']['base_param'].get('polarization', 'DUAL')
-                
-                all_data.append(point)
+            frames.append(self._merge_frame(file_data))
         
-        if not all_data:
+        frames = [frame for frame in frames if len(frame)]
+        if not frames:
             raise ValueError("没有有效数据可以合并")
         
-        # 数据合并处理
-        merged_data = {}
-        for point in all_data:
-            freq = round(point['freq'], 6)  # 频率作为键的一部分，保留6位小数
-            ref_power = round(point['reference_power'], 2)  # 参考功率作为键的一部分
-            key = (freq, ref_power)
-            
-            if key not in merged_data:
-                # 新数据点
-                merged_data[key] = {
-                    'theta': None,
-                    'phi': None,
-                    'horn_gain': point.get('horn_gain', 0.0),
-                    'theta_corrected': None,
-                    'phi_corrected': None,
-                    'theta_corrected_vm': None,
-                    'phi_corrected_vm': None,
-                    'polarizations': set(),
-                    'source_points': []
-                }
-            
-            # 记录极化信息
-            merged_data[key]['polarizations'].add(point['polarization'].upper())
-            merged_data[key]['source_points'].append(point)
-            
-            # 根据极化类型填充数据
-            pol = point['polarization'].upper()
-            if pol == 'THETA':
-                merged_data[key]['theta'] = point.get('theta', 0.0)
-                merged_data[key]['theta_corrected'] = point.get('theta_corrected', 0.0)
-                merged_data[key]['theta_corrected_vm'] = point.get('theta_corrected_vm', 0.0)
-            elif pol == 'PHI':
-                merged_data[key]['phi'] = point.get('phi', 0.0)
-                merged_data[key]['phi_corrected'] = point.get('phi_corrected', 0.0)
-                merged_data[key]['phi_corrected_vm'] = point.get('phi_corrected_vm', 0.0)
-            elif pol == 'DUAL':
-                # 如果是双极化数据，直接覆盖
-                merged_data[key]['theta'] = point.get('theta', 0.0)
-                merged_data[key]['phi'] = point.get('phi', 0.0)
-                merged_data[key]['theta_corrected'] = point.get('theta_corrected', 0.0)
-                merged_data[key]['phi_corrected'] = point.get('phi_corrected', 0.0)
-                merged_data[key]['theta_corrected_vm'] = point.get('theta_corrected_vm', 0.0)
-                merged_data[key]['phi_corrected_vm'] = point.get('phi_corrected_vm', 0.0)
-        
-        # 准备最终合并后的数据点
-        final_data = []
-        for key, data in merged_data.items():
-            freq, ref_power = key
-            
-            # 检查是否有完整的双极化数据
-            if data['theta'] is not None and data['phi'] is not None:
-                # 已有完整双极化数据
-                polarization = 'DUAL'
-            elif len(data['polarizations']) == 2:
-                # 合并两个单极化数据为双极化
-                polarization = 'DUAL'
-                
-                # 如果某个极化数据缺失，保持原值或设为0
-                if data['theta'] is None:
-                    data['theta'] = 0.0
-                    data['theta_corrected'] = 0.0
-                    data['theta_corrected_vm'] = 0.0
-                
-                if data['phi'] is None:
-                    data['phi'] = 0.0
-                    data['phi_corrected'] = 0.0
-                    data['phi_corrected_vm'] = 0.0
-            else:
-                # 保持单极化
-                polarization = data['polarizations'].pop() if data['polarizations'] else 'DUAL'
-            
-            final_data.append({
-                'freq': freq,
-                'theta': data['theta'] if data['theta'] is not None else 0.0,
-                'phi': data['phi'] if data['phi'] is not None else 0.0,
-                'horn_gain': data['horn_gain'],
-                'theta_corrected': data['theta_corrected'] if data['theta_corrected'] is not None else 0.0,
-                'phi_corrected': data['phi_corrected'] if data['phi_corrected'] is not None else 0.0,
-                'theta_corrected_vm': data['theta_corrected_vm'] if data['theta_corrected_vm'] is not None else 0.0,
-                'phi_corrected_vm': data['phi_corrected_vm'] if data['phi_corrected_vm'] is not None else 0.0,
-                'reference_power': ref_power,
-                'polarization': polarization
-            })
-        
-        # 按频率排序
-        final_data.sort(key=lambda x: x['freq'])
+        merged = self._merge_frames(pd.concat(frames, ignore_index=True))
+        self.log(
+            f"合并{len(frames)}个文件共{sum(len(f) for f in frames)}个数据点为{len(merged)}个数据点 "
+            f"({(time.perf_counter() - start) * 1000:.0f} ms)", "DEBUG"
+        )
         
         # 使用第一个文件的元数据作为基础
         base_meta = all_meta[0].copy()
         
         # 更新元数据中的关键字段
-        freqs = [p['freq'] for p in final_data]
-        ref_powers = list({p['reference_power'] for p in final_data})
-        polarizations = list({p['polarization'] for p in final_data})
+        freqs = merged['freq']
+        ref_powers = np.unique(merged['reference_power']).tolist()
+        polarizations = np.unique(merged.polarization_names()).tolist()
         
         # 构建新的元数据
         base_meta['freq_params'] = {
-            'start_ghz': min(freqs),
-            'stop_ghz': max(freqs),
+            'start_ghz': float(freqs[0]),
+            'stop_ghz': float(freqs[-1]),
             'step_ghz': 'FreqList',
-            'custom_freqs': sorted(freqs)
+            'custom_freqs': freqs.tolist()
         }
-        base_meta['points'] = len(final_data)
+        base_meta['points'] = len(merged)
         
         # 处理参考功率显示
         if len(ref_powers) == 1:
             ref_power_str = f"{ref_powers[0]:.1f}"
         else:
-            ref_power_str = '_'.join([f"{p:.1f}" for p in sorted(ref_powers)])
+            ref_power_str = '_'.join([f"{p:.1f}" for p in ref_powers])
         
         # 处理极化模式显示
         if len(polarizations) == 1:
@@ -491,7 +375,7 @@ class CalibrationFileManager:
             output_filename = (
                 f"RNX_Cal_{polarization_str}_"
                 f"RefPwr{ref_power_str}dBm_"
-                f"{min(freqs)}to{max(freqs)}GHz_"
+                f"{float(freqs[0])}to{float(freqs[-1])}GHz_"
                 f"stepFreqList_{timestamp}.csv"
             )
         
@@ -503,26 +387,227 @@ class CalibrationFileManager:
             version_notes="Merged calibration file from multiple sources"
         )
         
-        # 添加所有数据点
-        for point in final_data:
-            self.add_data_point(point['freq'], {
-                'theta': point['theta'],
-                'phi': point['phi'],
-                'horn_gain': point['horn_gain'],
-                'theta_corrected': point['theta_corrected'],
-                'phi_corrected': point['phi_corrected'],
-                'theta_corrected_vm': point['theta_corrected_vm'],
-                'phi_corrected_vm': point['phi_corrected_vm'],
-                'reference_power': point['reference_power'],
-                'polarization': point['polarization']
-            })
+        # 一次性写入所有数据点
+        self.add_data_columns(merged)
         
         # 完成校准
         archived_path = self.finalize_calibration("Merged calibration file from multiple sources")
         
         return archived_path
 
+    def _is_merged_file(self, filepath: str) -> bool:
+        """根据文件头的版本说明判断是否为合并生成的文件"""
+        record = self.catalog.get(filepath)
+        stat = os.stat(filepath)
+        if record and record['indexed'] and (record['size'], record['mtime_ns']) == (stat.st_size, stat.st_mtime_ns):
+            notes = record['version_notes']
+        else:
+            summary = self._summarize_file(filepath)
+            notes = summary.get('version_notes') if summary else None
+        return (notes or '').startswith('Merged calibration file')  # 修补文件的版本链中可能包含源文件的合并说明
+
+    def _load_in_worker(self, filepath: str) -> Tuple[Optional[Dict], List[Tuple[str, str]]]:
+        """
+        在工作线程中加载校准文件
+        使用管理器的浅拷贝，不改动当前管理器的状态；日志先缓存，由调用线程统一输出
+        
+        :return: (加载结果, [(日志内容, 级别), ...])
+        """
+        messages = []
+        worker = copy.copy(self)
+        worker.log = lambda msg, level="INFO": messages.append((msg, level))
+        try:
+            return worker.load_calibration_file(filepath), messages
+        except Exception as e:
+            messages.append((f"加载文件{filepath}失败: {str(e)}", "ERROR"))
+            return None, messages
+
+    @staticmethod
+    def _merge_frame(file_data: Dict) -> pd.DataFrame:
+        """
+        将单个文件的数据转换为合并用的DataFrame
+        未逐点记录的参考功率和极化使用文件基础参数
+        """
+        columns = file_data.get('columns')
+        if columns is None:
+            columns = CalibrationColumns.from_points(file_data['data'])
+        frame = pd.DataFrame({name: columns[name] for name in CalibrationColumns.COLUMNS})
+        
+        base_param = file_data['meta'].get('base_param', {})
+        ref_power = base_param.get('ref_power', 0.0)
+        if isinstance(ref_power, str) and '_' in ref_power:
+            ref_power = ref_power.split('_')
+        if isinstance(ref_power, (list, tuple)):
+            ref_power = ref_power[0] if ref_power else 0.0
+        try:
+            ref_power = float(ref_power)
+        except (TypeError, ValueError):
+            ref_power = 0.0
+        polarization = POLARIZATION_CODES.get(str(base_param.get('polarization', 'DUAL')).upper(), POLARIZATION_CODES['DUAL'])
+        
+        frame['reference_power'] = frame['reference_power'].fillna(ref_power)
+        frame['polarization'] = frame['polarization'].mask(frame['polarization'] < 0, polarization)
+        return frame
+
+    @staticmethod
+    def _merge_frames(frame: pd.DataFrame, horn_gain: str = 'first') -> CalibrationColumns:
+        """
+        按(频率, 参考功率)分组合并数据点
+        
+        - Theta字段取组内最后一个THETA或DUAL数据点，Phi字段取最后一个PHI或DUAL数据点
+        - 喇叭增益取组内第一个(horn_gain='first')或最后一个('last')数据点
+        - 同时有Theta和Phi数据的组合并为DUAL，否则保持单极化，缺失的字段填0
+        
+        :param frame: 全部文件数据点(按文件顺序拼接)
+        :param horn_gain: 喇叭增益的取值方式
+        :return: 按频率、参考功率排序的合并结果
+        """
+        keys = ['freq', 'reference_power']
+        frame['freq'] = frame['freq'].round(6)  # 频率保留6位小数
+        frame['reference_power'] = frame['reference_power'].round(2)
+        
+        theta_fields = ['theta', 'theta_corrected', 'theta_corrected_vm']
+        phi_fields = ['phi', 'phi_corrected', 'phi_corrected_vm']
+        pol = frame['polarization']
+        
+        # 按极化透视: DUAL数据点同时提供Theta和Phi两侧
+        merged = frame.drop_duplicates(keys, keep=horn_gain).set_index(keys)[['horn_gain']]
+        theta_side = frame[pol.isin([POLARIZATION_CODES['THETA'], POLARIZATION_CODES['DUAL']])]
+        phi_side = frame[pol.isin([POLARIZATION_CODES['PHI'], POLARIZATION_CODES['DUAL']])]
+        merged = merged.join(
+            theta_side.drop_duplicates(keys, keep='last').set_index(keys)[theta_fields].assign(has_theta=True)
+        ).join(
+            phi_side.drop_duplicates(keys, keep='last').set_index(keys)[phi_fields].assign(has_phi=True)
+        ).sort_index()
+        
+        has_theta = merged['has_theta'].notna().to_numpy()
+        has_phi = merged['has_phi'].notna().to_numpy()
+        polarization = np.where(
+            has_theta & has_phi, POLARIZATION_CODES['DUAL'],
+            np.where(has_theta, POLARIZATION_CODES['THETA'], POLARIZATION_CODES['PHI'])
+        )
+        
+        values = merged[theta_fields + phi_fields].fillna(0.0)
+        return CalibrationColumns.from_arrays(
+            freq=merged.index.get_level_values('freq').to_numpy(),
+            reference_power=merged.index.get_level_values('reference_power').to_numpy(),
+            horn_gain=merged['horn_gain'].to_numpy(),
+            polarization=polarization,
+            **{name: values[name].to_numpy() for name in theta_fields + phi_fields}
+        )
 
+    def patch_calibration(self, source_path: str, patch_path: str, tolerance_ghz: float = 1e-6) -> Tuple[str, str]:
+        """
+        用局部重测的数据替换已有校准文件中的对应数据点，生成新版本文件
+        
+        源文件中与重测数据频率(在容差内)和参考功率都相同的数据行被替换，
+        重测数据中源文件没有的频点直接加入，其余数据行按列原样复制。
+        新文件的版本说明记录源文件、重测文件以及源文件的版本说明。
+        
+        :param source_path: 原校准文件路径
+        :param patch_path: 局部重测得到的校准文件路径
+        :param tolerance_ghz: 频率匹配容差(GHz)
+        :return: (归档后的CSV文件路径, BIN文件路径)
+        """
+        source_data = self.load_calibration_file(source_path)
+        patch_data = self.load_calibration_file(patch_path)
+        if source_data is None or patch_data is None:
+            raise ValueError("无法加载源文件或重测文件")
+        
+        source = self._merge_frame(source_data)
+        patch = self._merge_frame(patch_data)
+        if not len(patch):
+            raise ValueError("重测文件没有数据点")
+        
+        # 源文件频点在容差内对齐到最近的重测频点，再按(频率, 参考功率)分组合并:
+        # 重测数据排在后面，同极化的字段被替换，另一极化的字段保留源文件数据
+        patch_freqs = np.unique(patch['freq'].to_numpy())
+        source_freqs = source['freq'].to_numpy()
+        index = np.clip(np.searchsorted(patch_freqs, source_freqs), 1, len(patch_freqs))
+        left = patch_freqs[index - 1]
+        right = patch_freqs[np.minimum(index, len(patch_freqs) - 1)]
+        nearest = np.where(np.abs(source_freqs - left) <= np.abs(right - source_freqs), left, right)
+        matched = np.abs(nearest - source_freqs) <= tolerance_ghz
+        source['freq'] = np.where(matched, nearest, source_freqs)
+        
+        source_keys = pd.MultiIndex.from_arrays([source['freq'].round(6), source['reference_power'].round(2)])
+        patch_keys = pd.MultiIndex.from_arrays([patch['freq'].round(6), patch['reference_power'].round(2)])
+        replaced = int(source_keys.isin(patch_keys).sum())
+        added = int((~patch_keys.unique().isin(source_keys)).sum())
+        
+        patched = self._merge_frames(pd.concat([source, patch], ignore_index=True), horn_gain='last')
+        
+        freqs = patched['freq']
+        ref_powers = np.unique(patched['reference_power']).tolist()
+        polarizations = np.unique(patched.polarization_names()).tolist()
+        base_meta = source_data['meta'].copy()
+        base_meta['freq_params'] = {
+            'start_ghz': float(freqs[0]),
+            'stop_ghz': float(freqs[-1]),
+            'step_ghz': 'FreqList',
+            'custom_freqs': freqs.tolist()
+        }
+        base_meta['base_param'] = {
+            **source_data['meta'].get('base_param', {}),
+            'ref_power': '_'.join(f"{p:.1f}" for p in ref_powers),
+            'polarization': polarizations[0] if len(polarizations) == 1 else 'DUAL'
+        }
+        
+        # 版本说明记录修补来源，保留源文件的版本说明形成版本链
+        patch_range = f"{patch['freq'].min():.3f}-{patch['freq'].max():.3f}GHz"
+        version_notes = (
+            f"Patched calibration file: {replaced} points replaced and "
+            f"{added} added in {patch_range} "
+            f"from {os.path.basename(patch_path)}, based on {os.path.basename(source_path)}"
+        )
+        source_notes = source_data['meta'].get('version_notes')
+        if source_notes:
+            version_notes += f" <- {source_notes}"
+        
+        self.create_new_calibration(
+            equipment_meta=base_meta,
+            freq_params=base_meta['freq_params'],
+            base_param=base_meta['base_param'],
+            version_notes=version_notes
+        )
+        self.add_data_columns(patched)
+        self.log(
+            f"校准文件修补: {os.path.basename(source_path)}中{replaced}个数据点被替换 ({patch_range})",
+            "INFO"
+        )
+        return self.finalize_calibration(f"Patched from {os.path.basename(patch_path)}")
+
+    def _build_header(self) -> str:
+        """生成完整文件头(标准文件头中插入版本说明和基础参数)"""
+        version_notes = self.current_meta.get('version_notes')
+        base_param = self.current_meta.get('base_param', {})
+        header_content = self._generate_header()
+        
+        # 分割文件头内容为行
+        header_lines = header_content.split('\n')
+        
+        # 找到数据列标题行的位置（最后一行）
+        data_header_index = None
+        for i, line in enumerate(header_lines):
+            if line.startswith("Frequency,"):
+                data_header_index = i
+                break
+        
+        if data_header_index is not None:
+            # 在数据列标题行之前插入额外信息
+            insert_lines = []
+            if version_notes:
+                insert_lines.append(f"!VersionNotes: {version_notes}")
+            insert_lines.append(f"!BaseParams: {json.dumps(base_param)}")
+            
+            # 重新构建文件头内容
+            header_content = '\n'.join(
+                header_lines[:data_header_index] + 
+                insert_lines + 
+                [header_lines[data_header_index]] +
+                ['']
+            )
+        return header_content
 
     def _generate_header(self) -> str:
         """生成标准文件头"""
@@ -595,17 +680,11 @@ class CalibrationFileManager:
                 self.log(f"数据超出范围: {key}={value}", "WARNING")
         
         # 存储数据点用于BIN文件
-        self._data_points.append({
-            'freq': round(freq_ghz, 6),  # 确保频率保留6位小数
-            **data
-        })
-        
-        # 判断是否为合并文件
-        is_merged_file = "merged" in self.current_meta.get('version_notes', '').lower()
+        self._columns.append_point(round(freq_ghz, 6), data)  # 确保频率保留6位小数
         
         # 格式化数据行
-        if is_merged_file:
-            # 合并文件包含reference_power和polarization
+        if self._has_extended_columns():
+            # 合并文件和多参考功率文件包含reference_power和polarization
             data_row = (
                 f"{freq_ghz:.6f},"
                 f"{data.get('theta', 0.0):.2f},"
@@ -632,14 +711,107 @@ class CalibrationFileManager:
             )
         
         # 写入数据（线程安全）
-        with self._file_lock, open(self.active_file, 'a', encoding='utf-8') as f:
-            f.write(data_row)
+        with self._file_lock:
+            self._session.write_row(data_row)
         
         return True
 
+    def add_data_columns(self, columns: CalibrationColumns) -> int:
+        """
+        批量添加数据点(合并等一次性生成全部数据的场景)
+        数据范围按列检查，数据行一次格式化后整块写入
+        
+        :param columns: 列式数据，极化编码必须有效
+        :return: 添加的数据点数
+        """
+        if not self.active_file:
+            raise RuntimeError("没有活动的校准文件")
+        if not len(columns):
+            return 0
+        
+        extended = self._has_extended_columns()
+        names = list(CalibrationColumns.FLOAT_COLUMNS[1:-1])
+        if extended:
+            names.append('reference_power')
+            if (columns['polarization'] < 0).any():
+                raise ValueError("数据点缺少极化模式")
+        
+        # 验证数据范围(假设合理范围是-100到100 dB)
+        for name in names:
+            out_of_range = np.count_nonzero(np.abs(columns[name]) > 100)
+            if out_of_range:
+                self.log(f"数据超出范围: {name}有{out_of_range}个数据点", "WARNING")
+        
+        freqs = np.round(columns['freq'], 6)  # 确保频率保留6位小数
+        rows = self._format_rows(columns, extended)
+        
+        # 存储数据点用于BIN文件
+        self._columns.extend(**{**{name: columns[name] for name in CalibrationColumns.COLUMNS}, 'freq': freqs})
+        
+        with self._file_lock:
+            self._session.write_rows(rows, len(columns))
+        
+        return len(columns)
+
+    @staticmethod
+    def _format_rows(columns: CalibrationColumns, extended: bool) -> str:
+        """将列式数据一次格式化为CSV数据行"""
+        names = list(CalibrationColumns.FLOAT_COLUMNS[1:-1])
+        if extended:
+            names.append('reference_power')
+        values = [np.round(columns['freq'], 6).tolist()] + [np.nan_to_num(columns[name]).tolist() for name in names]
+        if extended:
+            # 合并文件和多参考功率文件包含reference_power和polarization(未记录的与逐点写入一致记为DUAL)
+            polarizations = columns.polarization_names()
+            values.append(np.where(polarizations == '', 'DUAL', polarizations).tolist())
+            row_format = "%.6f,%.2f,%.2f,%.5f,%.2f,%.2f,%.2f,%.2f,%.2f,%s\n"
+        else:
+            row_format = "%.6f,%.2f,%.2f,%.5f,%.2f,%.2f,%.2f,%.2f\n"
+        return ''.join([row_format % row for row in zip(*values)])
+
+    def checkpoint(self):
+        """将活动文件已写入的数据刷新并同步到磁盘(校准中止或出错时调用)"""
+        with self._file_lock:
+            if self._session is not None:
+                self._session.checkpoint()
+
+    def close_session(self):
+        """
+        结束未完成的校准: 已写入的数据落盘后关闭活动文件的写入会话(校准中止或出错时调用)
+
+        文件保留在工作目录中(不写文件尾、不归档)，之后添加数据点会因没有活动文件而失败
+        """
+        with self._file_lock:
+            self._close_session()
+            self.active_file = None
+            self.active_bin_file = None
+            self.current_meta = {}
+
+    def _close_session(self):
+        """关闭当前写入会话(调用方需持有_file_lock)"""
+        if self._session is not None:
+            try:
+                self._session.close()
+            except OSError as e:
+                self.log(f"关闭校准文件失败: {str(e)}", "ERROR")
+            self._session = None
+
 
 
 
+    @staticmethod
+    def _is_derived_notes(version_notes: Optional[str]) -> bool:
+        """版本说明是否表明文件由合并或修补生成(频点列表已包含全部数据行)"""
+        notes = (version_notes or '').lower()
+        return 'merged' in notes or 'patched' in notes
+
+    def _has_extended_columns(self) -> bool:
+        """当前文件是否写入Reference_Power和Polarization列(合并/修补文件或多参考功率文件)"""
+        if self._is_derived_notes(self.current_meta.get('version_notes')):
+            return True
+        ref_power = self.current_meta.get('base_param', {}).get('ref_power')
+        return isinstance(ref_power, str) and '_' in ref_power
+
     def add_calibration_point(self, point: 'CalibrationPoint') -> bool:
         """
         添加校准点数据（完整实现，包含所有计算）
@@ -683,6 +855,10 @@ class CalibrationFileManager:
                 'theta_corrected_vm': round(theta_vm, 2),
                 'phi_corrected_vm': round(phi_vm, 2)
             }
+            if self._has_extended_columns():
+                # 多参考功率文件逐行记录参考功率和极化
+                data['reference_power'] = round(point.ref_power, 2)
+                data['polarization'] = self.current_meta.get('base_param', {}).get('polarization', 'DUAL').upper()
             
             return self.add_data_point(freq_ghz, data)
         
@@ -690,7 +866,80 @@ class CalibrationFileManager:
             self.log(f"计算校正值时出错: {str(e)}", "ERROR")
             return False
 
-    
+    def add_calibration_points(self, points: List['CalibrationPoint']) -> int:
+        """
+        批量添加校准点(计算公式与add_calibration_point相同)
+
+        校正值和V/M值按列一次计算，数据行通过add_data_columns整块写入
+
+        :param points: CalibrationPoint列表
+        :return: 添加的数据点数
+        """
+        if not points:
+            return 0
+        try:
+            converter = SignalUnitConverter()
+            freq_hz = np.array([point.freq_hz for point in points], dtype=np.float64)
+            theta = np.array([point.measured_theta for point in points], dtype=np.float64)
+            phi = np.array([point.measured_phi for point in points], dtype=np.float64)
+            horn_gain = np.array([point.horn_gain for point in points], dtype=np.float64)
+            distance = np.array([point.distance for point in points], dtype=np.float64)
+
+            # 计算基础校正值
+            theta_corrected = theta - horn_gain
+            phi_corrected = phi - horn_gain
+            for point, theta_value, phi_value in zip(points, theta_corrected.tolist(), phi_corrected.tolist()):
+                point.theta_corrected = theta_value
+                point.phi_corrected = phi_value
+
+            # 计算V/M校正值（考虑天线增益和距离）
+            theta_vm = converter.dbm_to_v_m_array(theta_corrected, freq_hz, distance)
+            phi_vm = converter.dbm_to_v_m_array(phi_corrected, freq_hz, distance)
+
+            arrays = {
+                'freq': freq_hz / 1e9,
+                'theta': np.round(theta, 2),
+                'phi': np.round(phi, 2),
+                'horn_gain': np.round(horn_gain, 5),
+                'theta_corrected': np.round(theta_corrected, 2),
+                'phi_corrected': np.round(phi_corrected, 2),
+                'theta_corrected_vm': np.round(theta_vm, 2),
+                'phi_corrected_vm': np.round(phi_vm, 2)
+            }
+            if self._has_extended_columns():
+                # 多参考功率文件逐行记录参考功率和极化
+                arrays['reference_power'] = np.round([point.ref_power for point in points], 2)
+                arrays['polarization'] = self.current_meta.get('base_param', {}).get('polarization', 'DUAL').upper()
+
+            return self.add_data_columns(CalibrationColumns.from_arrays(**arrays))
+
+        except Exception as e:
+            self.log(f"计算校正值时出错: {str(e)}", "ERROR")
+            return 0
+
+
+    def _sort_data_rows(self):
+        """
+        数据行按(频率, 参考功率)排序并记录实际点数(调用方需持有_file_lock)
+
+        自适应加密的补测点追加在文件末尾，且文件头只记录了点数上限；
+        顺序或点数与文件头不一致时按排序后的数据重写整个文件
+        """
+        columns = self._columns
+        freqs = columns['freq']
+        ref_powers = np.nan_to_num(columns['reference_power'])
+        order = np.lexsort((ref_powers, freqs))
+        in_order = bool((order == np.arange(len(order))).all())
+        if in_order and self.current_meta.get('points') == len(columns):
+            return
+        
+        self._columns = CalibrationColumns.from_arrays(**{name: columns[name][order] for name in CalibrationColumns.COLUMNS})
+        self.current_meta['points'] = len(columns)
+        self._close_session()
+        self._session = CalibrationWriteSession(self.active_file)
+        self._session.write(self._build_header())
+        self._session.write_rows(self._format_rows(self._columns, self._has_extended_columns()), len(columns))
+
     def finalize_calibration(self, notes: str = "") -> Tuple[str, str]:
         """
         完成校准并添加校验信息
@@ -701,16 +950,17 @@ class CalibrationFileManager:
         if not self.active_file:
             raise RuntimeError("没有活动的校准文件")
         
-        # 添加结束标记
-        with self._file_lock, open(self.active_file, 'a', encoding='utf-8') as f:
-            f.write(f"!EndOfData: {datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')}\n")
+        with self._file_lock:
+            self._sort_data_rows()
+            # 添加结束标记
+            self._session.write(f"!EndOfData: {datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')}\n")
             if notes:
-                f.write(f"!Notes: {notes}\n")
-        
-        # 生成MD5校验
-        file_hash = self._calculate_file_hash()
-        with open(self.active_file, 'a', encoding='utf-8') as f:
-            f.write(f"!MD5: {file_hash}\n")
+                self._session.write(f"!Notes: {notes}\n")
+            
+            # 生成MD5校验(写入过程中已累计)
+            file_hash = self._session.hexdigest()
+            self._session.write(f"!MD5: {file_hash}\n")
+            self._close_session()
         
         # 生成BIN文件
         bin_path = self._write_bin_file(self.active_file)
@@ -720,51 +970,154 @@ class CalibrationFileManager:
         # 归档文件
         archived_csv = self._archive_file()  # 归档CSV
         archived_bin = self._archive_file(bin_path) if bin_path else None  # 归档BIN
+        self._record_digest(archived_csv, file_hash, verified=True)
         
         self.active_file = None
         self.active_bin_file = None
         self.current_meta = {}
-        self._data_points = []
+        self._columns = CalibrationColumns()
         
         return archived_csv, archived_bin
 
-    def load_calibration_file(self, filepath: str) -> Optional[Dict]:
+    def load_calibration_file(self, filepath: str, verify_digest: bool = False,
+                              use_cache: bool = True) -> Optional[Dict]:
         """
         加载校准文件(支持CSV和BIN格式)
         
         :param filepath: 文件路径
+        :param verify_digest: 是否校验文件尾的MD5(文件未变化且已校验过时会跳过)
+        :param use_cache: 是否使用已解析文件缓存(文件修改时间和大小不变时直接复用)
         :return: 包含元数据和数据的字典，None表示失败
         """
         if not os.path.exists(filepath):
             self.log(f"文件不存在: {filepath}", "ERROR")
             return None
         
+        is_bin = filepath.lower().endswith('.bin')
+        if verify_digest:
+            verified = self.verify_bin_digest(filepath) if is_bin else self.verify_csv_digest(filepath)
+            if not verified:
+                # 校验值不一致但文件仍可解析时照常加载，只给出警告；无法解析时由下面返回None
+                self.log(f"{'BIN' if is_bin else 'CSV'}文件MD5校验失败，仍尝试加载: {filepath}", "WARNING")
+        
+        if use_cache:
+            cached = self.cache.get(filepath, spill_dir=self.cache_dir)
+            if cached is not None:
+                self.current_meta = cached['meta']
+                self.data_points = cached['data']
+                return cached
+        
         # 根据扩展名选择加载方式
-        if filepath.lower().endswith('.bin'):
-            return self._load_bin_file(filepath)
-        else:
-            return self._load_csv_file(filepath)
+        result = self._load_bin_file(filepath) if is_bin else self._load_csv_file(filepath)
+        
+        if result is not None and use_cache:
+            columns = result.get('columns')
+            if columns is None:
+                columns = CalibrationColumns.from_points(result['data'])
+            self.cache.put(filepath, result['meta'], columns, spill_dir=self.cache_dir)
+        return result
+
+    def verify_bin_digest(self, filepath: str) -> bool:
+        """
+        校验v2格式BIN文件尾的MD5(v1文件没有校验值，视为通过)
+        文件未变化且已校验通过时直接返回
+        """
+        if not CalibrationBinaryFormat.is_v2(filepath) or self.catalog.is_verified(filepath):
+            return True
+        try:
+            verified = CalibrationBinaryFormat.verify_checksum(filepath)
+        except ValueError as e:
+            self.log(f"BIN文件结构无效: {str(e)}", "WARNING")
+            return False
+        self._record_digest(filepath, None, verified)
+        return verified
+
+    def verify_csv_digest(self, filepath: str) -> bool:
+        """
+        校验CSV文件尾记录的MD5
+        通过mmap计算!MD5行之前全部内容的MD5；换行统一为LF后计算，
+        与记录值不一致时再按CRLF计算一次(Windows文本模式写出的文件记录的是CRLF内容的MD5)；
+        文件大小和修改时间与校验记录一致时直接返回上次结果
+        
+        :param filepath: CSV文件路径
+        :return: 校验是否通过(没有MD5行时视为通过并给出警告)
+        """
+        if self.catalog.is_verified(filepath):
+            return True
+        
+        if os.path.getsize(filepath) == 0:
+            return False
+        with open(filepath, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            md5_pos = mm.rfind(b'\n!MD5:') + 1
+            if md5_pos <= 0:
+                self.log(f"文件没有MD5校验行，跳过校验: {os.path.basename(filepath)}", "WARNING")
+                return True
+            line_end = mm.find(b'\n', md5_pos)
+            expected = mm[md5_pos + len(b'!MD5:'):line_end if line_end != -1 else len(mm)].decode('ascii').strip()
+            
+            view = memoryview(mm)
+            try:
+                if mm.find(b'\r', 0, md5_pos) == -1:
+                    body = None
+                    actual = hashlib.md5(view[:md5_pos]).hexdigest()
+                else:
+                    body = bytes(view[:md5_pos]).replace(b'\r\n', b'\n')
+                    actual = hashlib.md5(body).hexdigest()
+            finally:
+                view.release()
+            if actual != expected:
+                if body is None:
+                    body = mm[:md5_pos]
+                crlf = hashlib.md5(body.replace(b'\n', b'\r\n')).hexdigest()
+                if crlf == expected:
+                    actual = crlf
+        
+        verified = actual == expected
+        if not verified:
+            self.log(f"MD5不匹配: 记录{expected}, 实际{actual}", "WARNING")
+        self._record_digest(filepath, actual, verified)
+        return verified
+
+    def _record_digest(self, filepath: str, digest: Optional[str], verified: bool):
+        """在目录索引中记录文件MD5和校验结果，供后续加载跳过重复校验"""
+        try:
+            self.catalog.record_digest(filepath, digest, verified)
+        except (OSError, sqlite3.Error) as e:
+            self.log(f"记录MD5校验信息失败: {str(e)}", "WARNING")
         
     def _load_bin_file(self, bin_path: str) -> Optional[Dict]:
         """
         加载BIN格式校准文件
-        1. 先验证文件有效性
-        2. 再读取文件内容
+        只映射一次文件、只解析一次文件头，结构检查与读取在同一步完成
         """
-        # 先验证文件
-        if not self._validate_bin_file(bin_path):
+        try:
+            _, meta, columns = CalibrationBinaryFormat.load(bin_path)
+        except (OSError, ValueError) as e:
+            self.log(f"BIN文件验证失败: {bin_path} ({str(e)})", "ERROR")
+            return None
+        
+        if not self._validate_bin_meta(meta):
             self.log(f"BIN文件验证失败: {bin_path}", "ERROR")
             return None
         
-        # 验证通过后读取内容
-        return self._read_bin_content(bin_path)
+        return self._read_bin_content(meta, columns)
 
     def _load_csv_file(self, csv_path: str) -> Optional[Dict]:
         """
         加载CSV格式校准文件
+        优先使用单次读取的流式解析；数据行格式不规整(如多余的逗号、缺失字段)时
+        回退到兼容解析:
         1. 先验证文件有效性
         2. 再读取文件内容
         """
+        try:
+            return self._read_csv_streaming(csv_path)
+        except ValueError as e:
+            self.log(f"CSV数据格式不规整，使用兼容方式解析: {str(e)}", "DEBUG")
+        except Exception as e:
+            self.log(f"读取CSV文件失败: {str(e)}", "ERROR")
+            return None
+        
         # 先验证文件
         if not self._validate_csv_file(csv_path):
             self.log(f"CSV文件验证失败: {csv_path}", "ERROR")
@@ -773,189 +1126,105 @@ class CalibrationFileManager:
         # 验证通过后读取内容
         return self._read_csv_content(csv_path)
 
-    def _validate_bin_file(self, filepath: str) -> bool:
-        """
-        验证BIN格式校准文件结构是否有效
-        不解析具体内容，只检查文件格式和完整性
+    def _validate_bin_meta(self, meta: Dict) -> bool:
+        """验证BIN文件元数据中的基础参数"""
+        if 'base_param' not in meta:
+            self.log("缺少基础参数", "WARNING")
+            return False
+            
+        required_params = ['ref_power', 'polarization']
+        for param in required_params:
+            if param not in meta['base_param']:
+                self.log(f"缺少必需的基础参数: {param}", "WARNING")
+                return False
         
-        更新内容：
-        1. 支持验证ref_power为单个值或列表格式
-        2. 更新基础参数验证逻辑
-        """
-        try:
-            with open(filepath, 'rb') as f:
-                # 验证头部
-                magic = f.read(4)
-                if magic != b'RNXC':
-                    self.log("无效的二进制文件格式", "WARNING")
-                    return False
-                
-                version = ord(f.read(1))
-                if version != 1:
-                    self.log(f"不支持的版本号: {version}", "WARNING")
-                    return False
-                
-                # 读取元数据长度
-                meta_len = int.from_bytes(f.read(4), 'little')
-                meta_json = f.read(meta_len).decode('utf-8')
-                
-                # 验证元数据中的基础参数
-                try:
-                    meta = json.loads(meta_json)
-                    if 'base_param' not in meta:
-                        self.log("缺少基础参数", "WARNING")
-                        return False
-                        
-                    required_params = ['ref_power', 'polarization']
-                    for param in required_params:
-                        if param not in meta['base_param']:
-                            self.log(f"缺少必需的基础参数: {param}", "WARNING")
-                            return False
-                    
-                    # 验证ref_power格式
-                    ref_power = meta['base_param']['ref_power']
-                    if isinstance(ref_power, str) and '_' in ref_power:
-                        # 检查列表格式是否有效
-                        try:
-                            [float(p) for p in ref_power.split('_')]
-                        except ValueError:
-                            self.log("无效的ref_power列表格式", "WARNING")
-                            return False
-                    elif not isinstance(ref_power, (int, float, str)):
-                        self.log("ref_power必须是数字或字符串", "WARNING")
-                        return False
-                    
-                    # 验证极化模式
-                    if meta['base_param']['polarization'] not in ['THETA', 'PHI', 'DUAL']:
-                        self.log(f"无效的极化模式: {meta['base_param']['polarization']}", "WARNING")
-                        return False
-                        
-                except json.JSONDecodeError:
-                    self.log("元数据JSON格式错误", "WARNING")
-                    return False
-                    
-                # 检查数据点数量
-                file_size = os.path.getsize(filepath)
-                header_size = 4 + 1 + 4 + meta_len
-                data_size = file_size - header_size
-                
-                if data_size % 32 != 0:
-                    self.log("数据大小不匹配", "WARNING")
-                    return False
-                    
-                return True
-                
-        except Exception as e:
-            self.log(f"验证二进制文件失败: {str(e)}", "ERROR")
+        # 验证ref_power格式
+        ref_power = meta['base_param']['ref_power']
+        if isinstance(ref_power, str) and '_' in ref_power:
+            # 检查列表格式是否有效
+            try:
+                [float(p) for p in ref_power.split('_')]
+            except ValueError:
+                self.log("无效的ref_power列表格式", "WARNING")
+                return False
+        elif not isinstance(ref_power, (int, float, str)):
+            self.log("ref_power必须是数字或字符串", "WARNING")
             return False
+        
+        # 验证极化模式
+        if meta['base_param']['polarization'] not in ['THETA', 'PHI', 'DUAL']:
+            self.log(f"无效的极化模式: {meta['base_param']['polarization']}", "WARNING")
+            return False
+        
+        return True
 
 
-    def _read_bin_content(self, bin_path: str) -> Optional[Dict]:
+    def _read_bin_content(self, meta: Dict, columns: CalibrationColumns) -> Optional[Dict]:
         """
-        读取已验证的BIN文件内容
-        假设文件已经通过验证，直接解析内容
+        整理已映射的BIN文件内容
         
         更新内容：
         1. 支持读取多个参考功率和极化模式的数据
-        2. 保持与CSV文件相同的数据结构
+        2. 保持与CSV文件相同的数据结构('data'为按需构建字典的惰性序列)
+        3. 返回结果额外包含列式数据'columns'(内存映射视图，不复制)
         """
         try:
-            with open(bin_path, 'rb') as f:
-                # 跳过已验证的头部
-                f.read(4)  # 幻数
-                f.read(1)  # 版本
-                meta_len = int.from_bytes(f.read(4), 'little')
-                meta_json = f.read(meta_len).decode('utf-8')
-                meta = json.loads(meta_json)
-
-
-                # 处理ref_power可能是列表的情况
-                if 'base_param' in meta and 'ref_power' in meta['base_param']:
-                    if isinstance(meta['base_param']['ref_power'], str) and '_' in meta['base_param']['ref_power']:
-                        # 处理类似"-30_-20"的格式
-                        meta['base_param']['ref_power'] = [
-                            float(p) for p in meta['base_param']['ref_power'].split('_')
-                        ]
-                    elif isinstance(meta['base_param']['ref_power'], (int, float)):
-                        # 单个值转换为列表
-                        meta['base_param']['ref_power'] = [float(meta['base_param']['ref_power'])]
-                
-                # 验证基础参数完整性
-                if 'base_param' not in meta:
-                    self.log("BIN文件缺少基础参数", "ERROR")
-                    return None
-                    
-                required_params = ['ref_power', 'polarization']
-                for param in required_params:
-                    if param not in meta['base_param']:
-                        self.log(f"BIN文件缺少必需的基础参数: {param}", "ERROR")
-                        return None
+            data_points = columns.points()
+
+            # 处理ref_power可能是列表的情况
+            if 'base_param' in meta and 'ref_power' in meta['base_param']:
+                if isinstance(meta['base_param']['ref_power'], str) and '_' in meta['base_param']['ref_power']:
+                    # 处理类似"-30_-20"的格式
+                    meta['base_param']['ref_power'] = [
+                        float(p) for p in meta['base_param']['ref_power'].split('_')
+                    ]
+                elif isinstance(meta['base_param']['ref_power'], (int, float)):
+                    # 单个值转换为列表
+                    meta['base_param']['ref_power'] = [float(meta['base_param']['ref_power'])]
+            
+            # 验证基础参数完整性
+            if 'base_param' not in meta:
+                self.log("BIN文件缺少基础参数", "ERROR")
+                return None
                 
-                # 验证极化模式
-                if meta['base_param']['polarization'] not in ['THETA', 'PHI', 'DUAL']:
-                    self.log(f"BIN文件无效的极化模式: {meta['base_param']['polarization']}", "ERROR")
+            required_params = ['ref_power', 'polarization']
+            for param in required_params:
+                if param not in meta['base_param']:
+                    self.log(f"BIN文件缺少必需的基础参数: {param}", "ERROR")
                     return None
-                    
-                # 读取数据点
-                data_points = []
-                while True:
-                    freq_bytes = f.read(4)
-                    if not freq_bytes:
-                        break
-                    
-                    freq = struct.unpack('f', freq_bytes)[0]
-                    data = struct.unpack('7f', f.read(28))  # 7个float32=28字节
-                    
-                    # 检查是否有额外的参考功率和极化数据
-                    extra_data = {}
-                    if meta['base_param'].get('ref_power') == 'REFList':
-                        # 读取额外的参考功率和极化数据
-                        ref_power = struct.unpack('f', f.read(4))[0]
-                        polarization = f.read(6).decode('utf-8').strip('\x00')
-                        extra_data = {
-                            'reference_power': ref_power,
-                            'polarization': polarization
-                        }
-                    
-                    data_points.append({
-                        'freq': freq,
-                        'theta': data[0],
-                        'phi': data[1],
-                        'horn_gain': data[2],
-                        'theta_corrected': data[3],
-                        'phi_corrected': data[4],
-                        'theta_corrected_vm': data[5],
-                        'phi_corrected_vm': data[6],
-                        **extra_data
-                    })
-                
-                # 确保元数据包含所有必需字段
-                if 'operator' not in meta:
-                    meta['operator'] = '未知'
-                if 'environment' not in meta:
-                    meta['environment'] = (0.0, 0.0)
-                if 'freq_params' not in meta:
-                    # 从数据点推断频率参数
-                    freqs = [p['freq'] for p in data_points]
-                    meta['freq_params'] = {
-                        'start_ghz': min(freqs),
-                        'stop_ghz': max(freqs),
-                        'step_ghz': 'FreqList' if len(freqs) > 1 else 0.0,
-                        'custom_freqs': sorted(freqs)
-                    }
+            
+            # 验证极化模式
+            if meta['base_param']['polarization'] not in ['THETA', 'PHI', 'DUAL']:
+                self.log(f"BIN文件无效的极化模式: {meta['base_param']['polarization']}", "ERROR")
+                return None
                 
-                self.current_meta = meta
-                self.data_points = data_points
-                return {
-                    'meta': meta,
-                    'data': data_points
+            # 确保元数据包含所有必需字段
+            if 'operator' not in meta:
+                meta['operator'] = '未知'
+            if 'environment' not in meta:
+                meta['environment'] = (0.0, 0.0)
+            if 'freq_params' not in meta:
+                # 从数据点推断频率参数
+                freqs = np.sort(columns['freq'])
+                meta['freq_params'] = {
+                    'start_ghz': float(freqs[0]),
+                    'stop_ghz': float(freqs[-1]),
+                    'step_ghz': 'FreqList' if len(freqs) > 1 else 0.0,
+                    'custom_freqs': freqs.tolist()
                 }
-                
+            
+            self.current_meta = meta
+            self.data_points = data_points
+            return {
+                'meta': meta,
+                'data': data_points,
+                'columns': columns
+            }
+            
         except Exception as e:
             self.log(f"读取二进制文件内容失败: {str(e)}", "ERROR")
             return None
 
-
     def _validate_csv_file(self, filepath: str) -> bool:
         """
         验证CSV格式校准文件结构是否有效
@@ -980,21 +1249,8 @@ class CalibrationFileManager:
                 self.log("无效的文件头", "WARNING")
                 return False
                 
-            # 定义必需的头字段（更新后）
-            REQUIRED_HEADERS = {
-                "!Created:", "!Operator:", 
-                "!Base Parameters:", "!  Reference_Power:", "!  Polarization:", "!  Distance:",
-                "!Equipment:", "!  Signal_Generator:", "!  Spectrum_Analyzer:", "!  Antenna:", 
-                "!Environment:", "!Frequency:", "!  Start:", "!  Stop:", 
-                "!  Step:", "!  Points:", "!Data Columns:"
-            }
-            
-            # 检查所有必需字段是否存在
             header_lines = [line.strip() for line in lines if line.startswith("!")]
-            missing_headers = [h for h in REQUIRED_HEADERS if not any(l.startswith(h) for l in header_lines)]
-            
-            if missing_headers:
-                self.log(f"文件头缺少必需字段: {', '.join(missing_headers)}", "WARNING")
+            if not self._validate_csv_header(header_lines):
                 return False
             
             # 检查数据部分标题行
@@ -1012,45 +1268,6 @@ class CalibrationFileManager:
                 self.log("缺少MD5校验", "WARNING")
                 return False
                 
-            # 检查基础参数JSON格式
-            base_params_lines = [line for line in header_lines if line.startswith("!BaseParams:")]
-            if base_params_lines:
-                try:
-                    # 尝试解析JSON，处理可能的格式问题
-                    base_params_str = base_params_lines[0].split(':', 1)[1].strip()
-
-                    # 处理可能的引号问题
-                    if base_params_str.startswith('"') and base_params_str.endswith('"'):
-                        base_params_str = base_params_str[1:-1]
-                    # 尝试解析JSON
-                    try:
-                        base_params = json.loads(base_params_str)
-                    except json.JSONDecodeError:
-                        self.log("检查校准参数是否被改动", "ERROR")
-                        base_params_str = base_params_str.replace(' "', '"').replace('",', ',').replace('""', '"').replace('}"', '}')
-                        base_params = json.loads(base_params_str)
-                        self.log("宽松解析成功", "DEBUG")
-                    # 验证ref_power格式
-                    if 'ref_power' in base_params:
-                        ref_power = base_params['ref_power']
-                        if isinstance(ref_power, str) and '_' in ref_power:
-                            try:
-                                ref_power = [float(p) for p in ref_power.split('_')]
-                                self.log(f"解析的ref_power列表: {ref_power}", "DEBUG")
-                            except ValueError:
-                                self.log("无效的ref_power列表格式", "WARNING")
-                                return False
-                        elif not isinstance(ref_power, (int, float, str)):
-                            self.log("ref_power必须是数字或字符串", "WARNING")
-                            return False
-                    # 验证极化模式
-                    if 'polarization' in base_params and base_params['polarization'] not in ['THETA', 'PHI', 'DUAL']:
-                        self.log("无效的极化模式", "WARNING")
-                        return False
-                except json.JSONDecodeError:
-                    self.log("基础参数JSON格式错误", "WARNING")
-                    return False
-                    
             return True
             
         except Exception as e:
@@ -1058,6 +1275,146 @@ class CalibrationFileManager:
             return False
 
 
+    def _read_csv_streaming(self, csv_path: str) -> Optional[Dict]:
+        """
+        单次读取解析CSV校准文件
+        逐行读取并即时验证文件头，遇到列标题行后把剩余数据块直接交给pandas C解析器，
+        数据块中以!开头的文件尾行按注释跳过，结束标记和MD5通过读取文件末尾检查
+        
+        :param csv_path: 文件路径
+        :return: 包含元数据和数据的字典，文件无效时返回None
+        :raises ValueError: 数据行格式不规整，需要回退到兼容解析
+        """
+        with open(csv_path, 'r', encoding='utf-8') as f:
+            # 读取文件头直到列标题行
+            header_lines = []
+            column_line = None
+            line = f.readline()
+            if not line.startswith("!RNX Dual-Polarized Feed Calibration Data"):
+                self.log("无效的文件头", "WARNING")
+                return None
+            while line:
+                stripped = line.strip()
+                if stripped.startswith('!'):
+                    header_lines.append(stripped)
+                elif stripped:
+                    column_line = stripped
+                    break
+                line = f.readline()
+            
+            if column_line is None:
+                self.log("缺少数据行", "WARNING")
+                return None
+            if not self._validate_csv_header(header_lines):
+                return None
+            meta = self._parse_csv_header(header_lines)
+            if meta is None:
+                return None
+            
+            # 按列标题确定字段，前8列固定，扩展列为参考功率和极化
+            titles = [title.strip() for title in column_line.split(',')]
+            if titles[0] != "Frequency" or len(titles) < 8:
+                raise ValueError("列标题行格式不符")
+            names = list(CalibrationColumns.FLOAT_COLUMNS[:8])
+            if len(titles) > 8 and titles[8] == "Reference_Power":
+                names.append('reference_power')
+                if len(titles) > 9 and titles[9] == "Polarization":
+                    names.append('polarization')
+            
+            dtypes = {name: np.float64 for name in names}
+            dtypes['polarization'] = str
+            frame = pd.read_csv(
+                f, header=None, names=names, index_col=False, comment='!',
+                skipinitialspace=True, dtype={name: dtypes[name] for name in names}
+            )
+        
+        if frame[names[:8]].isna().to_numpy().any():
+            raise ValueError("存在缺失字段的数据行")
+        
+        # 检查文件尾的结束标记和MD5
+        with open(csv_path, 'rb') as f:
+            f.seek(max(os.fstat(f.fileno()).st_size - 4096, 0))
+            tail = [line for line in f.read().decode('utf-8', 'ignore').splitlines() if line.strip()][-3:]
+        if not any(line.startswith("!EndOfData:") for line in tail):
+            self.log("缺少结束标记", "WARNING")
+            return None
+        if not any(line.startswith("!MD5:") for line in tail):
+            self.log("缺少MD5校验", "WARNING")
+            return None
+        
+        columns = CalibrationColumns.from_arrays(**{name: frame[name].to_numpy() for name in names})
+        self.current_meta = meta
+        self.data_points = columns.points()
+        return {
+            'meta': meta,
+            'data': self.data_points,
+            'columns': columns
+        }
+
+    def _validate_csv_header(self, header_lines: List[str]) -> bool:
+        """
+        验证CSV文件头(以!开头的行)中的必需字段和基础参数
+        
+        :param header_lines: 去除首尾空白后的文件头行
+        :return: 是否有效
+        """
+        # 定义必需的头字段（更新后）
+        REQUIRED_HEADERS = {
+            "!Created:", "!Operator:", 
+            "!Base Parameters:", "!  Reference_Power:", "!  Polarization:", "!  Distance:",
+            "!Equipment:", "!  Signal_Generator:", "!  Spectrum_Analyzer:", "!  Antenna:", 
+            "!Environment:", "!Frequency:", "!  Start:", "!  Stop:", 
+            "!  Step:", "!  Points:", "!Data Columns:"
+        }
+        
+        # 检查所有必需字段是否存在
+        missing_headers = [h for h in REQUIRED_HEADERS if not any(l.startswith(h) for l in header_lines)]
+        
+        if missing_headers:
+            self.log(f"文件头缺少必需字段: {', '.join(missing_headers)}", "WARNING")
+            return False
+        
+        # 检查基础参数JSON格式
+        base_params_lines = [line for line in header_lines if line.startswith("!BaseParams:")]
+        if base_params_lines:
+            try:
+                # 尝试解析JSON，处理可能的格式问题
+                base_params_str = base_params_lines[0].split(':', 1)[1].strip()
+
+                # 处理可能的引号问题
+                if base_params_str.startswith('"') and base_params_str.endswith('"'):
+                    base_params_str = base_params_str[1:-1]
+                # 尝试解析JSON
+                try:
+                    base_params = json.loads(base_params_str)
+                except json.JSONDecodeError:
+                    self.log("检查校准参数是否被改动", "ERROR")
+                    base_params_str = base_params_str.replace(' "', '"').replace('",', ',').replace('""', '"').replace('}"', '}')
+                    base_params = json.loads(base_params_str)
+                    self.log("宽松解析成功", "DEBUG")
+                # 验证ref_power格式
+                if 'ref_power' in base_params:
+                    ref_power = base_params['ref_power']
+                    if isinstance(ref_power, str) and '_' in ref_power:
+                        try:
+                            ref_power = [float(p) for p in ref_power.split('_')]
+                            self.log(f"解析的ref_power列表: {ref_power}", "DEBUG")
+                        except ValueError:
+                            self.log("无效的ref_power列表格式", "WARNING")
+                            return False
+                    elif not isinstance(ref_power, (int, float, str)):
+                        self.log("ref_power必须是数字或字符串", "WARNING")
+                        return False
+                # 验证极化模式
+                if 'polarization' in base_params and base_params['polarization'] not in ['THETA', 'PHI', 'DUAL']:
+                    self.log("无效的极化模式", "WARNING")
+                    return False
+            except json.JSONDecodeError:
+                self.log("基础参数JSON格式错误", "WARNING")
+                return False
+                
+        return True
+
     def _read_csv_content(self, csv_path: str) -> Optional[Dict]:
         """
         读取已验证的CSV文件内容
@@ -1067,185 +1424,13 @@ class CalibrationFileManager:
         1. 支持读取多个参考功率和极化模式的数据
         2. 修复字段提取逻辑
         """
-        def clean_line(line: str) -> str:
-            """清理数据行，移除多余逗号和空格"""
-            line = line.strip().strip('"\'')
-            line = re.sub(r',+', ',', line)
-            line = re.sub(r',$', '', line)
-            return line
-    
         try:
             with open(csv_path, 'r', encoding='utf-8') as f:
                 lines = f.readlines()
             
-            # 初始化元数据字典
-            meta = {
-                'file_format': 'csv',
-                'header': [],
-                'signal_gen': ('未知', '未知'),
-                'power_meter': ('未知', '未知'),
-                'antenna': ('未知', '未知'),
-                'environment': (0.0, 0.0),
-                'freq_params': {
-                    'start_ghz': 0.0,
-                    'stop_ghz': 0.0,
-                    'step_ghz': 0.0
-                },
-                'base_param': {
-                    'ref_power': 0.0,
-                    'polarization': 'DUAL',
-                    'distance': 1.0
-                }
-            }
-            
-            # 解析头部信息
-            for line in lines:
-                line = clean_line(line).strip()
-                if not line:
-                    continue
-                    
-                if line.startswith('!'):
-                    meta['header'].append(line)
-                    
-                    # 解析创建时间
-                    if line.startswith('!Created:'):
-                        created_str = line.split(':', 1)[1].strip()
-                        try:
-                            # 尝试解析ISO格式时间
-                            meta['created'] = datetime.strptime(
-                                created_str.replace('Z', ''), 
-                                "%Y%m%dT%H%M%S"
-                            ).isoformat()
-                        except ValueError:
-                            meta['created'] = created_str
-                    
-                    # 解析操作员
-                    elif line.startswith('!Operator:'):
-                        meta['operator'] = line.split(':', 1)[1].strip()
-                    
-                    # 解析信号源信息
-                    elif line.startswith('!  Signal_Generator:'):
-                        parts = re.split(r'_SN:', line.split(':', 1)[1].strip())
-                        model = parts[0].strip()
-                        sn = parts[1].strip() if len(parts) > 1 else '未知'
-                        meta['signal_gen'] = (model, sn)
-                    
-                    # 解析功率计信息
-                    elif line.startswith('!  Spectrum_Analyzer:'):
-                        parts = re.split(r'_SN:', line.split(':', 1)[1].strip())
-                        model = parts[0].strip()
-                        sn = parts[1].strip() if len(parts) > 1 else '未知'
-                        meta['power_meter'] = (model, sn)
-                    
-                    # 解析天线信息
-                    elif line.startswith('!  Antenna:'):
-                        parts = re.split(r'_SN:', line.split(':', 1)[1].strip())
-                        model = parts[0].strip()
-                        sn = parts[1].strip() if len(parts) > 1 else '未知'
-                        meta['antenna'] = (model, sn)
-                    
-                    # 解析环境信息
-                    elif line.startswith('!Environment:'):
-                        env_parts = line.split(':', 1)[1].strip().split(',')
-                        try:
-                            temp = float(env_parts[0].replace('C', '').strip())
-                            humidity = float(env_parts[1].replace('%RH', '').strip())
-                            meta['environment'] = (temp, humidity)
-                        except (ValueError, IndexError):
-                            meta['environment'] = (0.0, 0.0)
-                    
-                    # 解析频率参数
-                    elif line.startswith('!  Start:'):
-                        try:
-                            meta['freq_params']['start_ghz'] = float(
-                                line.split(':', 1)[1].replace('GHz', '').strip()
-                            )
-                        except ValueError:
-                            meta['freq_params']['start_ghz'] = 0.0
-                    
-                    elif line.startswith('!  Stop:'):
-                        try:
-                            meta['freq_params']['stop_ghz'] = float(
-                                line.split(':', 1)[1].replace('GHz', '').strip()
-                            )
-                        except ValueError:
-                            meta['freq_params']['stop_ghz'] = 0.0
-                    
-                    elif line.startswith('!  Step:'):
-                        step_str = line.split(':', 1)[1].replace('GHz', '').strip()
-                        if step_str == 'FreqList':
-                            meta['freq_params']['step_ghz'] = 'FreqList'
-                        else:
-                            try:
-                                meta['freq_params']['step_ghz'] = float(step_str)
-                            except ValueError:
-                                meta['freq_params']['step_ghz'] = 0.0
-                    
-                    elif line.startswith('!  Points:'):
-                        try:
-                            meta['points'] = int(line.split(':', 1)[1].strip())
-                        except ValueError:
-                            meta['points'] = 0
-                    
-                    # 解析基础参数
-                    elif line.startswith('!BaseParams:'):
-                        try:
-                            
-                            base_params_str = line.split(':', 1)[1].strip()
-                            
-                            # 处理可能的引号问题
-                            if base_params_str.startswith('"') and base_params_str.endswith('"'):
-                                base_params_str = base_params_str[1:-1]
-                            # 处理可能的双引号转义
-                            base_params_str = base_params_str.replace('\\"', '"').replace('""', '"')
-                            # 解析JSON
-                            
-                            try:
-                                base_params = json.loads(base_params_str)
-                            except json.JSONDecodeError:
-                                self.log("检查校准参数是否被改动", "ERROR")
-                                base_params_str = base_params_str.replace(' "', '"').replace('",', ',').replace('""', '"').replace('}"', '}')
-                                base_params = json.loads(base_params_str)
-                                self.log("宽松解析成功", "DEBUG")
-                            if isinstance(base_params, dict):
-                                # 处理ref_power可能是列表的情况
-                                if 'ref_power' in base_params:
-                                    if isinstance(base_params['ref_power'], str) and '_' in base_params['ref_power']:
-                                        # 处理类似"-30_-20"的格式
-                                        base_params['ref_power'] = [
-                                            float(p) for p in base_params['ref_power'].split('_')
-                                        ]
-                                    elif isinstance(base_params['ref_power'], (int, float)):
-                                        # 单个值转换为列表
-                                        base_params['ref_power'] = [float(base_params['ref_power'])]
-                                
-                                # 更新基础参数
-                                meta['base_param'].update(base_params)
-                        except json.JSONDecodeError as e:
-                            self.log(f"基础参数JSON解析失败: {str(e)}", "WARNING")
-                            self.log("无法解析基础参数，使用默认值", "WARNING")
-                    
-                    # 解析版本说明
-                    elif line.startswith('!VersionNotes:'):
-                        meta['version_notes'] = line.split(':', 1)[1].strip()
-                    
-                    # 解析结束标记
-                    elif line.startswith('!EndOfData:'):
-                        meta['end_of_data'] = line.split(':', 1)[1].strip()
-                    
-                    # 解析MD5校验
-                    elif line.startswith('!MD5:'):
-                        meta['md5'] = line.split(':', 1)[1].strip()
-                
-                else:
-                    break  # 遇到数据行时停止解析头部
-            
-            # 验证基础参数
-            required_base_params = ['ref_power', 'polarization']
-            for param in required_base_params:
-                if param not in meta['base_param']:
-                    self.log(f"缺少必需的基础参数: {param}", "WARNING")
-                    return None
+            meta = self._parse_csv_header(lines)
+            if meta is None:
+                return None
                     
             # 使用csv.reader读取数据部分
             data_points = []
@@ -1310,13 +1495,191 @@ class CalibrationFileManager:
             return None
 
 
-    def _calculate_file_hash(self) -> str:
-        """计算文件MD5校验值"""
-        hash_md5 = hashlib.md5()
-        with open(self.active_file, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_md5.update(chunk)
-        return hash_md5.hexdigest()
+
+    def _parse_csv_header(self, lines: List[str]) -> Optional[Dict]:
+        """
+        解析CSV文件头(遇到第一个非!开头的行即停止)
+        
+        :param lines: 文件行(可以只包含文件头部分)
+        :return: 元数据字典，缺少必需的基础参数时返回None
+        """
+        def clean_line(line: str) -> str:
+            """清理数据行，移除多余逗号和空格"""
+            line = line.strip().strip('"\'')
+            line = re.sub(r',+', ',', line)
+            line = re.sub(r',$', '', line)
+            return line
+        
+        # 初始化元数据字典
+        meta = {
+            'file_format': 'csv',
+            'header': [],
+            'signal_gen': ('未知', '未知'),
+            'power_meter': ('未知', '未知'),
+            'antenna': ('未知', '未知'),
+            'environment': (0.0, 0.0),
+            'freq_params': {
+                'start_ghz': 0.0,
+                'stop_ghz': 0.0,
+                'step_ghz': 0.0
+            },
+            'base_param': {
+                'ref_power': 0.0,
+                'polarization': 'DUAL',
+                'distance': 1.0
+            }
+        }
+        
+        # 解析头部信息
+        for line in lines:
+            line = clean_line(line).strip()
+            if not line:
+                continue
+                
+            if line.startswith('!'):
+                meta['header'].append(line)
+                
+                # 解析创建时间
+                if line.startswith('!Created:'):
+                    created_str = line.split(':', 1)[1].strip()
+                    try:
+                        # 尝试解析ISO格式时间
+                        meta['created'] = datetime.strptime(
+                            created_str.replace('Z', ''), 
+                            "%Y%m%dT%H%M%S"
+                        ).isoformat()
+                    except ValueError:
+                        meta['created'] = created_str
+                
+                # 解析操作员
+                elif line.startswith('!Operator:'):
+                    meta['operator'] = line.split(':', 1)[1].strip()
+                
+                # 解析信号源信息
+                elif line.startswith('!  Signal_Generator:'):
+                    parts = re.split(r'_SN:', line.split(':', 1)[1].strip())
+                    model = parts[0].strip()
+                    sn = parts[1].strip() if len(parts) > 1 else '未知'
+                    meta['signal_gen'] = (model, sn)
+                
+                # 解析功率计信息
+                elif line.startswith('!  Spectrum_Analyzer:'):
+                    parts = re.split(r'_SN:', line.split(':', 1)[1].strip())
+                    model = parts[0].strip()
+                    sn = parts[1].strip() if len(parts) > 1 else '未知'
+                    meta['power_meter'] = (model, sn)
+                
+                # 解析天线信息
+                elif line.startswith('!  Antenna:'):
+                    parts = re.split(r'_SN:', line.split(':', 1)[1].strip())
+                    model = parts[0].strip()
+                    sn = parts[1].strip() if len(parts) > 1 else '未知'
+                    meta['antenna'] = (model, sn)
+                
+                # 解析环境信息
+                elif line.startswith('!Environment:'):
+                    env_parts = line.split(':', 1)[1].strip().split(',')
+                    try:
+                        temp = float(env_parts[0].replace('C', '').strip())
+                        humidity = float(env_parts[1].replace('%RH', '').strip())
+                        meta['environment'] = (temp, humidity)
+                    except (ValueError, IndexError):
+                        meta['environment'] = (0.0, 0.0)
+                
+                # 解析频率参数
+                elif line.startswith('!  Start:'):
+                    try:
+                        meta['freq_params']['start_ghz'] = float(
+                            line.split(':', 1)[1].replace('GHz', '').strip()
+                        )
+                    except ValueError:
+                        meta['freq_params']['start_ghz'] = 0.0
+                
+                elif line.startswith('!  Stop:'):
+                    try:
+                        meta['freq_params']['stop_ghz'] = float(
+                            line.split(':', 1)[1].replace('GHz', '').strip()
+                        )
+                    except ValueError:
+                        meta['freq_params']['stop_ghz'] = 0.0
+                
+                elif line.startswith('!  Step:'):
+                    step_str = line.split(':', 1)[1].replace('GHz', '').strip()
+                    if step_str in ('FreqList', 'Adaptive'):
+                        meta['freq_params']['step_ghz'] = step_str
+                    else:
+                        try:
+                            meta['freq_params']['step_ghz'] = float(step_str)
+                        except ValueError:
+                            meta['freq_params']['step_ghz'] = 0.0
+                
+                elif line.startswith('!  Points:'):
+                    try:
+                        meta['points'] = int(line.split(':', 1)[1].strip())
+                    except ValueError:
+                        meta['points'] = 0
+                
+                # 解析基础参数
+                elif line.startswith('!BaseParams:'):
+                    try:
+                        
+                        base_params_str = line.split(':', 1)[1].strip()
+                        
+                        # 处理可能的引号问题
+                        if base_params_str.startswith('"') and base_params_str.endswith('"'):
+                            base_params_str = base_params_str[1:-1]
+                        # 处理可能的双引号转义
+                        base_params_str = base_params_str.replace('\\"', '"').replace('""', '"')
+                        # 解析JSON
+                        
+                        try:
+                            base_params = json.loads(base_params_str)
+                        except json.JSONDecodeError:
+                            self.log("检查校准参数是否被改动", "ERROR")
+                            base_params_str = base_params_str.replace(' "', '"').replace('",', ',').replace('""', '"').replace('}"', '}')
+                            base_params = json.loads(base_params_str)
+                            self.log("宽松解析成功", "DEBUG")
+                        if isinstance(base_params, dict):
+                            # 处理ref_power可能是列表的情况
+                            if 'ref_power' in base_params:
+                                if isinstance(base_params['ref_power'], str) and '_' in base_params['ref_power']:
+                                    # 处理类似"-30_-20"的格式
+                                    base_params['ref_power'] = [
+                                        float(p) for p in base_params['ref_power'].split('_')
+                                    ]
+                                elif isinstance(base_params['ref_power'], (int, float)):
+                                    # 单个值转换为列表
+                                    base_params['ref_power'] = [float(base_params['ref_power'])]
+                            
+                            # 更新基础参数
+                            meta['base_param'].update(base_params)
+                    except json.JSONDecodeError as e:
+                        self.log(f"基础参数JSON解析失败: {str(e)}", "WARNING")
+                        self.log("无法解析基础参数，使用默认值", "WARNING")
+                
+                # 解析版本说明
+                elif line.startswith('!VersionNotes:'):
+                    meta['version_notes'] = line.split(':', 1)[1].strip()
+                
+                # 解析结束标记
+                elif line.startswith('!EndOfData:'):
+                    meta['end_of_data'] = line.split(':', 1)[1].strip()
+                
+                # 解析MD5校验
+                elif line.startswith('!MD5:'):
+                    meta['md5'] = line.split(':', 1)[1].strip()
+            
+            else:
+                break  # 遇到数据行时停止解析头部
+        
+        # 验证基础参数
+        required_base_params = ['ref_power', 'polarization']
+        for param in required_base_params:
+            if param not in meta['base_param']:
+                self.log(f"缺少必需的基础参数: {param}", "WARNING")
+                return None
+        
+        return meta
 
     def _archive_file(self, filepath: Optional[str] = None) -> str:
         """将文件移动到归档目录
@@ -1333,9 +1696,15 @@ class CalibrationFileManager:
         filename = os.path.basename(src)
         dst = os.path.join(archive_dir, filename)
         
+        self._release_cached(src, dst)
         shutil.move(src, dst)
         return dst
 
+    def _release_cached(self, *paths: str):
+        """文件被覆盖或移动前释放其缓存条目和落盘文件(内存映射未释放时Windows上无法覆盖或移动)"""
+        for path in paths:
+            self.cache.invalidate(path, spill_dir=self.cache_dir)
+
     def _backup_file(self) -> bool:
         """创建备份文件"""
         if not self.active_file:
@@ -1352,6 +1721,8 @@ class CalibrationFileManager:
         
         try:
             with self._file_lock:
+                if self._session is not None:
+                    self._session.flush()
                 shutil.copy2(self.active_file, backup_file)
             self.log(f"创建备份: {backup_file}", "INFO")
             return True
@@ -1361,47 +1732,147 @@ class CalibrationFileManager:
 
     def get_recent_calibrations(self, days: int = 7) -> List[Dict]:
         """
-        获取最近校准记录
+        获取最近校准记录(基于目录索引)
         
         :param days: 查询最近多少天的记录
         :return: 校准文件信息列表 [{
                 'filename': str,
                 'path': str,
                 'modified': datetime,
-                'size': int
+                'size': int,
+                'is_archived': bool
             }]
         """
-        recent_files = []
-        cutoff_time = datetime.now() - datetime.timedelta(days=days)
-        
-        # 搜索主目录和归档目录
-        search_dirs = [self.base_dir, os.path.join(self.base_dir, "archive")]
-        
-        for search_dir in search_dirs:
-            if not os.path.exists(search_dir):
-                continue
-                
-            for root, _, files in os.walk(search_dir):
-                for file in files:
-                    if file.startswith("RNX_Cal_DualPol_") and file.endswith(".csv"):
-                        filepath = os.path.join(root, file)
-                        try:
-                            mtime = datetime.fromtimestamp(os.path.getmtime(filepath))
-                            if mtime > cutoff_time:
-                                recent_files.append({
-                                    'filename': file,
-                                    'path': filepath,
-                                    'modified': mtime,
-                                    'size': os.path.getsize(filepath),
-                                    'is_archived': "archive" in root
-                                })
-                        except Exception as e:
-                            self.log(f"处理文件{file}失败: {str(e)}", "WARNING")
+        cutoff_time = datetime.now() - timedelta(days=days)
+        recent_files = [
+            {
+                'filename': record['filename'],
+                'path': record['path'],
+                'modified': datetime.fromtimestamp(record['mtime_ns'] / 1e9),
+                'size': record['size'],
+                'is_archived': bool(record['is_archived'])
+            }
+            for record in self.query_calibrations(file_format='csv')
+        ]
+        recent_files = [f for f in recent_files if f['modified'] > cutoff_time]
         
         # 按修改时间排序
         recent_files.sort(key=lambda x: x['modified'], reverse=True)
         return recent_files
 
+    def refresh_catalog(self) -> int:
+        """
+        增量刷新目录索引(主目录和归档目录下的CSV/BIN文件)
+        
+        :return: 重新索引的文件数
+        """
+        def iter_files():
+            for search_dir in (self.base_dir, os.path.join(self.base_dir, "archive")):
+                if not os.path.isdir(search_dir):
+                    continue
+                with os.scandir(search_dir) as entries:
+                    for entry in entries:
+                        if entry.is_file() and entry.name.lower().endswith(('.csv', '.bin')):
+                            yield entry.path
+        
+        return self.catalog.refresh(iter_files())
+
+    def query_calibrations(self, refresh: bool = True, **filters) -> List[Dict]:
+        """
+        查询校准文件索引
+        
+        :param refresh: 查询前是否先增量刷新索引
+        :param filters: 查询条件，见CalibrationCatalog.query
+        :return: 索引记录列表(按创建时间倒序)
+        """
+        if refresh:
+            self.refresh_catalog()
+        return self.catalog.query(**filters)
+
+    def _summarize_file(self, filepath: str) -> Optional[Dict]:
+        """
+        读取文件头摘要用于目录索引(只读取文件头和文件尾，不解析数据)
+        
+        :param filepath: 文件路径
+        :return: 摘要字典，无法识别的文件返回None
+        """
+        md5 = None
+        if filepath.lower().endswith('.bin'):
+            try:
+                _, meta, count = CalibrationBinaryFormat.read_header(filepath)
+            except ValueError:
+                return None
+            meta.setdefault('points', count)
+        else:
+            header_lines = []
+            with open(filepath, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if not line.startswith('!'):
+                        break
+                    header_lines.append(line)
+            if not header_lines or not header_lines[0].startswith("!RNX Dual-Polarized Feed Calibration Data"):
+                return None
+            meta = self._parse_csv_header(header_lines)
+            if meta is None:
+                return None
+            
+            # MD5位于文件尾
+            with open(filepath, 'rb') as f:
+                f.seek(max(os.fstat(f.fileno()).st_size - 512, 0))
+                for line in f.read().decode('utf-8', 'ignore').splitlines():
+                    if line.startswith('!MD5:'):
+                        md5 = line.split(':', 1)[1].strip()
+        
+        base = meta.get('base_param', {})
+        ref_power = base.get('ref_power')
+        if isinstance(ref_power, str) and '_' in ref_power:
+            ref_powers = ref_power.split('_')
+        elif isinstance(ref_power, (list, tuple)):
+            ref_powers = list(ref_power)
+        else:
+            ref_powers = [ref_power] if ref_power is not None else []
+        try:
+            ref_powers = [float(p) for p in ref_powers]
+        except (TypeError, ValueError):
+            ref_powers = []
+        
+        freq = meta.get('freq_params', {})
+        antenna = meta.get('antenna') or ('', '')
+        signal_gen = meta.get('signal_gen') or ('', '')
+        power_meter = meta.get('power_meter') or ('', '')
+        created = meta.get('created')
+        return {
+            'created': str(created) if created is not None else None,
+            'created_ts': self._parse_created_timestamp(created),
+            'operator': meta.get('operator'),
+            'polarization': str(base.get('polarization', '')).upper() or None,
+            'ref_power': '_'.join(f"{p:.1f}" for p in ref_powers) or None,
+            'ref_powers': ',' + ','.join(f"{p:.1f}" for p in ref_powers) + ',' if ref_powers else None,
+            'start_ghz': freq.get('start_ghz'),
+            'stop_ghz': freq.get('stop_ghz'),
+            'step': str(freq.get('step_ghz')) if freq.get('step_ghz') is not None else None,
+            'points': meta.get('points'),
+            'antenna_model': antenna[0],
+            'antenna_sn': antenna[1],
+            'signal_gen_sn': signal_gen[1],
+            'power_meter_sn': power_meter[1],
+            'version_notes': meta.get('version_notes'),
+            'md5': md5
+        }
+
+    @staticmethod
+    def _parse_created_timestamp(created) -> Optional[float]:
+        """解析创建时间(UTC)为时间戳，支持文件头的ISO格式和元数据的'%Y%m%d_%H%M%SZ'格式"""
+        if not isinstance(created, str):
+            return None
+        value = created.strip().rstrip('Z')
+        for fmt in ("%Y-%m-%dT%H:%M:%S", "%Y%m%d_%H%M%S", "%Y%m%dT%H%M%S"):
+            try:
+                return datetime.strptime(value, fmt).replace(tzinfo=timezone.utc).timestamp()
+            except ValueError:
+                continue
+        return None
+
     def get_version_history(self, filepath: str) -> List[str]:
         """
         获取文件的版本历史
@@ -0,0 +1,104 @@
+import os
+import time
+import hashlib
+from typing import Optional
+
+
+class CalibrationWriteSession:
+    """
+    校准CSV流式写入会话
+
+    在一次校准的整个生命周期内保持一个带缓冲的文件句柄:
+    - 按行数或时间策略把缓冲区刷到操作系统
+    - 按较长的时间间隔或在检查点显式fsync落盘
+    - close()时完成最后一次落盘并关闭句柄
+    - 写入的同时累计MD5，文件尾校验值无需回读文件
+    文件统一以UTF-8编码、'\\n'换行写入。
+    """
+
+    def __init__(self, path: str,
+                 flush_rows: int = 256,
+                 flush_interval: float = 1.0,
+                 sync_interval: float = 10.0,
+                 buffer_size: int = 64 * 1024):
+        """
+        :param path: 文件路径(会被覆盖)
+        :param flush_rows: 累计多少行后刷新缓冲区
+        :param flush_interval: 距上次刷新超过多少秒后刷新缓冲区
+        :param sync_interval: 距上次fsync超过多少秒后在刷新时同时fsync
+        :param buffer_size: 文件缓冲区大小(字节)
+        """
+        self.path = path
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self.sync_interval = sync_interval
+        self.rows_written = 0
+        self._file = open(path, 'wb', buffering=buffer_size)
+        self._md5 = hashlib.md5()
+        self._rows_since_flush = 0
+        self._last_flush = time.monotonic()
+        self._last_sync = self._last_flush
+
+    @property
+    def closed(self) -> bool:
+        return self._file is None
+
+    def write(self, text: str):
+        """写入任意文本(文件头/尾)"""
+        data = text.encode('utf-8')
+        self._file.write(data)
+        self._md5.update(data)
+
+    def write_row(self, row: str):
+        """写入一行数据，并按刷新策略决定是否刷新"""
+        data = row.encode('utf-8')
+        self._file.write(data)
+        self._md5.update(data)
+        self.rows_written += 1
+        self._rows_since_flush += 1
+
+        now = time.monotonic()
+        if self._rows_since_flush >= self.flush_rows or now - self._last_flush >= self.flush_interval:
+            self.flush(sync=now - self._last_sync >= self.sync_interval)
+
+    def write_rows(self, rows: str, count: int):
+        """批量写入多行数据(rows为已按行拼接的文本)，写入后按刷新策略刷新一次"""
+        data = rows.encode('utf-8')
+        self._file.write(data)
+        self._md5.update(data)
+        self.rows_written += count
+        self._rows_since_flush += count
+
+        now = time.monotonic()
+        if self._rows_since_flush >= self.flush_rows or now - self._last_flush >= self.flush_interval:
+            self.flush(sync=now - self._last_sync >= self.sync_interval)
+
+    def hexdigest(self) -> str:
+        """截至目前已写入内容的MD5"""
+        return self._md5.hexdigest()
+
+    def flush(self, sync: bool = False):
+        """刷新缓冲区，sync为True时同时fsync到磁盘"""
+        if self._file is None:
+            return
+        self._file.flush()
+        now = time.monotonic()
+        self._last_flush = now
+        self._rows_since_flush = 0
+        if sync:
+            os.fsync(self._file.fileno())
+            self._last_sync = now
+
+    def checkpoint(self):
+        """检查点: 刷新并fsync，保证已写入的数据在异常中断后仍然完整"""
+        self.flush(sync=True)
+
+    def close(self, sync: bool = True):
+        """关闭会话，默认在关闭前fsync"""
+        if self._file is None:
+            return
+        try:
+            self.flush(sync=sync)
+        finally:
+            self._file.close()
+            self._file = None
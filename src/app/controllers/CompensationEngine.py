@@ -0,0 +1,324 @@
+import bisect
+import numpy as np
+from typing import Callable, Dict, Optional, Tuple
+
+from app.models.CalibrationColumns import CalibrationColumns, POLARIZATION_CODES
+
+
+class CompensationEngine:
+    """
+    功率补偿查询引擎
+
+    加载校准文件时按(极化, 参考功率)预先建立按频率排序的补偿表
+    (补偿值 = 校正值 - 参考功率)，查询时用二分查找定位频点区间，
+    支持最近点、线性和三次样条插值，提供标量和向量化两种查询方式。
+
+    同时把各补偿表重采样到统一频率轴，组成(极化, 参考功率, 频率)三维数组，
+    可对任意输出功率做频率×参考功率双线性插值(interpolate/interpolate_array)。
+    """
+
+    MODES = ('nearest', 'linear', 'cubic')
+
+    # 各极化使用的校正值列
+    FIELDS = {'THETA': 'theta_corrected', 'PHI': 'phi_corrected'}
+    POLARIZATIONS = tuple(FIELDS)
+
+    def __init__(self, columns: CalibrationColumns, base_param: Optional[Dict] = None, mode: str = 'linear'):
+        """
+        :param columns: 校准数据列
+        :param base_param: 校准文件基础参数，数据行未记录参考功率时使用其中的ref_power
+        :param mode: 默认插值方式('nearest'/'linear'/'cubic')
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"不支持的插值方式: {mode}")
+        if not len(columns):
+            raise ValueError("校准数据为空")
+        self.mode = mode
+
+        ref_column = np.asarray(columns['reference_power'], dtype=np.float64)
+        default_ref = self._default_ref_power((base_param or {}).get('ref_power'))
+        if default_ref is None:
+            default_ref = float(ref_column[~np.isnan(ref_column)][0]) if (~np.isnan(ref_column)).any() else 0.0
+        ref_column = np.where(np.isnan(ref_column), default_ref, ref_column).round(2)
+        self.default_ref_power = round(default_ref, 2)
+
+        freqs = np.asarray(columns['freq'], dtype=np.float64)
+        pol = np.asarray(columns['polarization'])
+        self.freq_range: Tuple[float, float] = (float(freqs.min()), float(freqs.max()))
+        self.ref_powers = np.unique(ref_column)
+
+        # (极化, 参考功率) -> (频率, 补偿值)，未记录极化的数据行同时用于两种极化
+        self._tables: Dict[Tuple[str, float], Tuple[np.ndarray, np.ndarray]] = {}
+        self._splines = {}
+        for polarization, field in self.FIELDS.items():
+            rows = np.isin(pol, (POLARIZATION_CODES[polarization], POLARIZATION_CODES['DUAL'], -1))
+            if not rows.any():
+                rows = np.ones(len(freqs), dtype=bool)  # 没有该极化的数据时沿用全部数据行
+            values = np.asarray(columns[field], dtype=np.float64) - ref_column
+            for ref_power in np.unique(ref_column[rows]):
+                selected = rows & (ref_column == ref_power)
+                self._tables[(polarization, float(ref_power))] = self._sorted_table(freqs[selected], values[selected])
+        self._horn_gain = self._sorted_table(freqs, np.asarray(columns['horn_gain'], dtype=np.float64))
+
+        self._build_cube()
+
+    @classmethod
+    def from_result(cls, result: Dict, mode: str = 'linear') -> 'CompensationEngine':
+        """由CalibrationFileManager.load_calibration_file的返回结果构建"""
+        columns = result.get('columns')
+        if columns is None:
+            columns = CalibrationColumns.from_points(result['data'])
+        return cls(columns, result.get('meta', {}).get('base_param'), mode=mode)
+
+    @staticmethod
+    def _default_ref_power(ref_power) -> Optional[float]:
+        """基础参数中的参考功率(列表或"-10.0_-5.0"格式时取第一个)"""
+        if isinstance(ref_power, str) and '_' in ref_power:
+            ref_power = ref_power.split('_')
+        if isinstance(ref_power, (list, tuple)):
+            ref_power = ref_power[0] if ref_power else None
+        try:
+            return float(ref_power)
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def _sorted_table(freqs: np.ndarray, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """按频率排序，重复频点保留最后一个数据行"""
+        order = np.argsort(freqs, kind='stable')
+        freqs, values = freqs[order], values[order]
+        keep = np.append(freqs[1:] != freqs[:-1], True)
+        return freqs[keep], values[keep]
+
+    def _table(self, polarization: str, ref_power: Optional[float]) -> Tuple[float, np.ndarray, np.ndarray]:
+        """选择极化对应、参考功率最接近的补偿表"""
+        polarization = polarization.upper()
+        if polarization not in self.FIELDS:
+            raise ValueError(f"无效的极化模式: {polarization}")
+        refs = [ref for pol, ref in self._tables if pol == polarization]
+        target = self.default_ref_power if ref_power is None else ref_power
+        ref = min(refs, key=lambda r: abs(r - target))
+        return (ref,) + self._tables[(polarization, ref)]
+
+    def lookup_array(self, freq_ghz, polarization: str, ref_power: Optional[float] = None,
+                     mode: Optional[str] = None) -> np.ndarray:
+        """
+        向量化查询补偿值
+
+        :param freq_ghz: 频率数组(GHz)
+        :param polarization: 'THETA' 或 'PHI'
+        :param ref_power: 参考功率(dBm)，使用最接近的参考功率补偿表，None时使用文件的参考功率
+        :param mode: 插值方式，None时使用默认方式
+        :return: 补偿值数组(dB)，超出该补偿表频率范围的位置为NaN
+        """
+        mode = mode or self.mode
+        if mode not in self.MODES:
+            raise ValueError(f"不支持的插值方式: {mode}")
+        ref, freqs, values = self._table(polarization, ref_power)
+        x = np.asarray(freq_ghz, dtype=np.float64)
+        inside = (x >= freqs[0]) & (x <= freqs[-1])
+
+        if len(freqs) == 1:
+            result = np.full(x.shape, values[0])
+        elif mode == 'cubic' and len(freqs) >= 3:
+            result = self._spline(polarization, ref, freqs, values)(np.clip(x, freqs[0], freqs[-1]))
+        else:
+            index = np.clip(np.searchsorted(freqs, x), 1, len(freqs) - 1)
+            left, right = freqs[index - 1], freqs[index]
+            if mode == 'nearest':
+                result = np.where(x - left <= right - x, values[index - 1], values[index])
+            else:
+                t = (x - left) / (right - left)
+                result = values[index - 1] + t * (values[index] - values[index - 1])
+        return np.where(inside, result, np.nan)
+
+    def lookup(self, freq_ghz: float, polarization: str, ref_power: Optional[float] = None,
+               mode: Optional[str] = None) -> Optional[float]:
+        """
+        查询单个频率的补偿值
+
+        :return: 补偿值(dB)，超出校准频率范围时返回None
+        """
+        value = float(self.lookup_array(freq_ghz, polarization, ref_power, mode))
+        return None if np.isnan(value) else value
+
+    def _build_cube(self):
+        """
+        建立(极化, 参考功率, 频率)补偿值三维数组
+        频率轴为全部校准频点的并集，各参考功率的补偿表线性重采样到该轴，
+        超出该参考功率校准频率范围的位置为NaN
+        """
+        self.freq_axis = np.unique(np.concatenate([freqs for freqs, _ in self._tables.values()]))
+        self.pol_axis = self.POLARIZATIONS
+        self._cube = np.full((len(self.pol_axis), len(self.ref_powers), len(self.freq_axis)), np.nan)
+        for (polarization, ref_power), (freqs, values) in self._tables.items():
+            i = self.pol_axis.index(polarization)
+            j = int(np.searchsorted(self.ref_powers, ref_power))
+            self._cube[i, j] = np.interp(self.freq_axis, freqs, values, left=np.nan, right=np.nan)
+        # 某极化缺少部分参考功率时，用最近的已有参考功率填补
+        for i in range(len(self.pol_axis)):
+            present = np.flatnonzero(~np.isnan(self._cube[i]).all(axis=1))
+            for j in np.flatnonzero(np.isnan(self._cube[i]).all(axis=1)):
+                self._cube[i, j] = self._cube[i, present[np.abs(present - j).argmin()]]
+
+    def interpolate_array(self, freq_ghz, polarization: str, ref_power) -> np.ndarray:
+        """
+        向量化查询补偿值(频率×参考功率双线性插值)
+
+        :param freq_ghz: 频率数组(GHz)
+        :param polarization: 'THETA' 或 'PHI'
+        :param ref_power: 输出功率(dBm)，可与freq_ghz广播；超出校准参考功率范围时取边界
+        :return: 补偿值数组(dB)，超出校准频率范围的位置为NaN
+        """
+        polarization = polarization.upper()
+        if polarization not in self.FIELDS:
+            raise ValueError(f"无效的极化模式: {polarization}")
+        plane = self._cube[self.pol_axis.index(polarization)]
+        x, r = np.broadcast_arrays(np.asarray(freq_ghz, dtype=np.float64), np.asarray(ref_power, dtype=np.float64))
+
+        # 频率方向
+        freqs = self.freq_axis
+        if len(freqs) == 1:
+            i, t = np.zeros(x.shape, dtype=np.intp), np.zeros(x.shape)
+        else:
+            i = np.clip(np.searchsorted(freqs, x), 1, len(freqs) - 1) - 1
+            t = (x - freqs[i]) / (freqs[i + 1] - freqs[i])
+        inside = (x >= freqs[0]) & (x <= freqs[-1])
+
+        # 参考功率方向(超出范围时取边界)
+        refs = self.ref_powers
+        r = np.clip(r, refs[0], refs[-1])
+        if len(refs) == 1:
+            j, u = np.zeros(r.shape, dtype=np.intp), np.zeros(r.shape)
+        else:
+            j = np.clip(np.searchsorted(refs, r), 1, len(refs) - 1) - 1
+            u = (r - refs[j]) / (refs[j + 1] - refs[j])
+
+        i1 = np.minimum(i + 1, len(freqs) - 1)
+        j1 = np.minimum(j + 1, len(refs) - 1)
+        low = plane[j, i] + t * (plane[j, i1] - plane[j, i])
+        high = plane[j1, i] + t * (plane[j1, i1] - plane[j1, i])
+        # 某一参考功率在该频点没有数据时，使用另一参考功率的结果
+        low, high = np.where(np.isnan(low), high, low), np.where(np.isnan(high), low, high)
+        return np.where(inside, low + u * (high - low), np.nan)
+
+    def interpolate(self, freq_ghz: float, polarization: str, ref_power: float) -> Optional[float]:
+        """
+        查询单个频率和输出功率的补偿值(双线性插值)
+
+        :return: 补偿值(dB)，超出校准频率范围时返回None
+        """
+        value = float(self.interpolate_array(freq_ghz, polarization, ref_power))
+        return None if np.isnan(value) else value
+
+    def power_slope(self, freq_ghz: float, polarization: str, source_dbm: float, delta_db: float = 1.0) -> float:
+        """
+        场强随信号源输出功率的变化率(1 + 补偿值对输出功率的导数)
+        只有一个参考功率或超出校准频率范围时为1
+
+        :param source_dbm: 信号源输出功率(dBm)
+        :param delta_db: 差分步长(dB)
+        """
+        if len(self.ref_powers) < 2:
+            return 1.0
+        low = self.interpolate(freq_ghz, polarization, source_dbm - delta_db)
+        high = self.interpolate(freq_ghz, polarization, source_dbm + delta_db)
+        if low is None or high is None:
+            return 1.0
+        return 1.0 + (high - low) / (2 * delta_db)
+
+    def horn_gain(self, freq_ghz: float) -> float:
+        """校准时使用的喇叭天线增益(dBi)，频点之间线性插值"""
+        freqs, gains = self._horn_gain
+        return float(np.interp(freq_ghz, freqs, gains))
+
+    def build_dense_table(self, step_ghz: float = 0.001,
+                          progress_callback: Optional[Callable[[int], None]] = None,
+                          is_cancelled: Optional[Callable[[], bool]] = None) -> Optional['DenseCompensationTable']:
+        """
+        将各(极化, 参考功率)补偿表按当前插值方式重采样到均匀频率网格
+
+        :param step_ghz: 网格步进(GHz)，默认1MHz
+        :param progress_callback: 进度回调(0-100)
+        :param is_cancelled: 返回True时中止生成
+        :return: 查找表，中止时返回None
+        """
+        start, stop = self.freq_range
+        count = int(np.floor((stop - start) / step_ghz + 1e-9)) + 1
+        grid = start + np.arange(count) * step_ghz
+        values = np.full((len(self.pol_axis), len(self.ref_powers), count), np.nan, dtype=np.float32)
+
+        total = values.shape[0] * values.shape[1]
+        for i, polarization in enumerate(self.pol_axis):
+            for j, ref_power in enumerate(self.ref_powers):
+                if is_cancelled is not None and is_cancelled():
+                    return None
+                values[i, j] = self.lookup_array(grid, polarization, float(ref_power))
+                if progress_callback is not None:
+                    progress_callback(int((i * values.shape[1] + j + 1) * 100 / total))
+
+        return DenseCompensationTable(start, step_ghz, self.ref_powers, values, self.default_ref_power)
+
+    def _spline(self, polarization: str, ref: float, freqs: np.ndarray, values: np.ndarray):
+        """三次样条插值器(首次使用时构建)"""
+        key = (polarization, ref)
+        if key not in self._splines:
+            from scipy.interpolate import CubicSpline
+            self._splines[key] = CubicSpline(freqs, values)
+        return self._splines[key]
+
+
+class DenseCompensationTable:
+    """
+    均匀频率网格上的补偿值查找表
+
+    values形状为(极化, 参考功率, 频点)，以float32保存；
+    频率查询只需一次下标计算，参考功率方向在相邻两行之间线性插值。
+    """
+
+    def __init__(self, start_ghz: float, step_ghz: float, ref_powers: np.ndarray,
+                 values: np.ndarray, default_ref_power: float):
+        """
+        :param start_ghz: 网格起始频率(GHz)
+        :param step_ghz: 网格步进(GHz)
+        :param ref_powers: 参考功率轴(升序)
+        :param values: 补偿值数组，形状(2, len(ref_powers), 频点数)
+        :param default_ref_power: 未指定参考功率时使用的参考功率
+        """
+        self.start_ghz = float(start_ghz)
+        self.step_ghz = float(step_ghz)
+        self.ref_powers = [float(ref) for ref in ref_powers]
+        self.values = values
+        self._default_row = int(np.abs(np.asarray(self.ref_powers) - default_ref_power).argmin())
+
+    def __len__(self) -> int:
+        return self.values.shape[-1]
+
+    @property
+    def nbytes(self) -> int:
+        return self.values.nbytes
+
+    def lookup(self, freq_ghz: float, polarization: str, ref_power: Optional[float] = None) -> Optional[float]:
+        """
+        查询补偿值(频率取最近的网格点)
+
+        :param freq_ghz: 频率(GHz)
+        :param polarization: 'THETA' 或 'PHI'
+        :param ref_power: 输出功率(dBm)，None时使用文件的参考功率
+        :return: 补偿值(dB)，超出网格范围时返回None
+        """
+        index = int(round((freq_ghz - self.start_ghz) / self.step_ghz))
+        if not 0 <= index < self.values.shape[-1]:
+            return None
+        plane = self.values[CompensationEngine.POLARIZATIONS.index(polarization.upper())]
+
+        refs = self.ref_powers
+        if ref_power is None or len(refs) == 1:
+            value = plane[self._default_row if ref_power is None else 0, index]
+        else:
+            ref_power = min(max(ref_power, refs[0]), refs[-1])
+            j = min(max(bisect.bisect_left(refs, ref_power), 1), len(refs) - 1) - 1
+            u = (ref_power - refs[j]) / (refs[j + 1] - refs[j])
+            low, high = plane[j, index], plane[j + 1, index]
+            value = low if np.isnan(high) else high if np.isnan(low) else low + u * (high - low)
+        return None if np.isnan(value) else float(value)
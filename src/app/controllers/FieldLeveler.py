@@ -0,0 +1,145 @@
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Optional, Tuple
+
+
+@dataclass
+class LevelingResult:
+    freq_hz: float          # 频率(Hz)
+    target_dbm: float       # 目标场强等效功率(dBm)
+    source_dbm: float       # 最终信号源设置功率(dBm)
+    measured_dbm: float     # 最终测得的场强等效功率(dBm)
+    iterations: int         # 设置-测量次数
+    converged: bool         # 是否在容差内
+    from_cache: bool        # 起点是否来自已调平结果
+
+    @property
+    def error_db(self) -> float:
+        return self.measured_dbm - self.target_dbm
+
+
+class FieldLeveler:
+    """
+    场强闭环调平
+
+    反复设置信号源功率并用功率计测量，按割线法修正设置值直到测量值与目标之差
+    小于容差。第一步的斜率(测量值随设置值的变化率)由调用方根据校准数据给出，
+    之后用相邻两次的设置/测量值更新。收敛结果按(频率, 目标)缓存，
+    再次调平同一目标时直接从缓存的设置值开始，通常第一次测量即可收敛。
+    """
+
+    # 斜率超出该范围时认为测量受噪声影响，沿用上一次的斜率
+    SLOPE_RANGE = (0.2, 5.0)
+
+    def __init__(self, tolerance_db: float = 0.05, max_iterations: int = 8,
+                 max_step_db: float = 10.0, power_limits: Tuple[float, float] = (-120.0, 20.0),
+                 cache_size: int = 256):
+        """
+        :param tolerance_db: 收敛容差(dB)
+        :param max_iterations: 最多设置-测量次数
+        :param max_step_db: 单次修正的最大步长(dB)
+        :param power_limits: 信号源设置功率范围(dBm)
+        :param cache_size: 最多缓存的调平结果数
+        """
+        self.tolerance_db = tolerance_db
+        self.max_iterations = max_iterations
+        self.max_step_db = max_step_db
+        self.power_limits = power_limits
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[Tuple[int, float], Tuple[float, float]]" = OrderedDict()
+
+    @staticmethod
+    def cache_key(freq_hz: float, target_dbm: float) -> Tuple[int, float]:
+        """缓存键: 频率按kHz、目标按0.01dB取整"""
+        return int(round(freq_hz / 1e3)), round(target_dbm, 2)
+
+    def cached(self, freq_hz: float, target_dbm: float) -> Optional[Tuple[float, float]]:
+        """已调平的(设置功率, 斜率)，没有时返回None"""
+        return self._cache.get(self.cache_key(freq_hz, target_dbm))
+
+    def clear_cache(self):
+        """清空调平结果(链路或测量配置变化后调用)"""
+        self._cache.clear()
+
+    def level(self, freq_hz: float, target_dbm: float, initial_dbm: float,
+              set_power: Callable[[float], None], measure: Callable[[], float],
+              slope: float = 1.0, settle_time: float = 0.0,
+              iteration_callback: Optional[Callable[[int, float, float], None]] = None,
+              is_cancelled: Optional[Callable[[], bool]] = None) -> LevelingResult:
+        """
+        执行调平
+
+        :param freq_hz: 频率(Hz)，用于缓存
+        :param target_dbm: 目标场强等效功率(dBm)
+        :param initial_dbm: 开环估算的信号源设置功率(dBm)，没有缓存结果时作为起点
+        :param set_power: 设置信号源功率的回调
+        :param measure: 测量场强等效功率(dBm)的回调
+        :param slope: 初始斜率(测量值对设置值的导数)
+        :param settle_time: 设置后等待稳定的时间(秒)
+        :param iteration_callback: 每次测量后回调(次数, 设置功率, 测量值)
+        :param is_cancelled: 返回True时中止调平
+        :return: 调平结果
+        """
+        low, high = self.power_limits
+        key = self.cache_key(freq_hz, target_dbm)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            source, slope = cached
+        else:
+            source = initial_dbm
+        if not (self.SLOPE_RANGE[0] <= slope <= self.SLOPE_RANGE[1]):
+            slope = 1.0
+
+        previous = None
+        applied = initial_dbm
+        measured = float('nan')
+        converged = False
+        iterations = 0
+        while iterations < self.max_iterations:
+            source = min(max(source, low), high)
+            if previous is not None and source == previous[0]:
+                break  # 已到达功率上下限，无法继续修正
+            set_power(source)
+            applied = source
+            if settle_time > 0:
+                time.sleep(settle_time)
+            measured = measure()
+            iterations += 1
+            if iteration_callback:
+                iteration_callback(iterations, source, measured)
+            if not math.isfinite(measured):
+                break  # 测量失败(功率计出错时返回NaN)，不再修正，按未收敛返回
+
+            error = target_dbm - measured
+            if abs(error) <= self.tolerance_db:
+                converged = True
+                break
+            if is_cancelled and is_cancelled():
+                break
+
+            # 割线法更新斜率
+            if previous is not None and source != previous[0]:
+                secant = (measured - previous[1]) / (source - previous[0])
+                if self.SLOPE_RANGE[0] <= secant <= self.SLOPE_RANGE[1]:
+                    slope = secant
+            previous = (source, measured)
+            source += min(max(error / slope, -self.max_step_db), self.max_step_db)
+
+        if converged and math.isfinite(applied):
+            self._cache[key] = (applied, slope)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+        return LevelingResult(
+            freq_hz=freq_hz,
+            target_dbm=target_dbm,
+            source_dbm=applied,
+            measured_dbm=measured,
+            iterations=iterations,
+            converged=converged,
+            from_cache=cached is not None
+        )
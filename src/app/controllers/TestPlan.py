@@ -0,0 +1,129 @@
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from app.utils.FeedBands import FEED_BANDS
+from app.utils.SignalUnitConverter import SignalUnitConverter
+
+
+class TestPlan:
+    """
+    预编译的测试计划表
+
+    每一步(频点)的馈源轴、补偿值和信号源设置功率在编译时一次性向量化计算，
+    以结构化数组保存；执行时只需按行读取并发送命令，不再逐点解析输入和查询补偿。
+    """
+
+    __test__ = False  # 类名以Test开头，避免被pytest当作测试类收集
+
+    AXES = tuple(FEED_BANDS)  # 馈源轴编码，-1表示超出所有频段
+
+    DTYPE = np.dtype([
+        ('freq_ghz', np.float64),         # 频率(GHz)
+        ('target_dbm', np.float64),       # 目标场强等效功率(dBm)
+        ('axis', np.int8),                # 馈源轴编码
+        ('compensation_db', np.float32),  # 补偿值(dB)
+        ('source_dbm', np.float64),       # 信号源设置功率(dBm)
+        ('in_range', np.bool_),           # 是否在校准频率范围内(范围外补偿为0)
+    ])
+
+    def __init__(self, steps: np.ndarray, polarization: str = "THETA", dwell_s: float = 1.0):
+        """
+        :param steps: DTYPE结构化数组
+        :param polarization: 极化('THETA'/'PHI')，用于生成链路模式
+        :param dwell_s: 每步驻留时间(秒)
+        """
+        self.steps = steps
+        self.polarization = polarization.upper()
+        self.dwell_s = dwell_s
+
+    def __len__(self) -> int:
+        return len(self.steps)
+
+    def axis(self, index: int) -> Optional[str]:
+        """第index步的馈源轴，超出所有频段时为None"""
+        code = int(self.steps['axis'][index])
+        return self.AXES[code] if code >= 0 else None
+
+    def link_mode(self, index: int) -> Optional[str]:
+        """第index步的链路模式，如 FEED_KU_THETA"""
+        axis = self.axis(index)
+        return f"FEED_{axis}_{self.polarization}" if axis else None
+
+    def commands(self, index: int) -> List[str]:
+        """第index步需要发送的信号源命令"""
+        step = self.steps[index]
+        return [
+            f"SOURce:FREQuency {step['freq_ghz']:.6f}GHz",
+            f"SOURce:POWer {step['source_dbm']:.2f}",
+        ]
+
+    @property
+    def feed_changes(self) -> int:
+        """执行过程中馈源轴切换的次数(包括第一步)"""
+        axes = self.steps['axis'][self.steps['axis'] >= 0]
+        return int(np.count_nonzero(np.diff(axes))) + 1 if len(axes) else 0
+
+    @staticmethod
+    def load_frequencies(filepath: str) -> np.ndarray:
+        """读取频点列表CSV(包含freq列，单位GHz)"""
+        df = pd.read_csv(filepath)
+        df.columns = df.columns.str.strip().str.lower()
+        if 'freq' not in df.columns:
+            raise ValueError("CSV文件必须包含'freq'列")
+        return df['freq'].to_numpy(dtype=np.float64)
+
+    @classmethod
+    def compile(cls, freqs_ghz, targets, unit: str = 'dBm', polarization: str = "THETA",
+                engine=None, dwell_s: float = 1.0,
+                converter: Optional[SignalUnitConverter] = None) -> 'TestPlan':
+        """
+        编译测试计划
+
+        :param freqs_ghz: 频点列表(GHz)，按给定顺序执行
+        :param targets: 目标电平，标量或与频点等长的数组
+        :param unit: 目标电平单位(功率或电场强度单位)
+        :param polarization: 极化('THETA'/'PHI')
+        :param engine: CompensationEngine，为None时不补偿
+        :param dwell_s: 每步驻留时间(秒)
+        :param converter: 单位转换器
+        :return: 测试计划
+        """
+        converter = converter or SignalUnitConverter()
+        polarization = polarization.upper()
+        freqs = np.asarray(freqs_ghz, dtype=np.float64)
+        targets = np.broadcast_to(np.asarray(targets, dtype=np.float64), freqs.shape)
+
+        # 目标电平统一转换为dBm
+        unit = converter.POWER_UNIT_ALIASES.get(unit.strip().lower(), unit)
+        if unit in converter.EFIELD_TO_V_M or unit == 'dBμV/m':
+            dbuV_m = converter.convert_efield_array(targets, unit, 'dBμV/m')
+            target_dbm = converter.dbuV_m_to_dbm_array(dbuV_m, freqs * 1e9)
+        else:
+            target_dbm = converter.convert_power_array(targets, unit, 'dBm')
+
+        # 馈源轴(频段边界处取靠前的频段，与feed_axis_for一致)
+        axis = np.full(freqs.shape, -1, dtype=np.int8)
+        for code, (low, high) in reversed(list(enumerate(FEED_BANDS.values()))):
+            axis[(freqs >= low) & (freqs <= high)] = code
+
+        # 补偿值: 先按文件参考功率估算输出功率，多参考功率时再按估算值插值一次
+        compensation = np.zeros(freqs.shape)
+        if engine is not None:
+            compensation = engine.lookup_array(freqs, polarization)
+            if len(engine.ref_powers) > 1:
+                compensation = engine.interpolate_array(
+                    freqs, polarization, target_dbm - np.nan_to_num(compensation)
+                )
+        in_range = ~np.isnan(compensation)
+        compensation = np.nan_to_num(compensation)
+
+        steps = np.empty(len(freqs), dtype=cls.DTYPE)
+        steps['freq_ghz'] = freqs
+        steps['target_dbm'] = target_dbm
+        steps['axis'] = axis
+        steps['compensation_db'] = compensation
+        steps['source_dbm'] = target_dbm - compensation
+        steps['in_range'] = in_range
+        return cls(steps, polarization, dwell_s)
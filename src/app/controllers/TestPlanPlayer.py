@@ -0,0 +1,96 @@
+from typing import Callable, Optional
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+
+class TestPlanPlayer(QObject):
+    """
+    测试计划执行器
+
+    在主线程中按驻留时间逐步执行TestPlan：每步只发送预先生成的频率和功率命令；
+    馈源轴变化时发出feed_requested，由主窗口完成达位和链路切换后
+    调用on_feed_completed继续执行。
+    """
+
+    step_started = pyqtSignal(int, int)  # (步序号, 总步数)
+    feed_requested = pyqtSignal(str, str)  # (馈源轴, 链路模式)
+    finished = pyqtSignal(bool, str)  # (是否全部完成, 说明)
+
+    def __init__(self, plan, send_command: Callable[[str], bool], feed_control: bool = True,
+                 parent: Optional[QObject] = None):
+        """
+        :param plan: TestPlan实例
+        :param send_command: 发送一条命令的回调，返回是否成功
+        :param feed_control: 是否随频点切换馈源(对应频率联动)
+        """
+        super().__init__(parent)
+        self.plan = plan
+        self.send_command = send_command
+        self.feed_control = feed_control
+        self._index = 0
+        self._running = False
+        self._current_axis = None
+        self._waiting_axis = None
+
+        self._dwell_timer = QTimer(self)
+        self._dwell_timer.setSingleShot(True)
+        self._dwell_timer.timeout.connect(self._run_step)
+
+    @property
+    def is_running(self) -> bool:
+        return self._running
+
+    @property
+    def current_index(self) -> int:
+        return self._index
+
+    def start(self):
+        self._index = 0
+        self._current_axis = None
+        self._waiting_axis = None
+        self._running = True
+        self._run_step()
+
+    def stop(self):
+        if self._running:
+            self._finish(False, f"测试计划已中止 ({self._index}/{len(self.plan)})")
+
+    def on_feed_completed(self, axis: str, success: bool):
+        """馈源操作完成(连接StatusPanel控制器的operation_completed信号)"""
+        if not self._running or axis != self._waiting_axis:
+            return
+        self._waiting_axis = None
+        if not success:
+            self._finish(False, f"{axis}轴达位失败")
+            return
+        self._current_axis = axis
+        self._apply_step()
+
+    def _run_step(self):
+        if not self._running:
+            return
+        if self._index >= len(self.plan):
+            self._finish(True, f"测试计划完成: {len(self.plan)}步")
+            return
+
+        axis = self.plan.axis(self._index)
+        if self.feed_control and axis and axis != self._current_axis:
+            self._waiting_axis = axis
+            self.feed_requested.emit(axis, self.plan.link_mode(self._index))
+            return
+        self._apply_step()
+
+    def _apply_step(self):
+        self.step_started.emit(self._index, len(self.plan))
+        for cmd in self.plan.commands(self._index):
+            if not self.send_command(cmd):
+                self._finish(False, f"第{self._index + 1}步命令发送失败: {cmd}")
+                return
+        self._index += 1
+        self._dwell_timer.start(int(self.plan.dwell_s * 1000))
+
+    def _finish(self, completed: bool, message: str):
+        self._running = False
+        self._waiting_axis = None
+        self._dwell_timer.stop()
+        self.finished.emit(completed, message)
@@ -0,0 +1,265 @@
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from app.utils.FeedBands import FEED_BANDS
+
+
+@dataclass
+class SequenceStep:
+    action: str                 # freq/power/output/link/feed/home/dwell/measure/loop
+    value: Any = None           # 频率(GHz)、功率(dBm)、ON/OFF、链路模式、馈源轴、驻留时间(秒)或循环次数
+    steps: List['SequenceStep'] = field(default_factory=list)  # 循环体(仅loop)
+
+    def describe(self) -> str:
+        if self.action == 'loop':
+            return f"loop x{self.value} ({len(self.steps)}步)"
+        return f"{self.action} {self.value}" if self.value is not None else self.action
+
+
+@dataclass
+class SequenceMeasurement:
+    step: int               # 执行序号
+    freq_ghz: float         # 测量时的频率(GHz)
+    power_dbm: float        # 测量时的信号源设置功率(dBm)
+    value: float            # 测量值
+    timestamp: float        # 测量时间(time.time())
+
+
+class TestSequence:
+    """
+    声明式测试序列
+
+    步骤列表可由JSON描述，例如:
+        [{"link": "FEED_X_THETA"}, {"feed": "X"}, {"output": "ON"},
+         {"loop": 2, "steps": [{"freq": 8.5}, {"power": -20}, {"dwell": 0.5}, {"measure": "power"}]}]
+    """
+
+    __test__ = False  # 类名以Test开头，避免被pytest当作测试类收集
+
+    ACTIONS = ('freq', 'power', 'output', 'link', 'feed', 'home', 'dwell', 'measure', 'loop')
+
+    def __init__(self, steps: List[SequenceStep], name: str = ""):
+        self.steps = steps
+        self.name = name
+
+    def __len__(self) -> int:
+        """展开循环后的总步数"""
+        return self._count(self.steps)
+
+    @classmethod
+    def _count(cls, steps: List[SequenceStep]) -> int:
+        return sum(int(step.value) * cls._count(step.steps) if step.action == 'loop' else 1 for step in steps)
+
+    @classmethod
+    def from_list(cls, items: List[Dict], name: str = "") -> 'TestSequence':
+        return cls(cls._parse_steps(items), name)
+
+    @classmethod
+    def _parse_steps(cls, items: List[Dict]) -> List[SequenceStep]:
+        steps = []
+        for item in items:
+            actions = [key for key in item if key in cls.ACTIONS]
+            if len(actions) != 1:
+                raise ValueError(f"无法识别的序列步骤: {item}")
+            action = actions[0]
+            value = item[action]
+            if action == 'loop':
+                if int(value) < 0:
+                    raise ValueError(f"循环次数无效: {value}")
+                steps.append(SequenceStep(action, int(value), cls._parse_steps(item.get('steps', []))))
+                continue
+            if action in ('freq', 'power', 'dwell'):
+                value = float(value)
+            elif action in ('link', 'feed', 'home', 'output'):
+                value = str(value).strip().upper()
+            if action == 'feed' and value not in FEED_BANDS:
+                raise ValueError(f"未知馈源轴: {value}")
+            steps.append(SequenceStep(action, value))
+        return steps
+
+    @classmethod
+    def load(cls, filepath: str) -> 'TestSequence':
+        """从JSON文件读取测试序列(顶层为步骤列表，或包含steps键的对象)"""
+        with open(filepath, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            return cls.from_list(data.get('steps', []), data.get('name', ""))
+        return cls.from_list(data)
+
+    @classmethod
+    def from_plan(cls, plan, measure: bool = False) -> 'TestSequence':
+        """
+        由TestPlan生成测试序列，只在馈源轴变化时切换链路和达位
+
+        :param plan: 已编译的TestPlan
+        :param measure: 每个频点驻留后是否测量
+        """
+        steps = []
+        current_axis = None
+        for i in range(len(plan)):
+            axis = plan.axis(i)
+            if axis and axis != current_axis:
+                steps.append(SequenceStep('link', plan.link_mode(i)))
+                steps.append(SequenceStep('feed', axis))
+                current_axis = axis
+            step = plan.steps[i]
+            steps.append(SequenceStep('freq', float(step['freq_ghz'])))
+            steps.append(SequenceStep('power', round(float(step['source_dbm']), 2)))
+            steps.append(SequenceStep('dwell', plan.dwell_s))
+            if measure:
+                steps.append(SequenceStep('measure', 'power'))
+        return cls(steps)
+
+
+class SequenceRunner:
+    """
+    测试序列执行器(阻塞执行，由SequenceThread在后台线程调用)
+
+    馈源达位/复位命令发出后不等待完成，后续与馈源无关的频率、功率和链路步骤继续执行，
+    遇到依赖馈源位置的步骤(驻留、测量、射频输出、下一次馈源操作)或序列结束时才轮询等待到位。
+    """
+
+    # 可以在馈源运动期间执行的步骤
+    PIPELINE_ACTIONS = ('freq', 'power', 'link')
+
+    def __init__(self, send: Callable[[str, bool], str],
+                 measure: Optional[Callable[[float], float]] = None,
+                 motion_timeout: float = 90.0, poll_interval: float = 0.2):
+        """
+        :param send: 发送命令的回调(命令, 是否等待响应)，返回响应文本
+        :param measure: 测量回调(频率Hz)，返回测量值
+        :param motion_timeout: 馈源运动超时(秒)
+        :param poll_interval: 馈源状态轮询间隔(秒)
+        """
+        self.send = send
+        self.measure = measure
+        self.motion_timeout = motion_timeout
+        self.poll_interval = poll_interval
+        self.freq_ghz = 0.0
+        self.power_dbm = 0.0
+        self.measurements: List[SequenceMeasurement] = []
+        self._reached_axes = None  # 已达位的馈源轴，首次馈源操作时查询
+        self._motion = None  # 进行中的馈源运动(操作, 轴, 开始时间)
+        self._counter = 0
+
+    def run(self, sequence: TestSequence,
+            step_callback: Optional[Callable[[int, str, float], None]] = None,
+            is_cancelled: Optional[Callable[[], bool]] = None,
+            wait_if_paused: Optional[Callable[[], None]] = None) -> bool:
+        """
+        执行测试序列
+
+        :param step_callback: 每步完成后回调(执行序号, 步骤描述, 耗时秒)
+        :param is_cancelled: 返回True时中止
+        :param wait_if_paused: 每步开始前调用，暂停时阻塞
+        :return: 是否全部执行完成(中止时为False)
+        """
+        self._counter = 0
+        self.measurements = []
+        self._step_callback = step_callback
+        self._is_cancelled = is_cancelled or (lambda: False)
+        self._wait_if_paused = wait_if_paused
+        completed = self._run_steps(sequence.steps)
+        if completed:
+            self._wait_motion()
+        return completed and not self._is_cancelled()
+
+    def _run_steps(self, steps: List[SequenceStep]) -> bool:
+        for step in steps:
+            if step.action == 'loop':
+                for _ in range(step.value):
+                    if not self._run_steps(step.steps):
+                        return False
+                continue
+            if self._wait_if_paused:
+                self._wait_if_paused()
+            if self._is_cancelled():
+                return False
+
+            start = time.perf_counter()
+            if step.action not in self.PIPELINE_ACTIONS:
+                self._wait_motion()
+                if self._is_cancelled():
+                    return False
+            self._execute(step)
+            self._counter += 1
+            if self._step_callback:
+                self._step_callback(self._counter, step.describe(), time.perf_counter() - start)
+        return True
+
+    def _execute(self, step: SequenceStep):
+        action, value = step.action, step.value
+        if action == 'freq':
+            self.send(f"SOURce:FREQuency {value}GHz", True)
+            self.freq_ghz = value
+        elif action == 'power':
+            self.send(f"SOURce:POWer {value}", True)
+            self.power_dbm = value
+        elif action == 'output':
+            self.send(f"SOURce:OUTPut {value}", True)
+        elif action == 'link':
+            self.send(f"CONFigure:LINK {value}", False)
+        elif action == 'feed':
+            # 同一时间只允许一个馈源达位，先复位其它已达位的馈源
+            for axis in self._query_reached_axes():
+                if axis != value:
+                    self._start_motion('HOME', axis)
+                    self._wait_motion()
+            self._start_motion('FEED', value)
+        elif action == 'home':
+            self._start_motion('HOME', value)
+        elif action == 'dwell':
+            self._sleep(value)
+        elif action == 'measure':
+            if self.measure is None:
+                raise RuntimeError("未连接测量仪器")
+            value = self.measure(self.freq_ghz * 1e9)
+            self.measurements.append(SequenceMeasurement(
+                self._counter + 1, self.freq_ghz, self.power_dbm, value, time.time()))
+
+    def _query_reached_axes(self) -> List[str]:
+        if self._reached_axes is None:
+            self._reached_axes = {axis for axis in FEED_BANDS
+                                  if "OK" in self.send(f"READ:MOTion:FEED? {axis}", True)}
+        return list(self._reached_axes)
+
+    def _start_motion(self, operation: str, axis: str):
+        self._wait_motion()
+        self.send(f"MOTion:{operation} {axis}", True)
+        self._motion = (operation, axis, time.monotonic())
+
+    def _wait_motion(self):
+        """轮询等待进行中的馈源运动完成(连续2次确认到位，与状态面板一致)"""
+        if self._motion is None:
+            return
+        operation, axis, started = self._motion
+        query = f"READ:MOTion:{operation}? {axis}"
+        confirmed = 0
+        while confirmed < 2:
+            if self._is_cancelled():
+                return
+            if time.monotonic() - started > self.motion_timeout:
+                self._motion = None
+                raise TimeoutError(f"{axis}轴{'复位' if operation == 'HOME' else '达位'}超时")
+            confirmed = confirmed + 1 if "OK" in self.send(query, True) else 0
+            if confirmed < 2:
+                time.sleep(self.poll_interval)
+        self._motion = None
+        if self._reached_axes is not None:
+            if operation == 'FEED':
+                self._reached_axes.add(axis)
+            elif axis == 'ALL':
+                self._reached_axes.clear()
+            else:
+                self._reached_axes.discard(axis)
+
+    def _sleep(self, seconds: float):
+        """可中止的等待"""
+        deadline = time.monotonic() + seconds
+        while not self._is_cancelled():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            time.sleep(min(remaining, 0.05))
@@ -1,7 +1,6 @@
 """
 IEEE 488.2标准SCPI指令封装
 """
-import time
 from app.core.exceptions.scpi import SCPIError
 from app.core.exceptions.scpi import SCPICommandError
 from app.core.exceptions.scpi import SCPIResponseError
@@ -18,40 +17,51 @@ class SCPICommands(QObject):
         super().__init__()
         self._tcp = tcp_client
         self._mutex = mutex
+
+    @property
+    def is_connected(self) -> bool:
+        """底层TCP连接是否可用"""
+        return bool(getattr(self._tcp, 'connected', False))
     
+    @property
+    def _device(self) -> str:
+        """设备地址(用于异常信息)"""
+        try:
+            return "%s:%s" % self._tcp.sock.getpeername()[:2]
+        except (AttributeError, OSError, TypeError):
+            return "TCP"
+
     def send_command(self, cmd: str, expect_response: bool = True, timeout: int = 1000):
-        """增强版命令发送方法"""
+        """
+        增强版命令发送方法
+
+        :param cmd: SCPI命令
+        :param expect_response: 是否等待响应
+        :param timeout: 响应超时(毫秒)
+        :return: (是否成功, 响应文本)
+        """
         self._mutex.lock()
         try:
             # 发送命令
             success, msg = self._tcp.send(cmd + '\n')
             if not success:
                 raise SCPICommandError(
-                    device=self._tcp.address,
+                    device=self._device,
                     command=cmd,
-                    message=msg
+                    response=msg
                 )
             
             if not expect_response:
                 return True, ""
  
-            # 接收响应
-            start_time = time.time()
-            while (time.time() - start_time) * 1000 < timeout:
-                success, resp = self._tcp.receive(timeout=100)  # 分块检查
-                if success:
-                    return True, resp.strip()
-                elif resp != "":  # 非空响应但解析失败
-                    raise SCPIResponseError(
-                        device=self._tcp.address,
-                        command=cmd,
-                        response=resp,
-                        expected_format="ASCII文本"
-                    )
+            # 接收响应(TcpClient.receive的超时以秒为单位，超时后不再重试)
+            success, resp = self._tcp.receive(max_retries=1, base_timeout=timeout / 1000)
+            if success:
+                return True, resp.strip()
             
             # 超时处理
             raise SCPITimeoutError(
-                device=self._tcp.address,
+                device=self._device,
                 command=cmd,
                 timeout_ms=timeout
             )
@@ -0,0 +1,129 @@
+# file: core/ui_scheduler.py
+import threading
+import time
+import traceback
+from dataclasses import dataclass
+from typing import Callable, Dict, Hashable, Tuple
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+
+@dataclass
+class FrameStats:
+    frame: int          # 帧序号
+    updates: int        # 本帧执行的更新数
+    coalesced: int      # 本帧被合并(跳过)的中间状态数
+    cost_ms: float      # 本帧耗时(毫秒)
+
+
+class UiUpdateScheduler(QObject):
+    """
+    全局界面刷新调度器
+
+    控件把界面更新按键登记为"待刷新"，同一个键只保留最后一次登记的回调和参数；
+    每帧(默认30Hz)在主线程统一执行一次，中间状态直接丢弃。没有待刷新内容时定时器不运行。
+    可以在任意线程中登记，回调总是在主线程执行。
+    """
+    # 每帧执行后发出(FrameStats)，用于统计刷新耗时
+    frame_rendered = pyqtSignal(object)
+    _wake = pyqtSignal()
+
+    def __init__(self, fps: float = 30.0):
+        super().__init__()
+        self._lock = threading.Lock()
+        self._pending: Dict[Hashable, Tuple[Callable, tuple]] = {}
+        self._coalesced = 0
+        self._frame = 0
+        self.total_cost_ms = 0.0
+        self.max_cost_ms = 0.0
+        self.log_callback = None
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._render_frame)
+        self._wake.connect(self._ensure_timer)
+        self.set_fps(fps)
+
+    @property
+    def fps(self) -> float:
+        return self._fps
+
+    @property
+    def frame_count(self) -> int:
+        return self._frame
+
+    def set_fps(self, fps: float):
+        """设置刷新帧率，0表示不按帧节流(在下一次事件循环时执行)"""
+        self._fps = max(float(fps), 0.0)
+        self._timer.setInterval(int(round(1000.0 / self._fps)) if self._fps > 0 else 0)
+
+    def set_log_callback(self, callback):
+        """设置日志回调函数，格式为 func(msg: str, level: str)，用于报告更新回调中的异常"""
+        self.log_callback = callback
+
+    def schedule(self, key: Hashable, callback: Callable, *args):
+        """
+        登记界面更新，同一个键在一帧内只执行最后一次
+
+        :param key: 更新键，通常为(控件, 更新项)
+        :param callback: 在主线程执行的更新函数
+        """
+        with self._lock:
+            if key in self._pending:
+                self._coalesced += 1
+            self._pending[key] = (callback, args)
+        if threading.current_thread() is threading.main_thread():
+            self._ensure_timer()
+        else:
+            self._wake.emit()  # 跨线程排队到主线程启动定时器
+
+    def cancel(self, key: Hashable):
+        """取消尚未执行的更新"""
+        with self._lock:
+            self._pending.pop(key, None)
+
+    def flush(self):
+        """立即执行所有待刷新的更新(在主线程调用)"""
+        self._timer.stop()
+        self._render_frame()
+
+    def _ensure_timer(self):
+        if not self._timer.isActive() and self._pending:
+            self._timer.start()
+
+    def _render_frame(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            coalesced, self._coalesced = self._coalesced, 0
+        if not pending:
+            return
+
+        start = time.perf_counter()
+        for key, (callback, args) in pending.items():
+            try:
+                callback(*args)
+            except Exception as e:
+                self._report_error(key, e)  # 单个控件出错不影响其它控件刷新
+        cost_ms = (time.perf_counter() - start) * 1000
+
+        self._frame += 1
+        self.total_cost_ms += cost_ms
+        self.max_cost_ms = max(self.max_cost_ms, cost_ms)
+        self.frame_rendered.emit(FrameStats(self._frame, len(pending), coalesced, cost_ms))
+
+        # 本帧执行期间又登记的更新在下一帧处理
+        self._ensure_timer()
+
+    def _report_error(self, key: Hashable, error: Exception):
+        """通过日志回调报告更新失败，未设置回调或日志本身出错时输出到控制台"""
+        if self.log_callback:
+            try:
+                self.log_callback(f"界面更新失败({key}): {error}", "ERROR")
+                return
+            except Exception:
+                pass
+        traceback.print_exception(type(error), error, error.__traceback__)
+
+
+# 创建全局界面刷新调度器实例
+ui_scheduler = UiUpdateScheduler()
@@ -0,0 +1,205 @@
+from datetime import datetime, timedelta
+from typing import List
+
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QFormLayout, QComboBox, QLineEdit,
+    QSpinBox, QTableWidget, QTableWidgetItem, QAbstractItemView, QHeaderView,
+    QPushButton, QDialogButtonBox, QLabel, QFileDialog
+)
+from PyQt5.QtCore import Qt, QTimer
+
+
+class CalibrationSearchDialog(QDialog):
+    """
+    校准文件检索对话框
+
+    基于校准目录索引按频段、极化、参考功率、天线序列号和日期筛选归档文件，
+    筛选条件变化后短暂延时再查询，不打开任何校准文件。
+    也可以通过"浏览文件"回退到普通文件选择对话框。
+    """
+
+    COLUMNS = ("文件名", "极化", "参考功率(dBm)", "频率范围(GHz)", "点数", "天线SN", "创建时间", "归档")
+
+    def __init__(self, cal_manager, multi_select: bool = False, title: str = "选择校准文件", parent=None):
+        """
+        :param cal_manager: CalibrationFileManager实例
+        :param multi_select: 是否允许多选
+        :param title: 窗口标题
+        """
+        super().__init__(parent)
+        self.cal_manager = cal_manager
+        self.multi_select = multi_select
+        self._selected_paths: List[str] = []
+
+        self.setWindowTitle(title)
+        self.resize(980, 560)
+
+        self._init_ui()
+
+        # 筛选条件变化后延时查询，避免每次按键都查询
+        self._query_timer = QTimer(self)
+        self._query_timer.setSingleShot(True)
+        self._query_timer.setInterval(150)
+        self._query_timer.timeout.connect(self._run_query)
+
+        self._connect_signals()
+        self.cal_manager.refresh_catalog()
+        self._run_query()
+
+    def _init_ui(self):
+        self.band_combo = QComboBox()
+        self.band_combo.addItems(["全部", "X", "KU", "K", "KA"])
+        self.pol_combo = QComboBox()
+        self.pol_combo.addItems(["全部", "THETA", "PHI", "DUAL"])
+        self.format_combo = QComboBox()
+        self.format_combo.addItems(["全部", "CSV", "BIN"])
+        self.ref_power_input = QLineEdit()
+        self.ref_power_input.setPlaceholderText("如 -20")
+        self.antenna_sn_input = QLineEdit()
+        self.antenna_sn_input.setPlaceholderText("天线序列号")
+        self.text_input = QLineEdit()
+        self.text_input.setPlaceholderText("文件名/操作员/版本说明")
+        self.days_spin = QSpinBox()
+        self.days_spin.setRange(0, 3650)
+        self.days_spin.setSpecialValueText("不限")
+        self.days_spin.setSuffix(" 天")
+
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(
+            QAbstractItemView.ExtendedSelection if self.multi_select else QAbstractItemView.SingleSelection
+        )
+        self.table.setSortingEnabled(True)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+
+        self.result_label = QLabel()
+        self.btn_browse = QPushButton("浏览文件...")
+        self.button_box = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+
+        filter_left = QFormLayout()
+        filter_left.addRow("频段:", self.band_combo)
+        filter_left.addRow("极化:", self.pol_combo)
+        filter_left.addRow("格式:", self.format_combo)
+        filter_right = QFormLayout()
+        filter_right.addRow("参考功率:", self.ref_power_input)
+        filter_right.addRow("天线SN:", self.antenna_sn_input)
+        filter_right.addRow("最近:", self.days_spin)
+        filter_layout = QHBoxLayout()
+        filter_layout.addLayout(filter_left)
+        filter_layout.addLayout(filter_right)
+
+        bottom_layout = QHBoxLayout()
+        bottom_layout.addWidget(self.result_label)
+        bottom_layout.addStretch()
+        bottom_layout.addWidget(self.btn_browse)
+        bottom_layout.addWidget(self.button_box)
+
+        layout = QVBoxLayout(self)
+        layout.addLayout(filter_layout)
+        layout.addWidget(self.text_input)
+        layout.addWidget(self.table)
+        layout.addLayout(bottom_layout)
+
+    def _connect_signals(self):
+        schedule_query = lambda *_: self._query_timer.start()
+        for combo in (self.band_combo, self.pol_combo, self.format_combo):
+            combo.currentIndexChanged.connect(schedule_query)
+        for edit in (self.ref_power_input, self.antenna_sn_input, self.text_input):
+            edit.textChanged.connect(schedule_query)
+        self.days_spin.valueChanged.connect(schedule_query)
+        self.table.itemDoubleClicked.connect(lambda _: self.accept())
+        self.btn_browse.clicked.connect(self._on_browse)
+        self.button_box.accepted.connect(self.accept)
+        self.button_box.rejected.connect(self.reject)
+
+    def _filters(self) -> dict:
+        """由当前控件状态组成查询条件"""
+        filters = {}
+        if self.band_combo.currentIndex() > 0:
+            filters['band'] = self.band_combo.currentText()
+        if self.pol_combo.currentIndex() > 0:
+            filters['polarization'] = self.pol_combo.currentText()
+        if self.format_combo.currentIndex() > 0:
+            filters['file_format'] = self.format_combo.currentText().lower()
+        try:
+            if self.ref_power_input.text().strip():
+                filters['ref_power'] = float(self.ref_power_input.text())
+        except ValueError:
+            pass
+        if self.antenna_sn_input.text().strip():
+            filters['antenna_sn'] = self.antenna_sn_input.text().strip()
+        if self.text_input.text().strip():
+            filters['text'] = self.text_input.text().strip()
+        if self.days_spin.value() > 0:
+            filters['since'] = datetime.now() - timedelta(days=self.days_spin.value())
+        return filters
+
+    def _run_query(self):
+        records = self.cal_manager.query_calibrations(refresh=False, **self._filters())
+
+        self.table.setSortingEnabled(False)
+        self.table.setRowCount(len(records))
+        for row, record in enumerate(records):
+            freq_range = ""
+            if record['start_ghz'] is not None and record['stop_ghz'] is not None:
+                freq_range = f"{record['start_ghz']:g} - {record['stop_ghz']:g}"
+            created = ""
+            if record['created_ts'] is not None:
+                created = datetime.fromtimestamp(record['created_ts']).strftime("%Y-%m-%d %H:%M:%S")
+            values = (
+                record['filename'],
+                record['polarization'] or "",
+                (record['ref_power'] or "").replace('_', ', '),
+                freq_range,
+                "" if record['points'] is None else str(record['points']),
+                record['antenna_sn'] or "",
+                created,
+                "是" if record['is_archived'] else "否",
+            )
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if column == 0:
+                    item.setData(Qt.UserRole, record['path'])
+                    item.setToolTip(record['path'])
+                self.table.setItem(row, column, item)
+        self.table.setSortingEnabled(True)
+        self.result_label.setText(f"共 {len(records)} 个文件")
+
+    def _on_browse(self):
+        """回退到普通文件选择对话框"""
+        if self.multi_select:
+            paths, _ = QFileDialog.getOpenFileNames(
+                self, self.windowTitle(), self.cal_manager.base_dir, "校准文件 (*.csv *.bin);;所有文件 (*)"
+            )
+        else:
+            path, _ = QFileDialog.getOpenFileName(
+                self, self.windowTitle(), self.cal_manager.base_dir, "校准文件 (*.csv *.bin);;所有文件 (*)"
+            )
+            paths = [path] if path else []
+        if paths:
+            self._selected_paths = paths
+            super().accept()
+
+    def accept(self):
+        rows = sorted({index.row() for index in self.table.selectionModel().selectedRows()})
+        self._selected_paths = [self.table.item(row, 0).data(Qt.UserRole) for row in rows]
+        if self._selected_paths:
+            super().accept()
+
+    def selected_files(self) -> List[str]:
+        return list(self._selected_paths)
+
+    @classmethod
+    def get_files(cls, parent, cal_manager, multi_select: bool = False, title: str = "选择校准文件") -> List[str]:
+        """
+        打开检索对话框并返回选中的文件路径
+
+        :return: 选中的文件路径列表，取消时为空列表
+        """
+        dialog = cls(cal_manager, multi_select=multi_select, title=title, parent=parent)
+        if dialog.exec_() == QDialog.Accepted:
+            return dialog.selected_files()
+        return []
@@ -1,7 +1,8 @@
 
-from PyQt5.QtCore import Qt, QMutex, QUrl
-from PyQt5.QtWidgets import QMessageBox, QDialog, QVBoxLayout, QLabel, QTextEdit, QDialogButtonBox
+from PyQt5.QtCore import Qt, QMutex, QUrl, QTimer
+from PyQt5.QtWidgets import QMessageBox, QDialog, QVBoxLayout, QLabel, QTextEdit, QDialogButtonBox, QFileDialog
 from PyQt5.QtGui import QDesktopServices
+from typing import Optional
 import sys, os
 
 # # 添加项目根目录到系统路径
@@ -11,7 +12,18 @@ import sys, os
 from resources.ui.main_window_ui import MainWindowUI
 
 from app.threads.StatusQueryThread import StatusQueryThread
+from app.threads.CompensationTableThread import CompensationTableThread
+from app.threads.LevelingThread import LevelingThread
+from app.threads.SequenceThread import SequenceThread
 from app.core.scpi_commands import SCPICommands
+from app.core.ui_scheduler import ui_scheduler
+from app.utils.FeedBands import feed_axis_for
+from app.dialogs.CalibrationSearchDialog import CalibrationSearchDialog
+from app.controllers.CompensationEngine import CompensationEngine
+from app.controllers.FieldLeveler import FieldLeveler
+from app.controllers.TestPlan import TestPlan
+from app.controllers.TestPlanPlayer import TestPlanPlayer
+from app.controllers.TestSequence import TestSequence, SequenceRunner
 
 class MainWindow(MainWindowUI):
     def __init__(self, Communicator, SignalUnitConverter, CalibrationFileManager):
@@ -29,6 +41,7 @@ class MainWindow(MainWindowUI):
         # 初始化标准SCPI库
         self.scpi = SCPICommands(self.tcp_client, self.comm_mutex)
         self.scpi.command_executed.connect(self._handle_scpi_response)
+        self.calibration_panel.set_scpi(self.scpi)
 
         self.status_panel.set_main_window(self)
 
@@ -50,6 +63,20 @@ class MainWindow(MainWindowUI):
         }
         self.compensation_enabled = False
         self.calibration_data = None
+        self.compensation_engine = None  # 补偿查询引擎(加载校准文件时建立)
+        self.compensation_mode = 'linear'  # 补偿插值方式: nearest/linear/cubic
+        self.compensation_precompute = True  # 加载校准文件后在后台生成密集补偿查找表
+        self.compensation_table_step_ghz = 0.001  # 查找表频率步进(1MHz)
+        self.compensation_table = None  # 密集补偿查找表，生成完成前为None
+        self._compensation_table_thread = None
+        self.power_input_debounce_ms = 150  # 功率输入停止变化该时长后再换算补偿值
+        self.field_leveler = FieldLeveler()  # 闭环调平，收敛结果按(频率, 目标)缓存
+        self.leveling_settle_time = 0.1  # 调平时每次设置功率后的稳定时间(秒)
+        self._leveling_thread = None
+        self.test_plan_dwell_s = 1.0  # 测试计划每个频点的驻留时间(秒)
+        self._test_plan_player = None
+        self._sequence_thread = None
+        self.ui_refresh_rate_hz = 30.0  # 界面刷新帧率，状态轮询/日志/进度等更新按帧合并
         self.cal_manager = None
         self.current_feed_mode = None
         self._is_freq_link_connected = False
@@ -82,16 +109,29 @@ class MainWindow(MainWindowUI):
         self.status_panel.load_cal_btn.clicked.connect(self.load_calibration_file)
         self.status_panel._controller.motion_command.connect(self._send_motion_command)
         self.status_panel._controller.operation_completed.connect(self._handle_operation_completed)
-        self.power_input.textChanged.connect(self.on_power_input_changed)
-        self.raw_power_input.textChanged.connect(self.on_raw_power_input_changed)
+        # 功率输入防抖: 连续输入时只重新计时，停止输入后才进行单位换算和补偿计算
+        self._power_input_timer = self._create_debounce_timer(
+            lambda: self.on_power_input_changed(self.power_input.text()))
+        self._raw_power_input_timer = self._create_debounce_timer(
+            lambda: self.on_raw_power_input_changed(self.raw_power_input.text()))
+        self.power_input.textChanged.connect(
+            lambda _: self._schedule_power_input(self._power_input_timer, self._raw_power_input_timer))
+        self.raw_power_input.textChanged.connect(
+            lambda _: self._schedule_power_input(self._raw_power_input_timer, self._power_input_timer))
         #工具栏校准按钮
         self.calibration_action.triggered.connect(self.show_calibration_panel)
         self.import_action.triggered.connect(self.merge_calibration_files) 
         self.help_action.triggered.connect(self.open_help_document)
         self.plot_action.triggered.connect(self.show_plot_widget)
+        self.test_plan_action.triggered.connect(self.run_test_plan)
+        self.sequence_action.triggered.connect(self.run_test_sequence)
+        self.sequence_pause_action.triggered.connect(self.toggle_sequence_pause)
         self.export_action.triggered.connect(self.open_code_link)
         self.settings_action.triggered.connect(self.show_software_info)
 
+        ui_scheduler.set_fps(self.ui_refresh_rate_hz)
+        ui_scheduler.set_log_callback(self.log)
+
         # 状态栏初始信息
         self.show_status("系统就绪。")
         self.log("系统启动。", "INFO")
@@ -191,6 +231,9 @@ class MainWindow(MainWindowUI):
             f"PyQt版本: {pyqt_version}\n"
             f"安装路径: {os.path.abspath('.')}\n"
             f"校准文件路径: {os.path.abspath('.')}/src/calibration\n"
+            f"界面刷新: {ui_scheduler.fps:g}Hz, {ui_scheduler.frame_count}帧, "
+            f"平均{ui_scheduler.total_cost_ms / max(ui_scheduler.frame_count, 1):.2f}ms/帧, "
+            f"最大{ui_scheduler.max_cost_ms:.2f}ms\n"
         )
         layout.addWidget(info_text)
         
@@ -302,24 +345,19 @@ class MainWindow(MainWindowUI):
 
     def merge_calibration_files(self):
         """合并多个校准文件，合并成功后询问是否导入"""
-        from PyQt5.QtWidgets import QFileDialog, QMessageBox
+        from PyQt5.QtWidgets import QMessageBox
         from PyQt5.QtCore import Qt
         
         # 确保cal_manager已初始化
         if not hasattr(self, 'cal_manager') or self.cal_manager is None:
             self.cal_manager = self.calibrationFileManager(log_callback=self.log)
         
-        # 打开文件选择对话框，允许多选
-        file_dialog = QFileDialog()
-        file_dialog.setFileMode(QFileDialog.ExistingFiles)
-        file_dialog.setNameFilter("校准文件 (*.csv *.bin);;所有文件 (*)")
-        
-        # 应用主窗口的样式表到文件对话框
-        if hasattr(self, 'styleSheet'):
-            file_dialog.setStyleSheet(self.styleSheet())
+        # 打开校准文件检索对话框，允许多选
+        selected_files = CalibrationSearchDialog.get_files(
+            self, self.cal_manager, multi_select=True, title="选择要合并的校准文件"
+        )
         
-        if file_dialog.exec_():
-            selected_files = file_dialog.selectedFiles()
+        if selected_files:
             
             if len(selected_files) < 2:
                 warning_box = QMessageBox(QMessageBox.Warning, "选择不足", 
@@ -559,7 +597,8 @@ class MainWindow(MainWindowUI):
         src_status = status.get("src", {})
         if "rf" in src_status.keys():
             rf_state = src_status.get("rf", "OFF").upper()  # 默认OFF状态
-            self.link_diagram.set_source_state(rf_state == "ON")  # 明确传递布尔值
+            ui_scheduler.schedule((self.link_diagram, 'source'),
+                                  self.link_diagram.set_source_state, rf_state == "ON")  # 明确传递布尔值
         
         # 判断初始化状态
         motion_status = status.get("motion", {})
@@ -571,19 +610,21 @@ class MainWindow(MainWindowUI):
                     self.log("模组未初始化，运动操作已经关闭，请先进行系统初始化", "WARNING")
 
                     # 禁用频率联动选项框、复位按钮和达位按钮
-                    self.freq_feed_link_check.setEnabled(False)
-                    self.home_btn.setEnabled(False)
-                    self.feed_btn.setEnabled(False)
+                    ui_scheduler.schedule((self, 'motion_controls'), self._set_motion_controls_enabled, False)
             else:
                 # 系统已初始化，启用相关控件
-                self.freq_feed_link_check.setEnabled(True)
-                self.home_btn.setEnabled(True)
-                self.feed_btn.setEnabled(True)
+                ui_scheduler.schedule((self, 'motion_controls'), self._set_motion_controls_enabled, True)
         # 委托给StatusPanel处理更新逻辑
         self.status_panel._controller.update_motion_status(status.get("motion", {}))
         self.status_panel._controller.update_src_status(status.get("src", {}))
         self.status_panel._controller.update_operation_status(status.get("motion", {}))
 
+    def _set_motion_controls_enabled(self, enabled: bool):
+        """启用/禁用频率联动选项框、复位按钮和达位按钮"""
+        self.freq_feed_link_check.setEnabled(enabled)
+        self.home_btn.setEnabled(enabled)
+        self.feed_btn.setEnabled(enabled)
+
     def _update_status_cache(self, status):
         """Update the internal status cache"""
         # Update motion status
@@ -678,17 +719,7 @@ class MainWindow(MainWindowUI):
 
     def _determine_feed_axis(self, freq_ghz):
         """根据频率确定目标馈源轴"""
-        freq_ranges = {
-            "X": (8.0, 12.0),
-            "KU": (12.0, 18.0),
-            "K": (18.0, 26.5),
-            "KA": (26.5, 40.0)
-        }
-        
-        for axis, (min_freq, max_freq) in freq_ranges.items():
-            if min_freq <= freq_ghz <= max_freq:
-                return axis
-        return None
+        return feed_axis_for(freq_ghz)
 
     def _send_link_command(self, link_mode):
         """发送链路配置命令"""
@@ -745,6 +776,25 @@ class MainWindow(MainWindowUI):
 
 
     # region 功率输入处理
+    def _create_debounce_timer(self, callback) -> QTimer:
+        timer = QTimer(self)
+        timer.setSingleShot(True)
+        timer.setInterval(self.power_input_debounce_ms)
+        timer.timeout.connect(callback)
+        return timer
+
+    def _schedule_power_input(self, timer: QTimer, other: QTimer):
+        """输入框内容变化后重新计时；另一个输入框尚未处理的变化作废，避免互相覆盖"""
+        other.stop()
+        timer.start()
+
+    def _flush_power_input(self):
+        """立即处理尚未到时的功率输入(发送命令前调用)"""
+        for timer in (self._power_input_timer, self._raw_power_input_timer):
+            if timer.isActive():
+                timer.stop()
+                timer.timeout.emit()
+
     def on_power_input_changed(self, text):
         """补偿后功率输入框变化时的处理"""
         # 防止递归触发
@@ -787,7 +837,7 @@ class MainWindow(MainWindowUI):
                 power_dbm, _ = self.unit_converter.convert_power(power_value, power_unit, 'dBm')
             
             # 计算补偿值
-            compensation = self.get_compensation_value(freq_ghz) if self.compensation_enabled else 0.0
+            compensation = self.get_target_compensation(freq_ghz, power_dbm)
             raw_power = power_dbm - compensation
 
             # 根据目标单位转换补偿后的功率值
@@ -854,8 +904,8 @@ class MainWindow(MainWindowUI):
                 # 其他功率单位转换为dBm
                 raw_power_dbm, _ = self.unit_converter.convert_power(raw_power, power_unit, 'dBm')
             
-            # 计算补偿值
-            compensation = self.get_compensation_value(freq_ghz) if self.compensation_enabled else 0.0
+            # 计算补偿值(按原始输出功率在参考功率之间插值)
+            compensation = self.get_compensation_value(freq_ghz, ref_power=raw_power_dbm) if self.compensation_enabled else 0.0
             power_dbm = raw_power_dbm + compensation
             
             # 根据目标单位转换补偿后的功率值
@@ -887,37 +937,26 @@ class MainWindow(MainWindowUI):
     
     def load_calibration_file(self, filepath: str):
         """加载校准文件"""
-        from PyQt5.QtWidgets import QFileDialog
-    
         # 确保cal_manager已初始化
         if self.cal_manager is None:
             self.cal_manager = self.calibrationFileManager(log_callback=self.log)
     
             # self.cal_manager.generate_default_calibration()
-        # 获取最近校准文件目录
-        cal_dir = "calibrations"  # 默认目录
-        if hasattr(self, 'cal_manager'):
-            cal_dir = self.cal_manager.base_dir
-        
-        # 打开文件选择对话框
-        file_path, _ = QFileDialog.getOpenFileName(
-            self, 
-            "选择校准文件", 
-            cal_dir, 
-            "校准文件 (*.csv *.bin);;所有文件 (*)"
-        )
+        # 打开校准文件检索对话框(可回退到普通文件选择)
+        selected_files = CalibrationSearchDialog.get_files(self, self.cal_manager)
+        file_path = selected_files[0] if selected_files else ""
     
         if file_path:
             self.status_panel.cal_file_input.setText(file_path)
             self.log(f"已选择校准文件: {file_path}", "INFO")
     
             # 使用CalibrationFileManager加载文件
-            result = self.cal_manager.load_calibration_file(file_path)
+            result = self.cal_manager.load_calibration_file(file_path, verify_digest=True)
     
             # 打印文件内容验证（不重新加载文件）
             self._print_cal_file_contents(file_path, loaded_data=result)
     
-            if result:
+            if result and len(result['data']):
                 self.calibration_data = result['data']
                 # 处理ref_power可能是列表的情况
                 ref_power = result['meta'].get("base_param", {}).get("ref_power", -30.0)
@@ -935,6 +974,8 @@ class MainWindow(MainWindowUI):
                 self.compensation_enabled = True
 
                 self.calibration_data = result['data']
+                self.compensation_engine = CompensationEngine.from_result(result, mode=self.compensation_mode)
+                self._start_compensation_table()
                 self.compensation_enabled = True
                 self.status_panel.update_src_status({"cal_file": "Calib Load"})
 
@@ -946,6 +987,8 @@ class MainWindow(MainWindowUI):
                 self.log("校准文件加载成功，补偿功能已启用", "SUCCESS")
             else:
                 self.compensation_enabled = False
+                self.compensation_engine = None
+                self._start_compensation_table()
                 self.status_panel.update_src_status({"cal_file": "Calib Invalid"})
                 self.status_panel.set_cal_file_style(
                     text="Calib Load",
@@ -974,7 +1017,7 @@ class MainWindow(MainWindowUI):
             
             if filepath.lower().endswith('.bin'):
                 self.log("文件格式: 二进制校准文件 (RNXC格式)", "INFO")
-                self.log("数据编码: 每个数据点36字节(频率:4字节float + 8个参数:32字节)", "INFO")
+                self.log("数据编码: v2为64字节对齐的float64列数据块，v1为每个数据点8个float32", "INFO")
             elif filepath.lower().endswith('.csv'):
                 self.log("文件格式: CSV文本文件 (UTF-8编码)", "INFO")
                 self.log("数据格式: 逗号分隔值,每行9个字段(频率+8个参数)", "INFO")
@@ -1020,49 +1063,89 @@ class MainWindow(MainWindowUI):
             else:
                 self.log("数据点数不匹配", "WARNING")
 
-    def get_compensation_value(self, freq_ghz: float) -> float:
+    def _current_polarization(self) -> Optional[str]:
+        """当前链路的极化('THETA'/'PHI')，未知时为None"""
+        current_link = self.parse_link_response(self.status_cache.get("src", {}).get("link", ""))
+        if "THETA" in current_link:
+            return "THETA"
+        if "PHI" in current_link:
+            return "PHI"
+        return None
+
+    def get_compensation_value(self, freq_ghz: float, ref_power: Optional[float] = None) -> float:
         """
         根据频率获取补偿值，已考虑参考功率(ref_power)
+        补偿表在加载校准文件时建立，查询为二分查找加插值(方式见compensation_mode)
         :param freq_ghz: 频率(GHz)
+        :param ref_power: 信号源输出功率(dBm)，给定时在校准的多个参考功率之间双线性插值；
+                          None时使用校准文件的参考功率
         :return: 补偿值(dB)
         """
-        if not self.compensation_enabled or not self.calibration_data:
+        if not self.compensation_enabled or self.compensation_engine is None:
             return 0.0
         
-        # 检查频率是否在校准范围内
-        freqs = [point['freq'] for point in self.calibration_data]
-        if freq_ghz < min(freqs) or freq_ghz > max(freqs):
-            self.log(f"警告：频率{freq_ghz}GHz超出校准范围({min(freqs)}-{max(freqs)}GHz)", "WARNING")
+        # 根据链路模式选择使用Theta_corrected还是Phi_corrected
+        polarization = self._current_polarization()
+        if polarization is None:
+            self.log("未知链路模式，使用默认补偿值0dB", "WARNING")
             return 0.0
         
-        # 找到最接近的频率点
-        closest_point = min(self.calibration_data, key=lambda x: abs(x['freq'] - freq_ghz))
-        
-        # 获取当前链路模式
-        current_link = self.parse_link_response(self.status_cache.get("src", {}).get("link", ""))
-        
-        # 获取参考功率(从校准文件元数据中获取)
-        ref_power = self.cal_manager.current_meta.get("base_param", {}).get("ref_power", -30.0)  # 默认-30dBm
-        if isinstance(ref_power, list):
-            if len(ref_power) == 1:
-                ref_power = ref_power[0]
-            else:
-                ref_power = closest_point.get('reference_power', 0.0)
-        
-        # 根据链路模式选择使用Theta_corrected还是Phi_corrected，并减去参考功率
-        if "THETA" in current_link:
-            raw_comp = closest_point.get('theta_corrected', 0.0)
-            compensation = raw_comp - ref_power
-            self.log(f"补偿计算: THETA_raw={raw_comp}dB, ref_power={ref_power}dB, 最终补偿={compensation}dB", "DEBUG")
-            return compensation
-        elif "PHI" in current_link:
-            raw_comp = closest_point.get('phi_corrected', 0.0)
-            compensation = raw_comp - ref_power
-            self.log(f"补偿计算: PHI_raw={raw_comp}dB, ref_power={ref_power}dB, 最终补偿={compensation}dB", "DEBUG")
-            return compensation
+        if self.compensation_table is not None:
+            # 查找表已生成: 直接按下标取值
+            compensation = self.compensation_table.lookup(freq_ghz, polarization, ref_power)
+        elif ref_power is None:
+            compensation = self.compensation_engine.lookup(freq_ghz, polarization)
         else:
-            self.log("未知链路模式，使用默认补偿值0dB", "WARNING")
+            compensation = self.compensation_engine.interpolate(freq_ghz, polarization, ref_power)
+        if compensation is None:
+            freq_min, freq_max = self.compensation_engine.freq_range
+            self.log(f"警告：频率{freq_ghz}GHz超出校准范围({freq_min}-{freq_max}GHz)", "WARNING")
             return 0.0
+        return compensation
+
+    def _start_compensation_table(self):
+        """
+        使旧的补偿查找表失效，并按当前补偿引擎在后台重新生成
+        (未启用预计算或没有加载校准文件时只做失效处理)
+        """
+        self.compensation_table = None
+        thread = self._compensation_table_thread
+        if thread is not None and thread.isRunning():
+            thread.requestInterruption()
+            thread.wait()
+        self._compensation_table_thread = None
+        
+        if not self.compensation_precompute or self.compensation_engine is None:
+            return
+        thread = CompensationTableThread(self.compensation_engine, self.compensation_table_step_ghz, self)
+        thread.progress_signal.connect(lambda value: self.show_status(f"正在生成补偿查找表: {value}%", timeout=2000))
+        thread.table_ready.connect(self._on_compensation_table_ready)
+        thread.error_signal.connect(lambda msg: self.log(f"生成补偿查找表失败: {msg}", "WARNING"))
+        self._compensation_table_thread = thread
+        thread.start()
+
+    def _on_compensation_table_ready(self, engine, table):
+        """查找表生成完成(生成期间又加载了其它校准文件时丢弃)"""
+        if engine is not self.compensation_engine:
+            return
+        self.compensation_table = table
+        self.log(
+            f"补偿查找表已生成: {len(table)}个频点 x {len(table.ref_powers)}个参考功率, "
+            f"步进{table.step_ghz * 1000:g}MHz, {table.nbytes / 1024:.0f}KB", "INFO"
+        )
+
+    def get_target_compensation(self, freq_ghz: float, power_dbm: float) -> float:
+        """
+        获取输出目标功率power_dbm所需的补偿值
+        信号源输出功率 = 目标功率 - 补偿值，先按文件参考功率估算输出功率，
+        校准包含多个参考功率时再按估算的输出功率插值一次
+        """
+        if not self.compensation_enabled or self.compensation_engine is None:
+            return 0.0
+        compensation = self.get_compensation_value(freq_ghz)
+        if len(self.compensation_engine.ref_powers) > 1:
+            compensation = self.get_compensation_value(freq_ghz, ref_power=power_dbm - compensation)
+        return compensation
     # endregion
 
     # region 链路控制方法
@@ -1073,6 +1156,7 @@ class MainWindow(MainWindowUI):
         mode = self.link_mode_combo.currentText()
         cmd = f"CONFigure:LINK {mode}"
         self.link_diagram.set_link(mode)  # 动态刷新链路图
+        self.field_leveler.clear_cache()  # 链路变化后已调平的设置值失效
         
         # 发送命令
         self.send_and_log(cmd)
@@ -1142,6 +1226,7 @@ class MainWindow(MainWindowUI):
         self.send_and_log(cmd)
     
     def send_power_cmd(self):
+        self._flush_power_input()
         val = self.power_input.text().strip() + " " + self.power_unit_combo.currentText()
         
         if not val:
@@ -1181,7 +1266,7 @@ class MainWindow(MainWindowUI):
                 power_dbm, _ = self.unit_converter.convert_power(power_value, power_unit, 'dBm')
             
             # 计算补偿值(已包含ref_power处理)
-            compensation = self.get_compensation_value(freq_ghz) if self.compensation_enabled else 0.0
+            compensation = self.get_target_compensation(freq_ghz, power_dbm)
             
             # 计算实际需要设置的功率
             actual_power = power_dbm - compensation
@@ -1189,6 +1274,11 @@ class MainWindow(MainWindowUI):
             # 存储原始功率值
             self.current_power = power_dbm
             
+            if self.leveling_check.isChecked():
+                # 闭环调平: 以开环结果为起点反复测量修正
+                self._start_leveling(freq_ghz, power_dbm, actual_power)
+                return
+            
             cmd = f"SOURce:POWer {actual_power:.2f}"
             self.send_and_log(cmd)
             
@@ -1205,6 +1295,267 @@ class MainWindow(MainWindowUI):
             self.show_status(f"功率转换错误: {str(e)}")
             self.log(f"功率转换错误: {str(e)}", "ERROR")
 
+    def _start_leveling(self, freq_ghz: float, target_dbm: float, initial_dbm: float):
+        """
+        在后台执行闭环调平
+        测量值为功率计读数减去校准时的喇叭增益，与校准文件中的校正值一致；
+        初始斜率由校准数据在多个参考功率之间的变化估计
+        
+        :param freq_ghz: 当前频率(GHz)
+        :param target_dbm: 目标场强等效功率(dBm)
+        :param initial_dbm: 开环估算的信号源设置功率(dBm)
+        """
+        if self._leveling_thread is not None and self._leveling_thread.isRunning():
+            self.show_status("正在调平，请稍候")
+            return
+        sensor = self.calibration_panel.power_meter
+        if sensor is None:
+            self.show_status("闭环调平需要先在校准面板连接功率计")
+            self.log("闭环调平需要先在校准面板连接功率计", "WARNING")
+            return
+        
+        freq_hz = freq_ghz * 1e9
+        horn_gain, slope = 0.0, 1.0
+        polarization = self._current_polarization()
+        if self.compensation_engine is not None:
+            horn_gain = self.compensation_engine.horn_gain(freq_ghz)
+            if self.compensation_enabled and polarization:
+                slope = self.compensation_engine.power_slope(freq_ghz, polarization, initial_dbm)
+        
+        self.pause_status_thread()
+        self._leveling_thread = LevelingThread(
+            self.field_leveler, freq_hz, target_dbm, initial_dbm,
+            set_power=self._set_source_power,
+            measure=lambda: sensor.measure_power(freq_hz) - horn_gain,
+            slope=slope,
+            settle_time=self.leveling_settle_time,
+            parent=self
+        )
+        self._leveling_thread.iteration_done.connect(self._on_leveling_iteration)
+        self._leveling_thread.leveling_finished.connect(self._on_leveling_finished)
+        self._leveling_thread.error_occurred.connect(self._on_leveling_error)
+        self._leveling_thread.start()
+        self.show_status(f"正在调平: 目标 {target_dbm:.2f} dBm @ {freq_ghz}GHz")
+
+    def _set_source_power(self, power_dbm: float):
+        """设置信号源功率(在调平线程中调用，不更新界面)"""
+        self.comm_mutex.lock()
+        try:
+            success, msg = self.tcp_client.send(f"SOURce:POWer {power_dbm:.2f}\n")
+            if not success:
+                raise RuntimeError(f"发送失败: {msg}")
+            self.tcp_client.receive()
+        finally:
+            self.comm_mutex.unlock()
+
+    def _on_leveling_iteration(self, iteration: int, source_dbm: float, measured_dbm: float):
+        self.log(f"调平第{iteration}次: 设置 {source_dbm:.2f} dBm, 测得 {measured_dbm:.2f} dBm", "DEBUG")
+
+    def _on_leveling_finished(self, result):
+        self.resume_status_thread()
+        summary = (f"目标 {result.target_dbm:.2f} dBm, 设置 {result.source_dbm:.2f} dBm, "
+                   f"误差 {result.error_db:+.3f} dB, 迭代 {result.iterations} 次"
+                   f"{' (从缓存开始)' if result.from_cache else ''}")
+        if result.converged:
+            self.log(f"调平完成: {summary}", "SUCCESS")
+            self.show_status(f"调平完成: {result.iterations}次迭代")
+        else:
+            self.log(f"调平未收敛: {summary}", "WARNING")
+            self.show_status("调平未收敛")
+
+    def _on_leveling_error(self, message: str):
+        self.resume_status_thread()
+        self.log(f"调平失败: {message}", "ERROR")
+        self.show_status("调平失败")
+
+    def run_test_plan(self):
+        """
+        按频点列表执行测试计划(执行中再次点击则中止)
+        目标电平取功率输入框的值，所有频点的馈源轴、链路和补偿后的设置功率在开始前一次性算好，
+        执行时只发送频率和功率命令，馈源轴变化时才等待达位
+        """
+        if self._test_plan_player is not None and self._test_plan_player.is_running:
+            self._test_plan_player.stop()
+            return
+        if not self.tcp_client.connected:
+            self.show_status("请先连接设备")
+            return
+        
+        filepath, _ = QFileDialog.getOpenFileName(
+            self, "选择测试频点列表", "docs", "CSV文件 (*.csv);;所有文件 (*)")
+        if not filepath:
+            return
+        plan = self._compile_test_plan(filepath)
+        if plan is None:
+            return
+        
+        player = TestPlanPlayer(plan, self._send_plan_command,
+                                feed_control=self._is_freq_link_connected, parent=self)
+        player.feed_requested.connect(self._on_plan_feed_requested)
+        player.step_started.connect(self._on_plan_step_started)
+        player.finished.connect(self._on_plan_finished)
+        self.status_panel._controller.operation_completed.connect(player.on_feed_completed)
+        self._test_plan_player = player
+        self.test_plan_action.setText("停止计划")
+        player.start()
+
+    def _compile_test_plan(self, filepath: str) -> Optional[TestPlan]:
+        """
+        按频点列表文件和功率输入框中的目标电平编译测试计划
+        :return: 测试计划，目标电平无效或编译失败时返回None
+        """
+        self._flush_power_input()
+        val = self.power_input.text().strip() + " " + self.power_unit_combo.currentText()
+        valid, power_value, power_unit = self.unit_converter.validate_power(val)
+        if not valid:
+            self.show_status("请先输入有效的目标功率")
+            return None
+        
+        try:
+            freqs = TestPlan.load_frequencies(filepath)
+            engine = self.compensation_engine if self.compensation_enabled else None
+            plan = TestPlan.compile(
+                freqs, power_value, power_unit,
+                polarization=self._current_polarization() or "THETA",
+                engine=engine,
+                dwell_s=self.test_plan_dwell_s,
+                converter=self.unit_converter
+            )
+        except Exception as e:
+            self.log(f"测试计划编译失败: {str(e)}", "ERROR")
+            self.show_status("测试计划编译失败")
+            return None
+        
+        out_of_range = int(len(plan) - plan.steps['in_range'].sum()) if engine is not None else 0
+        self.log(f"测试计划: {os.path.basename(filepath)}, {len(plan)}个频点, "
+                 f"馈源切换{plan.feed_changes}次, 驻留{plan.dwell_s:g}s"
+                 f"{f', {out_of_range}个频点超出校准范围(不补偿)' if out_of_range else ''}", "INFO")
+        return plan
+
+    def _send_plan_command(self, cmd: str) -> bool:
+        """发送测试计划中的一条命令(不逐条记录日志)"""
+        self.comm_mutex.lock()
+        try:
+            success, msg = self.tcp_client.send(cmd + '\n')
+            if not success:
+                self.log(f"发送失败: {msg}", "ERROR")
+                return False
+            self.tcp_client.receive()
+            return True
+        finally:
+            self.comm_mutex.unlock()
+
+    def _on_plan_feed_requested(self, axis: str, link_mode: str):
+        self.current_feed_mode = link_mode
+        self.status_panel._controller.request_feed(axis)
+        self._send_link_command(link_mode)
+
+    def _on_plan_step_started(self, index: int, total: int):
+        freq_ghz = self._test_plan_player.plan.steps['freq_ghz'][index]
+        self.show_status(f"测试计划: {index + 1}/{total}, {freq_ghz:g}GHz")
+
+    def _on_plan_finished(self, completed: bool, message: str):
+        player = self.sender()
+        self.status_panel._controller.operation_completed.disconnect(player.on_feed_completed)
+        self.test_plan_action.setText("测试计划")
+        self.log(message, "SUCCESS" if completed else "WARNING")
+        self.show_status(message)
+
+    def run_test_sequence(self):
+        """
+        在后台线程执行测试序列(JSON步骤文件，或频点列表CSV按目标电平编译)，执行中再次点击则中止
+        """
+        if self._sequence_thread is not None and self._sequence_thread.isRunning():
+            self._sequence_thread.requestInterruption()
+            self.show_status("正在中止测试序列...")
+            return
+        if not self.tcp_client.connected:
+            self.show_status("请先连接设备")
+            return
+        
+        filepath, _ = QFileDialog.getOpenFileName(
+            self, "选择测试序列", "docs", "测试序列 (*.json *.csv);;所有文件 (*)")
+        if not filepath:
+            return
+        
+        sensor = self.calibration_panel.power_meter
+        if filepath.lower().endswith(".csv"):
+            plan = self._compile_test_plan(filepath)
+            if plan is None:
+                return
+            sequence = TestSequence.from_plan(plan, measure=sensor is not None)
+        else:
+            try:
+                sequence = TestSequence.load(filepath)
+            except Exception as e:
+                self.log(f"测试序列读取失败: {str(e)}", "ERROR")
+                self.show_status("测试序列读取失败")
+                return
+        
+        measure = None
+        if sensor is not None:
+            engine = self.compensation_engine
+            # 与校准文件一致: 功率计读数减去喇叭增益
+            measure = lambda freq_hz: sensor.measure_power(freq_hz) - (
+                engine.horn_gain(freq_hz / 1e9) if engine is not None else 0.0)
+        
+        runner = SequenceRunner(self._send_sequence_command, measure)
+        self._sequence_thread = SequenceThread(runner, sequence, self)
+        self._sequence_thread.step_done.connect(
+            lambda index, desc, elapsed: self._on_sequence_step(index, len(sequence), desc, elapsed))
+        self._sequence_thread.sequence_finished.connect(self._on_sequence_finished)
+        self._sequence_thread.error_occurred.connect(self._on_sequence_error)
+        self._sequence_thread.start()
+        self.sequence_action.setText("中止序列")
+        self.sequence_pause_action.setEnabled(True)
+        self.log(f"开始测试序列: {os.path.basename(filepath)}, {len(sequence)}步", "INFO")
+
+    def toggle_sequence_pause(self):
+        """暂停/继续测试序列(在当前步骤完成后暂停)"""
+        thread = self._sequence_thread
+        if thread is None or not thread.isRunning():
+            return
+        if thread.is_paused:
+            thread.resume()
+            self.sequence_pause_action.setText("暂停序列")
+            self.show_status("测试序列继续")
+        else:
+            thread.pause()
+            self.sequence_pause_action.setText("继续序列")
+            self.show_status("测试序列已暂停")
+
+    def _send_sequence_command(self, cmd: str, expect_response: bool) -> str:
+        """发送测试序列命令(在序列线程中调用)"""
+        _, resp = self.scpi.send_command(cmd, expect_response=expect_response)
+        return resp
+
+    def _on_sequence_step(self, index: int, total: int, description: str, elapsed: float):
+        self.log(f"序列步骤 {index}/{total}: {description} ({elapsed * 1000:.0f}ms)", "DEBUG")
+        self.show_status(f"测试序列: {index}/{total} {description}")
+
+    def _reset_sequence_actions(self):
+        self.sequence_action.setText("测试序列")
+        self.sequence_pause_action.setText("暂停序列")
+        self.sequence_pause_action.setEnabled(False)
+
+    def _on_sequence_finished(self, completed: bool, elapsed: float):
+        self._reset_sequence_actions()
+        measurements = self._sequence_thread.runner.measurements
+        summary = f"耗时{elapsed:.1f}s{f', 测量{len(measurements)}点' if measurements else ''}"
+        if completed:
+            self.log(f"测试序列完成: {summary}", "SUCCESS")
+            self.show_status("测试序列完成")
+        else:
+            self.log(f"测试序列已中止: {summary}", "WARNING")
+            self.show_status("测试序列已中止")
+        for m in measurements:
+            self.log(f"测量: {m.freq_ghz:g}GHz, 设置 {m.power_dbm:.2f} dBm, 测得 {m.value:.2f} dBm", "INFO")
+
+    def _on_sequence_error(self, message: str):
+        self._reset_sequence_actions()
+        self.log(f"测试序列出错: {message}", "ERROR")
+        self.show_status("测试序列出错")
+
     def query_power_cmd(self):
         cmd = "READ:SOURce:POWer?"
         target_unit = self.power_unit_combo.currentText()
@@ -1231,8 +1582,8 @@ class MainWindow(MainWindowUI):
                     freq_str = self.status_cache["src"].get("freq", "0")
                     freq_ghz = float(freq_str.replace("GHz", "").strip()) if "GHz" in freq_str else float(freq_str)/1e9
                     
-                    # 计算补偿值
-                    compensation = self.get_compensation_value(freq_ghz) if self.compensation_enabled else 0.0
+                    # 计算补偿值(按查询到的输出功率在参考功率之间插值)
+                    compensation = self.get_compensation_value(freq_ghz, ref_power=measured_power) if self.compensation_enabled else 0.0
                     actual_power = measured_power + compensation
 
                     # 默认
@@ -1379,6 +1730,25 @@ class MainWindow(MainWindowUI):
             self.status_thread.stop()
             self.status_thread.wait(2000)  # 等待2秒
         
+        # 停止测试计划
+        if self._test_plan_player and self._test_plan_player.is_running:
+            self._test_plan_player.stop()
+        
+        # 停止测试序列线程
+        if self._sequence_thread and self._sequence_thread.isRunning():
+            self._sequence_thread.requestInterruption()
+            self._sequence_thread.wait(2000)
+        
+        # 停止调平线程
+        if self._leveling_thread and self._leveling_thread.isRunning():
+            self._leveling_thread.requestInterruption()
+            self._leveling_thread.wait(2000)
+        
+        # 停止补偿查找表生成线程
+        if self._compensation_table_thread and self._compensation_table_thread.isRunning():
+            self._compensation_table_thread.requestInterruption()
+            self._compensation_table_thread.wait(2000)
+        
         # 停止校准线程
         if hasattr(self, 'calibration_thread') and self.calibration_thread and self.calibration_thread.isRunning():
             self.calibration_thread.stop()
@@ -0,0 +1,265 @@
+import mmap
+import numpy as np
+from collections.abc import Sequence
+from typing import Dict, Iterable, List, Optional
+
+# 极化模式编码，-1表示未记录
+POLARIZATION_CODES = {'THETA': 0, 'PHI': 1, 'DUAL': 2}
+POLARIZATION_NAMES = ('THETA', 'PHI', 'DUAL')
+
+
+class CalibrationColumns:
+    """
+    校准数据列式存储
+
+    每个字段一个预分配的NumPy数组，追加时原地填充，容量不足时按倍数扩容。
+    通过column()/[]取得的是长度为当前点数的只读视图，不复制数据，
+    可直接用于绘图、导出和写文件。
+    """
+
+    FLOAT_COLUMNS = (
+        'freq',                 # 频率(GHz)
+        'theta',                # Theta测量值(dBm)
+        'phi',                  # Phi测量值(dBm)
+        'horn_gain',            # 喇叭增益(dBi)
+        'theta_corrected',      # Theta校正值(dB)
+        'phi_corrected',        # Phi校正值(dB)
+        'theta_corrected_vm',   # Theta场强(V/m)
+        'phi_corrected_vm',     # Phi场强(V/m)
+        'reference_power',      # 参考功率(dBm)，NaN表示未记录
+    )
+    COLUMNS = FLOAT_COLUMNS + ('polarization',)
+
+    def __init__(self, capacity: int = 0):
+        """
+        :param capacity: 预分配点数，通常为频点列表长度
+        """
+        self._size = 0
+        self._capacity = 0
+        self._columns: Dict[str, np.ndarray] = {}
+        self._allocate(max(int(capacity), 16))
+
+    def _allocate(self, capacity: int):
+        """分配(或扩容)底层数组，保留已有数据"""
+        columns = {name: np.full(capacity, np.nan) for name in self.FLOAT_COLUMNS}
+        columns['polarization'] = np.full(capacity, -1, dtype=np.int8)
+        for name, array in self._columns.items():
+            columns[name][:self._size] = array[:self._size]
+        self._columns = columns
+        self._capacity = capacity
+
+    def reserve(self, capacity: int):
+        """确保至少能容纳capacity个点"""
+        if capacity > self._capacity:
+            self._allocate(int(capacity))
+
+    def clear(self, capacity: Optional[int] = None):
+        """清空数据，可同时按新的点数重新预分配"""
+        self._size = 0
+        if capacity is not None and capacity != self._capacity:
+            self._columns = {}
+            self._allocate(max(int(capacity), 16))
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def nbytes(self) -> int:
+        """底层数组占用的字节数(内存映射的数组不计入)"""
+        return sum(array.nbytes for array in self._columns.values() if not _is_mapped(array))
+
+    def append(self, freq: float, theta: float = 0.0, phi: float = 0.0,
+               horn_gain: float = 0.0, theta_corrected: float = 0.0,
+               phi_corrected: float = 0.0, theta_corrected_vm: float = 0.0,
+               phi_corrected_vm: float = 0.0, reference_power: float = np.nan,
+               polarization: Optional[str] = None):
+        """追加一个数据点(原地写入预分配数组)"""
+        if self._size >= self._capacity:
+            self._allocate(self._capacity * 2)
+
+        i = self._size
+        columns = self._columns
+        columns['freq'][i] = freq
+        columns['theta'][i] = theta
+        columns['phi'][i] = phi
+        columns['horn_gain'][i] = horn_gain
+        columns['theta_corrected'][i] = theta_corrected
+        columns['phi_corrected'][i] = phi_corrected
+        columns['theta_corrected_vm'][i] = theta_corrected_vm
+        columns['phi_corrected_vm'][i] = phi_corrected_vm
+        columns['reference_power'][i] = np.nan if reference_power is None else reference_power
+        columns['polarization'][i] = POLARIZATION_CODES.get(str(polarization).upper(), -1)
+        self._size += 1
+
+    def append_point(self, freq: float, data: Dict):
+        """按数据点字典格式追加，字段名与校准文件一致"""
+        self.append(
+            freq,
+            theta=data.get('theta', 0.0),
+            phi=data.get('phi', 0.0),
+            horn_gain=data.get('horn_gain', 0.0),
+            theta_corrected=data.get('theta_corrected', 0.0),
+            phi_corrected=data.get('phi_corrected', 0.0),
+            theta_corrected_vm=data.get('theta_corrected_vm', 0.0),
+            phi_corrected_vm=data.get('phi_corrected_vm', 0.0),
+            reference_power=data.get('reference_power', np.nan),
+            polarization=data.get('polarization')
+        )
+
+    def extend(self, **arrays):
+        """
+        批量追加数据
+
+        :param arrays: 列名到等长数组的映射，缺失的列按默认值填充；
+                       polarization可以是编码数组或字符串数组
+        """
+        if 'freq' not in arrays:
+            raise ValueError("批量追加必须包含freq列")
+        count = len(arrays['freq'])
+        self.reserve(self._size + count)
+
+        start, stop = self._size, self._size + count
+        for name in self.FLOAT_COLUMNS:
+            default = np.nan if name == 'reference_power' else 0.0
+            self._columns[name][start:stop] = arrays.get(name, default)
+        self._columns['polarization'][start:stop] = encode_polarization(
+            arrays.get('polarization', -1), count
+        )
+        self._size = stop
+
+    def column(self, name: str) -> np.ndarray:
+        """获取列的只读视图(不复制)"""
+        view = self._columns[name][:self._size]
+        view.flags.writeable = False
+        return view
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.column(name)
+
+    def polarization_names(self) -> np.ndarray:
+        """极化列的字符串形式，未记录的为空字符串"""
+        names = np.array(POLARIZATION_NAMES + ('',))
+        return names[self.column('polarization')]
+
+    @property
+    def has_reference_power(self) -> bool:
+        return bool(self._size) and not np.isnan(self.column('reference_power')).all()
+
+    @property
+    def has_polarization(self) -> bool:
+        return bool(self._size) and bool((self.column('polarization') >= 0).any())
+
+    def point(self, index: int) -> Dict:
+        """构建单个数据点字典(与旧版列表格式一致)"""
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("数据点索引超出范围")
+
+        columns = self._columns
+        point = {name: float(columns[name][index]) for name in self.FLOAT_COLUMNS[:-1]}
+        ref_power = columns['reference_power'][index]
+        if not np.isnan(ref_power):
+            point['reference_power'] = float(ref_power)
+        pol = columns['polarization'][index]
+        if pol >= 0:
+            point['polarization'] = POLARIZATION_NAMES[pol]
+        return point
+
+    def to_points(self) -> List[Dict]:
+        """转换为数据点字典列表"""
+        return [self.point(i) for i in range(self._size)]
+
+    def points(self) -> 'CalibrationPoints':
+        """数据点字典的惰性序列，只在访问时构建字典"""
+        return CalibrationPoints(self)
+
+    @classmethod
+    def from_points(cls, points: Iterable[Dict]) -> 'CalibrationColumns':
+        """由数据点字典列表构建"""
+        points = list(points)
+        store = cls(len(points))
+        for point in points:
+            store.append_point(point['freq'], point)
+        return store
+
+    @classmethod
+    def from_arrays(cls, **arrays) -> 'CalibrationColumns':
+        """
+        由列数组构建
+
+        浮点数组(包括float32和结构化数组的字段视图)直接引用不复制，
+        其它类型转换为float64；追加数据时会重新分配为float64数组
+        """
+        count = len(arrays['freq'])
+        store = cls.__new__(cls)
+        store._size = count
+        store._capacity = count
+        store._columns = {}
+        for name in cls.FLOAT_COLUMNS:
+            if name in arrays:
+                array = np.asarray(arrays[name])
+                store._columns[name] = array if array.dtype.kind == 'f' else array.astype(np.float64)
+            else:
+                default = np.nan if name == 'reference_power' else 0.0
+                store._columns[name] = np.full(count, default)
+        store._columns['polarization'] = encode_polarization(arrays.get('polarization', -1), count)
+        return store
+
+
+class CalibrationPoints(Sequence):
+    """
+    CalibrationColumns的数据点字典视图
+
+    行为与数据点字典列表一致(len/索引/切片/迭代)，但字典只在访问时构建，
+    加载大文件时无需预先为每个点创建字典。每次访问返回新的字典，修改不会写回列数据。
+    """
+
+    def __init__(self, columns: CalibrationColumns):
+        self.columns = columns
+
+    def __len__(self) -> int:
+        return len(self.columns)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.columns.point(i) for i in range(*index.indices(len(self.columns)))]
+        return self.columns.point(index)
+
+    def __iter__(self):
+        for i in range(len(self.columns)):
+            yield self.columns.point(i)
+
+    def __repr__(self) -> str:
+        return f"<CalibrationPoints: {len(self.columns)}个数据点>"
+
+
+def _is_mapped(array: np.ndarray) -> bool:
+    """数组是否引用内存映射文件"""
+    while array is not None:
+        if isinstance(array, (np.memmap, mmap.mmap)):
+            return True
+        array = getattr(array, 'base', None)
+    return False
+
+
+def encode_polarization(values, count: int) -> np.ndarray:
+    """将极化字符串(或编码)数组转换为int8编码数组"""
+    if np.isscalar(values) or values is None:
+        if isinstance(values, str):
+            values = POLARIZATION_CODES.get(values.upper(), -1)
+        return np.full(count, -1 if values is None else values, dtype=np.int8)
+
+    values = np.asarray(values)
+    if values.dtype.kind in 'iu':
+        return values.astype(np.int8, copy=False)
+
+    codes = np.full(count, -1, dtype=np.int8)
+    upper = np.char.upper(values.astype(str))
+    for name, code in POLARIZATION_CODES.items():
+        codes[upper == name] = code
+    return codes
@@ -1,10 +1,13 @@
 # app/services/calibration.py
 import time
-from typing import Callable, List, Optional
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Tuple
 from dataclasses import dataclass
 from PyQt5.QtCore import QObject, pyqtSignal, QThread
 from app.core.exceptions.instrument import InstrumentCommandError
 from app.instruments.interfaces import SignalSource, PowerSensor
+from app.utils.AdaptiveFrequencySampler import AdaptiveFrequencySampler
 
 @dataclass
 class CalibrationPoint:
@@ -39,8 +42,12 @@ class CalibrationPoint:
 class CalibrationThread(QThread):
     """解耦后的校准线程类"""
     
+    # 极化切换稳定时间测量: 相邻两次读数差小于容差即认为稳定
+    SETTLE_TOLERANCE_DB = 0.05
+    MAX_SWITCH_SETTLE_TIME = 2.0
+    
     progress_updated = pyqtSignal(int, str)
-    point_completed = pyqtSignal(CalibrationPoint)
+    points_completed = pyqtSignal(list)  # 按UI刷新率批量发送的校准点
     calibration_finished = pyqtSignal(list)
     error_occurred = pyqtSignal(str)
     
@@ -50,35 +57,77 @@ class CalibrationThread(QThread):
                  freq_list: List[float],
                  ref_power: float,
                  dwell_time: float = 0.2,
+                 sampler: Optional[AdaptiveFrequencySampler] = None,
+                 ui_rate_hz: float = 10.0,
+                 ref_powers: Optional[List[float]] = None,
+                 power_settle_time: float = 0.05,
+                 polarization: str = "THETA",
+                 power_meter_phi: Optional[PowerSensor] = None,
+                 polarization_switch: Optional[Callable[[float, str], bool]] = None,
+                 switch_settle_time: Optional[float] = None,
+                 reference_meter: Optional[PowerSensor] = None,
+                 coupling_db: float = 0.0,
+                 averaging: int = 10,
                  parent: Optional[QObject] = None):
         super().__init__(parent)
         self.signal_source = signal_source
         self.power_meter = power_meter
         self.freq_list = freq_list
-        self.ref_power = ref_power
+        # 多参考功率嵌套扫描: 每个频点稳定后依次步进各参考功率
+        self.ref_powers = list(ref_powers) if ref_powers else [ref_power]
+        self.ref_power = self.ref_powers[0]
         self.dwell_time = dwell_time
+        self.power_settle_time = power_settle_time
+        self._current_power = None
+        
+        # 极化测量: 双功率计并行读取，或单功率计通过链路切换极化
+        # polarization_switch(freq_hz, polarization) 返回True表示链路发生了切换
+        self.polarization = polarization.upper()
+        self.power_meter_phi = power_meter_phi
+        self.polarization_switch = polarization_switch
+        self.switch_settle_time = switch_settle_time  # None表示首次切换时实测
+        self._current_polarization = None
+        
+        # 比值模式: 参考耦合器上的功率计与DUT功率计同时读取，抵消信号源漂移
+        # 保存值 = DUT读数 - (参考读数 + 耦合度 - 设置功率)
+        self.reference_meter = reference_meter
+        self.coupling_db = coupling_db
+        self.averaging = averaging
+        self._executor = None
+        
+        self.sampler = sampler  # 为None时按freq_list均匀扫描
         self._is_running = False
         self._results = []
         
+        # 批量信号: 测量点和进度先缓存，按ui_rate_hz节流发送
+        self._flush_interval = 1.0 / ui_rate_hz if ui_rate_hz > 0 else 0.0
+        self._pending_points: List[CalibrationPoint] = []
+        self._pending_progress = None
+        self._last_flush = 0.0
+        
     def run(self):
         """执行校准流程"""
         self._is_running = True
         self._results = []
-        total_points = len(self.freq_list)
+        self._pending_points = []
+        self._pending_progress = None
+        self._last_flush = time.monotonic()
         try:
+            if self.polarization == "DUAL" and not (self.power_meter_phi or self.polarization_switch):
+                raise ValueError("双极化校准需要第二个功率计或链路切换")
+            sensor_count = len(self._sensors())
+            if sensor_count > 1:
+                self._executor = ThreadPoolExecutor(max_workers=sensor_count)
             self._initialize_instruments()
             
-            for idx, freq in enumerate(self.freq_list):
-                if not self._is_running:
-                    break
-                    
-                progress = int((idx + 1) / total_points * 100)
-                self.progress_updated.emit(progress, f"正在校准 {freq/1e9:.3f}GHz...")
-                
-                point = self._calibrate_single_point(freq)
-                self._results.append(point)
-                self.point_completed.emit(point)
+            pending = list(self.freq_list)
+            pass_index = 1
+            while pending and self._is_running:
+                self._run_pass(pending, pass_index)
+                pending = self._next_adaptive_pass() if self.sampler else []
+                pass_index += 1
                 
+            self._flush_updates(force=True)
             if self._is_running:
                 self.progress_updated.emit(100, "校准完成")
                 self.calibration_finished.emit(self._results)
@@ -86,12 +135,69 @@ class CalibrationThread(QThread):
                 self.progress_updated.emit(0, "校准已中止")
                     
         except Exception as e:
+            self._flush_updates(force=True)  # 已完成的点仍需写入文件
             self.error_occurred.emit(f"校准失败: {str(e)}")
             self.progress_updated.emit(0, f"错误: {str(e)}")
         finally:
             self._cleanup_instruments()
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
             self._is_running = False
             
+    def _run_pass(self, freq_list: List[float], pass_index: int):
+        """执行一轮扫描"""
+        done_before = len(self._results) // len(self.ref_powers)
+        pass_label = f"(第{pass_index}轮) " if self.sampler else ""
+        
+        for idx, freq in enumerate(freq_list):
+            if not self._is_running:
+                break
+                
+            done = done_before + idx + 1
+            progress = int(done / (done_before + len(freq_list)) * 100)
+            if self.sampler:
+                progress = min(progress, 99)  # 自适应模式在收敛前不显示100%
+            self._pending_progress = (progress, f"{pass_label}正在校准 {freq/1e9:.3f}GHz...")
+            
+            points = self._calibrate_frequency(freq)
+            self._results.extend(points)
+            self._pending_points.extend(points)
+            self._flush_updates()
+            
+    def _flush_updates(self, force: bool = False):
+        """按UI刷新率发送缓存的进度和校准点，force为True时立即发送"""
+        now = time.monotonic()
+        if not force and now - self._last_flush < self._flush_interval:
+            return
+        self._last_flush = now
+        
+        if self._pending_progress is not None:
+            self.progress_updated.emit(*self._pending_progress)
+            self._pending_progress = None
+        if self._pending_points:
+            batch, self._pending_points = self._pending_points, []
+            self.points_completed.emit(batch)
+            
+    def _next_adaptive_pass(self) -> List[float]:
+        """根据已测数据计算下一轮自适应补测频点(Hz)"""
+        # 多参考功率时只用第一个参考功率的数据估计误差
+        results = [p for p in self._results if p.ref_power == self.ref_powers[0]]
+        if not results:
+            return []
+            
+        freqs = np.array([p.freq_hz for p in results]) / 1e9
+        values = np.array([[p.measured_theta, p.measured_phi] for p in results])
+        new_freqs = self.sampler.refine(freqs, values)
+        
+        if new_freqs.size:
+            self._flush_updates(force=True)
+            self.progress_updated.emit(
+                min(int(len(results) / (len(results) + new_freqs.size) * 100), 99),
+                f"自适应加密: 新增{new_freqs.size}个频点"
+            )
+        return [f * 1e9 for f in new_freqs.tolist()]
+            
     def stop(self):
         """安全停止校准"""
         self._is_running = False
@@ -100,11 +206,13 @@ class CalibrationThread(QThread):
         """通过接口方法初始化仪器"""
         try:
             self.signal_source.reset()
-            self.power_meter.reset()
-            self.power_meter.set_frequency_correction(0.0)
-            self.power_meter.set_averaging(10)
+            for sensor in self._sensors():
+                sensor.reset()
+                sensor.set_frequency_correction(0.0)
+                sensor.set_averaging(self.averaging)
             self.signal_source.set_output(False)
             self.signal_source.set_power(self.ref_power)
+            self._current_power = self.ref_power
         except Exception as e:
             raise InstrumentCommandError(
                 device=f"{self.signal_source.__class__.__name__}/{self.power_meter.__class__.__name__}",
@@ -112,50 +220,145 @@ class CalibrationThread(QThread):
                 command="reset/set_frequency_correction/set_averaging/set_output/set_power"
             )
             
-    def _calibrate_single_point(self, freq_hz: float) -> CalibrationPoint:
-        """通过接口方法执行单点校准"""
+    def _calibrate_frequency(self, freq_hz: float) -> List[CalibrationPoint]:
+        """
+        通过接口方法校准单个频点
+        频率只设置并稳定一次，随后依次步进各参考功率测量
+        """
         try:
             self.signal_source.set_frequency(freq_hz)
             self.signal_source.set_output(True)
             time.sleep(self.dwell_time)
             
-            # 测量两个极化的功率
-            measured_theta = self._measure_power(freq_hz)
-            measured_phi = self._measure_power(freq_hz)  # 实际应用中可能需要切换极化
+            points = []
+            for ref_power in self.ref_powers:
+                if ref_power != self._current_power:
+                    self.signal_source.set_power(ref_power)
+                    self._current_power = ref_power
+                    time.sleep(self.power_settle_time)
+                
+                measured_theta, measured_phi = self._measure_polarizations(freq_hz)
+                points.append(self._build_point(freq_hz, ref_power, measured_theta, measured_phi))
             
             self.signal_source.set_output(False)
-            
-            return CalibrationPoint(
-                freq_hz=freq_hz,
-                expected_power=self.ref_power,
-                measured_power=(measured_theta + measured_phi)/2,  # 保持向后兼容
-                delta=((measured_theta + measured_phi)/2) - self.ref_power,
-                timestamp=time.strftime("%Y-%m-%d %H:%M:%S"),
-                measured_theta=measured_theta,
-                measured_phi=measured_phi,
-                ref_power=self.ref_power,
-                horn_gain=0.0,  # 将在Controller中填充
-                distance=1.0,   # 默认1米距离
-                theta_corrected = 0.0,
-                phi_corrected= 0.0,
-                theta_corrected_vm=0.0,  # 将在Controller中计算
-                phi_corrected_vm=0.0     # 将在Controller中计算
-            )
+            return points
         except Exception as e:
             self.signal_source.set_output(False)
             raise InstrumentCommandError(
                 device=self.signal_source.__class__.__name__,
                 message=f"频率 {freq_hz/1e9:.3f}GHz 校准失败: {str(e)}",
-                command=f"set_frequency/set_output"
+                command=f"set_frequency/set_power/set_output"
             )
 
-            
-    def _measure_power(self, freq_hz: float) -> float:
-        """通过接口方法测量功率"""
+    def _measure_polarizations(self, freq_hz: float) -> Tuple[float, float]:
+        """测量当前频点的Theta/Phi功率"""
+        if self.polarization != "DUAL":
+            # 单极化: 只测一次，两列记录相同读数
+            if self.polarization_switch is not None:
+                self._switch_polarization(freq_hz, self.polarization)
+            value = self._measure_dut(freq_hz)
+            return value, value
+        
+        if self.power_meter_phi is not None:
+            # 两个功率计分别位于Theta/Phi通道，同时触发并读取(比值模式下参考功率计一并读取)
+            if self.reference_meter is None:
+                theta, phi = self._read_sensors(freq_hz, [self.power_meter, self.power_meter_phi])
+                return theta, phi
+            theta, phi, ref = self._read_sensors(
+                freq_hz, [self.power_meter, self.power_meter_phi, self.reference_meter]
+            )
+            return self._normalize_ratio(theta, ref), self._normalize_ratio(phi, ref)
+        
+        # 单功率计: 通过链路切换极化，先测当前极化以减少切换次数
+        readings = {}
+        order = ("PHI", "THETA") if self._current_polarization == "PHI" else ("THETA", "PHI")
+        for pol in order:
+            settled_reading = self._switch_polarization(freq_hz, pol)
+            readings[pol] = settled_reading if settled_reading is not None else self._measure_dut(freq_hz)
+        return readings["THETA"], readings["PHI"]
+
+    def _sensors(self) -> List[PowerSensor]:
+        """本次校准使用的全部功率计"""
+        return [s for s in (self.power_meter, self.power_meter_phi, self.reference_meter) if s is not None]
+
+    def _read_sensors(self, freq_hz: float, sensors: List[PowerSensor]) -> List[float]:
+        """同时触发并读取多个功率计"""
+        if self._executor is None or len(sensors) == 1:
+            return [self._measure_power(freq_hz, sensor) for sensor in sensors]
+        futures = [self._executor.submit(self._measure_power, freq_hz, sensor) for sensor in sensors]
+        return [future.result() for future in futures]
+
+    def _measure_dut(self, freq_hz: float) -> float:
+        """测量主功率计，比值模式下与参考功率计同时读取并归一化"""
+        if self.reference_meter is None:
+            return self._measure_power(freq_hz)
+        dut, ref = self._read_sensors(freq_hz, [self.power_meter, self.reference_meter])
+        return self._normalize_ratio(dut, ref)
+
+    def _normalize_ratio(self, dut_dbm: float, ref_dbm: float) -> float:
+        """将DUT/参考比值换算到标称输出功率，消除信号源漂移"""
+        source_drift = ref_dbm + self.coupling_db - self._current_power
+        return dut_dbm - source_drift
+
+    def _switch_polarization(self, freq_hz: float, polarization: str) -> Optional[float]:
+        """
+        切换链路极化并等待稳定
+        首次切换时实测稳定时间，返回稳定后的读数；其余情况返回None
+        """
+        switched = self.polarization_switch(freq_hz, polarization)
+        self._current_polarization = polarization
+        if not switched:
+            return None
+        
+        if self.switch_settle_time is None:
+            settle_time, reading = self._measure_switch_settle_time(freq_hz)
+            self.switch_settle_time = settle_time
+            progress = self._pending_progress[0] if self._pending_progress else 0
+            self._pending_progress = (progress, f"极化切换稳定时间: {settle_time * 1000:.0f}ms")
+            self._flush_updates(force=True)
+            return reading if self.reference_meter is None else None
+        
+        time.sleep(self.switch_settle_time)
+        return None
+
+    def _measure_switch_settle_time(self, freq_hz: float) -> Tuple[float, float]:
+        """连续读数直到相邻读数差小于容差，返回(稳定时间, 稳定读数)"""
+        start = time.monotonic()
+        previous = self._measure_power(freq_hz)
+        while True:
+            reading = self._measure_power(freq_hz)
+            elapsed = time.monotonic() - start
+            if abs(reading - previous) < self.SETTLE_TOLERANCE_DB or elapsed >= self.MAX_SWITCH_SETTLE_TIME:
+                return elapsed, reading
+            previous = reading
+
+    def _build_point(self, freq_hz: float, ref_power: float,
+                     measured_theta: float, measured_phi: float) -> CalibrationPoint:
+        """由测量结果构建校准点"""
+        return CalibrationPoint(
+            freq_hz=freq_hz,
+            expected_power=ref_power,
+            measured_power=(measured_theta + measured_phi)/2,  # 保持向后兼容
+            delta=((measured_theta + measured_phi)/2) - ref_power,
+            timestamp=time.strftime("%Y-%m-%d %H:%M:%S"),
+            measured_theta=measured_theta,
+            measured_phi=measured_phi,
+            ref_power=ref_power,
+            horn_gain=0.0,  # 将在Controller中填充
+            distance=1.0,   # 默认1米距离
+            theta_corrected = 0.0,
+            phi_corrected= 0.0,
+            theta_corrected_vm=0.0,  # 将在Controller中计算
+            phi_corrected_vm=0.0     # 将在Controller中计算
+        )
+
+    def _measure_power(self, freq_hz: float, sensor: Optional[PowerSensor] = None) -> float:
+        """通过接口方法测量功率，默认使用主功率计"""
+        sensor = sensor or self.power_meter
         max_retries = 3
         for attempt in range(max_retries):
             try:
-                return self.power_meter.measure_power(freq_hz)
+                return sensor.measure_power(freq_hz)
             except Exception as e:
                 if attempt == max_retries - 1:
                     raise
@@ -169,10 +372,11 @@ class CalibrationThread(QThread):
         except:
             pass
             
-        try:
-            self.power_meter.reset()
-        except:
-            pass
+        for sensor in self._sensors():
+            try:
+                sensor.reset()
+            except:
+                pass
 
 class CalibrationService:
     """校准服务管理类"""
@@ -186,9 +390,10 @@ class CalibrationService:
                         freq_list: List[float],
                         ref_power: float,
                         progress_callback: Callable,
-                        point_callback: Callable,
+                        points_callback: Callable,
                         finished_callback: Callable,
-                        error_callback: Callable):
+                        error_callback: Callable,
+                        **thread_options):
         """
         启动校准流程
         Args:
@@ -197,9 +402,19 @@ class CalibrationService:
             freq_list: 频率列表(Hz)
             ref_power: 参考功率(dBm)
             progress_callback: 进度回调(progress, message)
-            point_callback: 单点完成回调(CalibrationPoint)
+            points_callback: 批量校准点回调(List[CalibrationPoint])
             finished_callback: 完成回调(results)
             error_callback: 错误回调(error_message)
+            thread_options: 传给CalibrationThread的其他参数，例如
+                sampler: 自适应采样器，提供时freq_list作为粗扫频点
+                ui_rate_hz: 进度和校准点信号的最高发送频率(Hz)，0表示逐点发送
+                ref_powers: 参考功率列表(dBm)，在每个频点依次测量各参考功率
+                polarization: 极化模式(THETA/PHI/DUAL)
+                power_meter_phi: Phi通道功率计，与主功率计并行读取
+                reference_meter: 参考耦合器功率计，提供时启用比值模式
+                coupling_db: 参考耦合器耦合度(dB)
+                averaging: 功率计平均次数
+                polarization_switch: 单功率计时的链路极化切换回调(freq_hz, polarization) -> bool
         """
         if self.thread and self.thread.isRunning():
             self.thread.stop()
@@ -209,12 +424,13 @@ class CalibrationService:
             signal_source=signal_source,
             power_meter=power_meter,
             freq_list=freq_list,
-            ref_power=ref_power
+            ref_power=ref_power,
+            **thread_options
         )
         
         # 连接信号
         self.thread.progress_updated.connect(progress_callback)
-        self.thread.point_completed.connect(point_callback)
+        self.thread.points_completed.connect(points_callback)
         self.thread.calibration_finished.connect(finished_callback)
         self.thread.error_occurred.connect(error_callback)
         
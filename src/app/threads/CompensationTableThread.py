@@ -0,0 +1,29 @@
+from PyQt5.QtCore import QThread, pyqtSignal
+
+
+class CompensationTableThread(QThread):
+    """
+    在后台生成密集补偿查找表
+    加载新的校准文件时调用requestInterruption()中止旧的生成任务
+    """
+    progress_signal = pyqtSignal(int)  # 进度(0-100)
+    table_ready = pyqtSignal(object, object)  # (CompensationEngine, DenseCompensationTable)
+    error_signal = pyqtSignal(str)
+
+    def __init__(self, engine, step_ghz: float = 0.001, parent=None):
+        super().__init__(parent)
+        self.engine = engine
+        self.step_ghz = step_ghz
+
+    def run(self):
+        try:
+            table = self.engine.build_dense_table(
+                self.step_ghz,
+                progress_callback=self.progress_signal.emit,
+                is_cancelled=self.isInterruptionRequested
+            )
+        except Exception as e:
+            self.error_signal.emit(str(e))
+            return
+        if table is not None:
+            self.table_ready.emit(self.engine, table)
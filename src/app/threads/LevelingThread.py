@@ -0,0 +1,43 @@
+from PyQt5.QtCore import QThread, pyqtSignal
+
+
+class LevelingThread(QThread):
+    """
+    在后台执行场强闭环调平(设置-测量循环会阻塞等待仪器)
+    调用requestInterruption()在下一次测量后中止
+    """
+    iteration_done = pyqtSignal(int, float, float)  # (次数, 设置功率dBm, 测量值dBm)
+    leveling_finished = pyqtSignal(object)  # LevelingResult
+    error_occurred = pyqtSignal(str)
+
+    def __init__(self, leveler, freq_hz: float, target_dbm: float, initial_dbm: float,
+                 set_power, measure, slope: float = 1.0, settle_time: float = 0.1, parent=None):
+        """
+        :param leveler: FieldLeveler实例
+        :param set_power: 设置信号源功率的回调(在本线程中调用)
+        :param measure: 测量场强等效功率的回调(在本线程中调用)
+        """
+        super().__init__(parent)
+        self.leveler = leveler
+        self.freq_hz = freq_hz
+        self.target_dbm = target_dbm
+        self.initial_dbm = initial_dbm
+        self.set_power = set_power
+        self.measure = measure
+        self.slope = slope
+        self.settle_time = settle_time
+
+    def run(self):
+        try:
+            result = self.leveler.level(
+                self.freq_hz, self.target_dbm, self.initial_dbm,
+                self.set_power, self.measure,
+                slope=self.slope,
+                settle_time=self.settle_time,
+                iteration_callback=self.iteration_done.emit,
+                is_cancelled=self.isInterruptionRequested
+            )
+        except Exception as e:
+            self.error_occurred.emit(str(e))
+            return
+        self.leveling_finished.emit(result)
@@ -0,0 +1,64 @@
+import time
+
+from PyQt5.QtCore import QThread, QMutex, QWaitCondition, pyqtSignal
+
+
+class SequenceThread(QThread):
+    """
+    在后台执行测试序列
+    pause()/resume()在步骤之间暂停和继续，requestInterruption()中止
+    """
+    step_done = pyqtSignal(int, str, float)  # (执行序号, 步骤描述, 耗时秒)
+    sequence_finished = pyqtSignal(bool, float)  # (是否全部完成, 总耗时秒)
+    error_occurred = pyqtSignal(str)
+
+    def __init__(self, runner, sequence, parent=None):
+        """
+        :param runner: SequenceRunner实例
+        :param sequence: TestSequence实例
+        """
+        super().__init__(parent)
+        self.runner = runner
+        self.sequence = sequence
+        self._paused = False
+        self._pause_mutex = QMutex()
+        self._pause_condition = QWaitCondition()
+
+    @property
+    def is_paused(self) -> bool:
+        return self._paused
+
+    def pause(self):
+        self._paused = True
+
+    def resume(self):
+        self._pause_mutex.lock()
+        self._paused = False
+        self._pause_condition.wakeAll()
+        self._pause_mutex.unlock()
+
+    def requestInterruption(self):
+        super().requestInterruption()
+        self.resume()  # 暂停中也能立即退出
+
+    def _wait_if_paused(self):
+        self._pause_mutex.lock()
+        try:
+            while self._paused and not self.isInterruptionRequested():
+                self._pause_condition.wait(self._pause_mutex)
+        finally:
+            self._pause_mutex.unlock()
+
+    def run(self):
+        start = time.perf_counter()
+        try:
+            completed = self.runner.run(
+                self.sequence,
+                step_callback=self.step_done.emit,
+                is_cancelled=self.isInterruptionRequested,
+                wait_if_paused=self._wait_if_paused
+            )
+        except Exception as e:
+            self.error_occurred.emit(str(e))
+            return
+        self.sequence_finished.emit(completed, time.perf_counter() - start)
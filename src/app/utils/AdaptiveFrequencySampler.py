@@ -0,0 +1,122 @@
+import numpy as np
+from typing import Optional
+
+
+class AdaptiveFrequencySampler:
+    """
+    自适应频率采样器
+
+    功能:
+    - 先按粗步进生成初始频点
+    - 根据已测数据估计局部曲率和线性插值误差(向量化计算)
+    - 仅在预测误差超过容差的区间插入中点，直到收敛或达到点数上限
+    """
+
+    def __init__(self,
+                 start_ghz: float,
+                 stop_ghz: float,
+                 coarse_step_ghz: float,
+                 tolerance_db: float = 0.2,
+                 max_points: int = 400,
+                 min_step_ghz: float = 0.001):
+        """
+        参数:
+            start_ghz: 起始频率(GHz)
+            stop_ghz: 终止频率(GHz)
+            coarse_step_ghz: 粗扫步进(GHz)
+            tolerance_db: 允许的插值误差(dB)
+            max_points: 点数预算(包含粗扫点)
+            min_step_ghz: 最小频率间隔(GHz)，小于该间隔的区间不再细分
+        """
+        if stop_ghz <= start_ghz:
+            raise ValueError("终止频率必须大于起始频率")
+        if coarse_step_ghz <= 0:
+            raise ValueError("粗扫步进必须大于0")
+
+        self.start_ghz = float(start_ghz)
+        self.stop_ghz = float(stop_ghz)
+        self.coarse_step_ghz = float(coarse_step_ghz)
+        self.tolerance_db = float(tolerance_db)
+        self.max_points = int(max_points)
+        self.min_step_ghz = float(min_step_ghz)
+
+    def coarse_grid(self) -> np.ndarray:
+        """生成粗扫频点(GHz)，保证包含起止频率"""
+        points = int(round((self.stop_ghz - self.start_ghz) / self.coarse_step_ghz)) + 1
+        points = max(points, 3)
+        return np.round(np.linspace(self.start_ghz, self.stop_ghz, points), 6)
+
+    def estimate_error(self, freqs: np.ndarray, values: np.ndarray) -> np.ndarray:
+        """
+        估计每个相邻频点区间的线性插值误差
+
+        参数:
+            freqs: 已测频点(GHz)，长度n
+            values: 测量值(dB)，形状(n,)或(n, k)，多列时取各列误差最大值
+
+        返回:
+            长度n-1的误差数组(dB)，按频率升序对应各区间
+        """
+        freqs = np.asarray(freqs, dtype=np.float64)
+        values = np.asarray(values, dtype=np.float64)
+        if values.ndim == 1:
+            values = values[:, None]
+
+        order = np.argsort(freqs, kind='stable')
+        x = freqs[order]
+        y = values[order]
+        n = len(x)
+        if n < 3:
+            return np.zeros(max(n - 1, 0))
+
+        h = np.diff(x)
+        slopes = np.diff(y, axis=0) / h[:, None]
+        # 节点处二阶导数(非均匀网格三点差分)
+        d2 = np.abs(2.0 * np.diff(slopes, axis=0) / (h[1:] + h[:-1])[:, None])
+
+        # 区间曲率取两端节点的较大值，端点区间只有一侧
+        curvature = np.empty((n - 1, y.shape[1]))
+        curvature[0] = d2[0]
+        curvature[-1] = d2[-1]
+        if n > 3:
+            curvature[1:-1] = np.maximum(d2[:-1], d2[1:])
+
+        # 线性插值误差上界: |f''| * h^2 / 8
+        error = curvature * (h ** 2)[:, None] / 8.0
+        return error.max(axis=1)
+
+    def refine(self, freqs: np.ndarray, values: np.ndarray,
+               budget: Optional[int] = None) -> np.ndarray:
+        """
+        计算下一轮需要补测的频点
+
+        参数:
+            freqs: 已测频点(GHz)
+            values: 测量值(dB)，形状(n,)或(n, k)
+            budget: 剩余点数预算，默认由max_points推算
+
+        返回:
+            升序排列的新增频点(GHz)，为空表示已收敛或预算耗尽
+        """
+        freqs = np.asarray(freqs, dtype=np.float64)
+        if budget is None:
+            budget = self.max_points - len(freqs)
+        if budget <= 0 or len(freqs) < 3:
+            return np.empty(0)
+
+        x = np.sort(freqs)
+        h = np.diff(x)
+        error = self.estimate_error(freqs, values)
+
+        candidates = np.flatnonzero((error > self.tolerance_db) & (h / 2.0 >= self.min_step_ghz))
+        if candidates.size == 0:
+            return np.empty(0)
+
+        # 预算不足时优先细分误差最大的区间
+        if candidates.size > budget:
+            worst = np.argsort(error[candidates])[::-1][:budget]
+            candidates = candidates[worst]
+
+        midpoints = np.round((x[candidates] + x[candidates + 1]) / 2.0, 6)
+        midpoints = np.setdiff1d(midpoints, np.round(x, 6))
+        return np.sort(midpoints)
@@ -0,0 +1,25 @@
+from typing import Optional
+
+# 馈源轴对应的频段(GHz)，按频率升序排列
+FEED_BANDS = {
+    "X": (8.0, 12.0),
+    "KU": (12.0, 18.0),
+    "K": (18.0, 26.5),
+    "KA": (26.5, 40.0)
+}
+
+
+def feed_axis_for(freq_ghz: float) -> Optional[str]:
+    """根据频率确定馈源轴，超出所有频段时返回None"""
+    for axis, (min_freq, max_freq) in FEED_BANDS.items():
+        if min_freq <= freq_ghz <= max_freq:
+            return axis
+    return None
+
+
+def link_mode_for(freq_ghz: float, polarization: str) -> Optional[str]:
+    """根据频率和极化生成链路模式，如 FEED_KU_THETA"""
+    axis = feed_axis_for(freq_ghz)
+    if axis is None:
+        return None
+    return f"FEED_{axis}_{polarization.upper()}"
@@ -1,5 +1,8 @@
 
 import math
+import re
+import numpy as np
+from functools import lru_cache
 from typing import Optional, Tuple, Union
 
 class SignalUnitConverter:
@@ -42,6 +45,58 @@ class SignalUnitConverter:
 
     # 自由空间波阻抗 (Ω)
     Z0 = 120 * math.pi  # 约376.73 Ω
+
+    # 光速 (m/s)
+    SPEED_OF_LIGHT = 299792458
+
+    # 线性功率单位到mW的换算系数 (数组转换使用)
+    POWER_TO_MW = {
+        'mW': 1.0,
+        'W': 1e3,
+        'µW': 1e-3,
+        'nW': 1e-6,
+    }
+
+    # 对数功率单位的参考功率 (mW)
+    POWER_DB_REFERENCE_MW = {
+        'dBm': 1.0,
+        'dBW': 1e3,
+    }
+
+    # 线性电场强度单位到V/m的换算系数 (数组转换使用)
+    EFIELD_TO_V_M = {
+        'V/m': 1.0,
+        'mV/m': 1e-3,
+        'µV/m': 1e-6,
+    }
+
+    # 输入解析: 数值(可带符号、小数和指数)及其后的单位
+    _FREQ_PATTERN = re.compile(r'^\s*(?P<value>[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)\s*(?P<unit>(?:[A-Za-z]+(?:\s+[A-Za-z]+)*)?)\s*$')
+    _POWER_PATTERN = re.compile(r'^\s*(?P<value>[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)\s*(?P<unit>.*?)\s*$')
+    _NON_NUMERIC_PATTERN = re.compile(r'[^0-9+\-.eE]')
+
+    # 输入单位别名 (小写) 到规范单位的映射
+    FREQ_UNIT_ALIASES = {
+        'ghz': 'GHz', 'g': 'GHz',
+        'mhz': 'MHz',
+        'khz': 'kHz', 'k': 'kHz',
+        'hz': 'Hz',
+    }
+    POWER_UNIT_ALIASES = {
+        'dbm': 'dBm',
+        'dbw': 'dBW',
+        'mw': 'mW', 'm': 'mW',
+        'w': 'W',
+        'uw': 'µW', 'µw': 'µW', 'μw': 'µW', 'u': 'µW',
+        'nw': 'nW', 'n': 'nW',
+        'v/m': 'V/m',
+        'mv/m': 'mV/m',
+        'uv/m': 'µV/m', 'µv/m': 'µV/m', 'μv/m': 'µV/m',
+        'dbuv/m': 'dBμV/m', 'dbµv/m': 'dBμV/m', 'dbμv/m': 'dBμV/m',
+    }
+
+    # 已解析输入的缓存条数 (输入框每次按键都会解析)
+    PARSE_CACHE_SIZE = 256
     
     def __init__(self):
         # 默认频率单位
@@ -68,6 +123,10 @@ class SignalUnitConverter:
             'dBμV/m': '#e74c3c'
         }
 
+        # 解析结果只取决于输入字符串，按实例缓存
+        self._parse_frequency = lru_cache(maxsize=self.PARSE_CACHE_SIZE)(self._parse_frequency)
+        self._parse_power = lru_cache(maxsize=self.PARSE_CACHE_SIZE)(self._parse_power)
+
     def safe_float_convert(self, value: Union[str, float, int], 
                          default: float = 0.0) -> float:
         """
@@ -88,8 +147,7 @@ class SignalUnitConverter:
             
         try:
             # 移除单位和其他非数字字符
-            cleaned = ''.join(c for c in value.replace(',', '') 
-                            if c in '0123456789+-.eE')
+            cleaned = self._NON_NUMERIC_PATTERN.sub('', value.replace(',', ''))
             return float(cleaned) if cleaned else default
         except (ValueError, TypeError):
             return default
@@ -151,50 +209,12 @@ class SignalUnitConverter:
         if from_unit == to_unit:
             return (power_value, to_unit)
         
-        # 全部转换为mW作为中间单位
-        if from_unit == 'dBm':
-            mW_value = 10 ** (power_value / 10)
-        elif from_unit == 'mW':
-            mW_value = power_value
-        elif from_unit == 'W':
-            mW_value = power_value * 1000
-        elif from_unit == 'dBW':
-            # 修正：dBW 到 mW 的转换公式
-            mW_value = 10 ** ((power_value + 30) / 10)  # dBW + 30 = dBm
-        elif from_unit == 'µW':
-            mW_value = power_value / 1000
-        elif from_unit == 'nW':
-            mW_value = power_value / 1e6
-        else:
+        if from_unit not in self.POWER_TO_MW and from_unit not in self.POWER_DB_REFERENCE_MW:
             return (power_value, from_unit)  # 无效单位
-        
-        # 从mW转换为目标单位
-        if to_unit == 'dBm':
-            try:
-                converted = 10 * math.log10(mW_value) if mW_value > 0 else -math.inf
-            except (ValueError, ZeroDivisionError):
-                converted = -math.inf
-        elif to_unit == 'mW':
-            converted = mW_value
-        elif to_unit == 'W':
-            converted = mW_value / 1000
-        elif to_unit == 'dBW':
-            try:
-                # 修正：mW 到 dBW 的转换公式
-                converted = 10 * math.log10(mW_value / 1000) if mW_value > 0 else -math.inf
-            except (ValueError, ZeroDivisionError):
-                converted = -math.inf
-        elif to_unit == 'µW':
-            converted = mW_value * 1000
-        elif to_unit == 'nW':
-            converted = mW_value * 1e6
-        else:
+        if to_unit not in self.POWER_TO_MW and to_unit not in self.POWER_DB_REFERENCE_MW:
             return (power_value, from_unit)  # 无效单位
         
-        # 处理极小值
-        if abs(converted) < 1e-12 and converted != 0:
-            converted = 0.0
-            
+        converted = float(self.convert_power_array(power_value, from_unit, to_unit))
         return (converted, to_unit)
 
     def format_frequency(self, value: Union[str, float, int], 
@@ -314,41 +334,19 @@ class SignalUnitConverter:
         """
         if not isinstance(freq_str, str):
             return (False, 0.0, 'Hz')
-            
-        # 提取数值部分
-        num_part = []
-        unit_part = []
-        has_digit = False
-        has_decimal = False
-        
-        for c in freq_str.strip():
-            if c in '0123456789':
-                num_part.append(c)
-                has_digit = True
-            elif c in '+-.':
-                if c == '.':
-                    if has_decimal:
-                        break  # 多个小数点无效
-                    has_decimal = True
-                num_part.append(c)
-            else:
-                unit_part.append(c)
-                
-        if not has_digit:
+        return self._parse_frequency(freq_str)
+
+    def _parse_frequency(self, freq_str: str) -> Tuple[bool, float, str]:
+        """解析频率字符串 (结果由lru_cache缓存)"""
+        match = self._FREQ_PATTERN.match(freq_str)
+        if match is None:
             return (False, 0.0, 'Hz')
             
-        try:
-            value = float(''.join(num_part))
-            unit = ''.join(unit_part).strip()
-            unit = self._normalize_freq_unit(unit) if unit else self.default_freq_unit
+        value = float(match.group('value'))
+        unit = self._resolve_freq_unit(match.group('unit'))
             
-            # 放宽值范围检查
-            if not (0 <= value < 1e20):
-                return (False, value, unit)
-                
-            return (True, value, unit)
-        except (ValueError, TypeError):
-            return (False, 0.0, 'Hz')
+        # 放宽值范围检查
+        return (0 <= value < 1e20, value, unit)
 
     def validate_power(self, power_str: str) -> Tuple[bool, float, str]:
         """
@@ -362,84 +360,66 @@ class SignalUnitConverter:
         """
         if not isinstance(power_str, str):
             return (False, 0.0, 'dBm')
+        return self._parse_power(power_str)
+
+    def _parse_power(self, power_str: str) -> Tuple[bool, float, str]:
+        """解析功率或电场强度字符串 (结果由lru_cache缓存)"""
+        match = self._POWER_PATTERN.match(power_str)
+        if match is None:
+            return (False, 0.0, 'dBm')
             
-        # 提取数值部分
-        num_part = []
-        unit_part = []
-        has_digit = False
-        has_decimal = False
-        has_dB = False
-        has_slash = False  # 检查是否有/符号，用于识别电场单位
+        value = float(match.group('value'))
+        unit = self._resolve_power_unit(match.group('unit'))
         
-        for c in power_str.strip():
-            if c in '0123456789':
-                num_part.append(c)
-                has_digit = True
-            elif c in '+-.':
-                if c == '.':
-                    if has_decimal:
-                        break  # 多个小数点无效
-                    has_decimal = True
-                num_part.append(c)
-            elif c.lower() == 'd':
-                has_dB = True
-                unit_part.append(c)
-            elif c == '/':
-                has_slash = True
-                unit_part.append(c)
+        if unit in self.EFIELD_TO_V_M or unit == 'dBμV/m':
+            # 电场强度值范围检查
+            if unit == 'V/m':
+                valid = 0 <= value <= 1e6
+            elif unit == 'mV/m':
+                valid = 0 <= value <= 1e9
+            elif unit == 'µV/m':
+                valid = 0 <= value <= 1e12
             else:
-                unit_part.append(c)
-                
-        if not has_digit:
-            return (False, 0.0, 'dBm')
+                valid = 0 <= value <= 240  # 约1MV/m
+        elif unit in ('dBm', 'dBW'):
+            # 功率值范围检查
+            valid = -300 <= value <= 300  # 扩展范围
+        else:
+            valid = 0 <= value <= 1e12   # 扩展范围
             
-        try:
-            value = float(''.join(num_part))
-            unit = ''.join(unit_part).strip()
-            # 判断是否为电场强度单位
-            if has_slash or any(x in unit.lower() for x in ['v/m', 'μv/m', 'uv/m']):
-                # 处理电场强度单位
-                if has_dB:
-                    if 'v/m' in unit.lower() or 'μv/m' in unit.lower():
-                        unit = 'dBμV/m'
-                    else:
-                        unit = 'dBμV/m'  # 默认
-                else:
-                    unit = self._normalize_efield_unit(unit) if unit else self.default_efield_unit
-                
-                # 电场强度值范围检查
-                if unit == 'V/m':
-                    valid = 0 <= value <= 1e6
-                elif unit == 'mV/m':
-                    valid = 0 <= value <= 1e9
-                elif unit == 'µV/m':
-                    valid = 0 <= value <= 1e12
-                elif unit == 'dBμV/m':
-                    valid = 0 <= value <= 240  # 约1MV/m
-                else:
-                    valid = False
-            else:
-                # 处理普通功率单位
-                if has_dB:
-                    if 'm' in unit.lower():
-                        unit = 'dBm'
-                    elif 'w' in unit.lower():
-                        unit = 'dBW'
-                    else:
-                        unit = 'dBm'  # 默认dBm
-                else:
-                    unit = self._normalize_power_unit(unit) if unit else self.default_power_unit
-                
-                # 功率值范围检查
-                if unit in ('dBm', 'dBW'):
-                    valid = -300 <= value <= 300  # 扩展范围
-                else:
-                    valid = 0 <= value <= 1e12   # 扩展范围
-                    
-            return (valid, value, unit)
-        except (ValueError, TypeError):
-            return (False, 0.0, 'dBm')
+        return (valid, value, unit)
 
+    def _resolve_power_unit(self, unit: str) -> str:
+        """
+        确定功率或电场强度单位
+        
+        第一个单词在别名表中时直接使用(输入框文本中的单位优先于追加的下拉框单位)，
+        否则(如输入到一半的单位)按字符规则判断整个单位部分
+        """
+        if not unit:
+            return self.default_power_unit
+            
+        lower = unit.lower()
+        first = lower.split(None, 1)[0]
+        if first in self.POWER_UNIT_ALIASES:
+            return self.POWER_UNIT_ALIASES[first]
+        if '/' in lower:
+            return 'dBμV/m' if 'd' in lower else self._normalize_efield_unit(unit)
+        if 'd' in lower:
+            return 'dBW' if 'w' in lower and 'm' not in lower else 'dBm'
+        return self._normalize_power_unit(unit)
+
+
+    def _resolve_freq_unit(self, unit: str) -> str:
+        """
+        确定频率单位
+
+        与功率相同，只按第一个单词判断(输入框文本中的单位优先于追加的下拉框单位，如"8GHz GHz")
+        """
+        if not unit:
+            return self.default_freq_unit
+        first = unit.split(None, 1)[0]
+        return self.FREQ_UNIT_ALIASES.get(first.lower()) or self._normalize_freq_unit(first)
 
     def _normalize_freq_unit(self, unit: str) -> str:
         """规范化频率单位"""
@@ -470,7 +450,7 @@ class SignalUnitConverter:
             return 'dBW'
         elif unit.startswith('mw') or unit == 'm':
             return 'mW'
-        elif unit.startswith('uw') or unit == 'u' or unit == 'μ':
+        elif unit.startswith('uw') or unit.startswith('µw') or unit == 'u' or unit == 'μ':
             return 'µW'
         elif unit.startswith('nw') or unit == 'n':
             return 'nW'
@@ -529,30 +509,11 @@ class SignalUnitConverter:
         """
         内部方法：处理纯电场强度单位间的转换
         """
-        # 全部转换为V/m作为中间单位
-        if from_unit == 'V/m':
-            v_m_value = value
-        elif from_unit == 'mV/m':
-            v_m_value = value * 1e-3
-        elif from_unit == 'µV/m':
-            v_m_value = value * 1e-6
-        elif from_unit == 'dBμV/m':
-            v_m_value = self.dbuV_m_to_v_m(value)
-        else:
-            return (value, from_unit)
-        
-        # 从V/m转换为目标单位
-        if to_unit == 'V/m':
-            converted = v_m_value
-        elif to_unit == 'mV/m':
-            converted = v_m_value * 1e3
-        elif to_unit == 'µV/m':
-            converted = v_m_value * 1e6
-        elif to_unit == 'dBμV/m':
-            converted = self.v_m_to_dbuV_m(v_m_value)
-        else:
+        units = ('dBμV/m',) + tuple(self.EFIELD_TO_V_M)
+        if from_unit not in units or to_unit not in units:
             return (value, from_unit)
         
+        converted = float(self.convert_efield_array(value, from_unit, to_unit))
         return (converted, to_unit)
 
 
@@ -568,11 +529,9 @@ class SignalUnitConverter:
         返回:
             (功率密度值, 'W/m²')
         """
-        # 转换为V/m
+        # 转换为V/m后计算功率密度 S = E² / Z0
         e_v_m, _ = self.convert_efield(efield, efield_unit, 'V/m')
-        
-        # 计算功率密度 S = E² / Z0
-        power_density = (e_v_m ** 2) / self.Z0
+        power_density = float(self.efield_to_power_density_array(e_v_m))
         
         return (power_density, 'W/m²')
     
@@ -739,6 +698,13 @@ class SignalUnitConverter:
         norm_unit = self._normalize_efield_unit(unit)
         return self.efield_unit_colors.get(norm_unit, '#9b59b6')
 
+    @staticmethod
+    def _check_link_params(frequency: float, distance: float, antenna_gain: float):
+        """标量换算要求频率、距离和天线增益为正数，否则抛出ValueError(数组方法返回nan/inf)"""
+        for name, value in (('频率', frequency), ('距离', distance), ('天线增益', antenna_gain)):
+            if not value > 0:
+                raise ValueError(f"{name}必须为正数: {value}")
+
     def dbuV_m_to_dbm(self, dbuV_m: float, frequency: float, distance: float = 1.0, antenna_gain: float = 1.0) -> float:
         """
         将dBμV/m转换为dBm (公式逆运算)
@@ -752,19 +718,8 @@ class SignalUnitConverter:
         返回:
             发射功率 (dBm)
         """
-        # 计算波长 (米)
-        wavelength = 299792458 / frequency  # 光速 / 频率
-        
-        # 应用逆公式
-        dbm = dbuV_m + 20 * math.log10(wavelength) - 126.75
-        
-        # 考虑距离和天线增益的影响
-        if distance != 1.0:
-            dbm += 20 * math.log10(distance)
-        if antenna_gain != 1.0:
-            dbm -= 10 * math.log10(antenna_gain)
-            
-        return dbm
+        self._check_link_params(frequency, distance, antenna_gain)
+        return float(self.dbuV_m_to_dbm_array(dbuV_m, frequency, distance, antenna_gain))
     
     def dbm_to_dbuV_m(self, dbm: float, frequency: float, distance: float = 1.0, antenna_gain: float = 1.0) -> float:
         """
@@ -779,19 +734,8 @@ class SignalUnitConverter:
         返回:
             电场强度 (dBμV/m)
         """
-        # 计算波长 (米)
-        wavelength = 299792458 / frequency  # 光速 / 频率
-        
-        # 应用公式
-        dbuV_m = dbm - 20 * math.log10(wavelength) + 126.75
-        
-        # 考虑距离和天线增益的影响
-        if distance != 1.0:
-            dbuV_m -= 20 * math.log10(distance)
-        if antenna_gain != 1.0:
-            dbuV_m += 10 * math.log10(antenna_gain)
-            
-        return dbuV_m
+        self._check_link_params(frequency, distance, antenna_gain)
+        return float(self.dbm_to_dbuV_m_array(dbm, frequency, distance, antenna_gain))
     
     def v_m_to_dbuV_m(self, v_m: float) -> float:
         """
@@ -806,10 +750,7 @@ class SignalUnitConverter:
         公式:
             E,dBuV/m = 20*log10(E,V/m × 10^6)
         """
-        try:
-            return 20 * math.log10(v_m * 1e6) if v_m > 0 else -math.inf
-        except (ValueError, ZeroDivisionError):
-            return -math.inf
+        return float(self.v_m_to_dbuV_m_array(v_m))
     
     def dbuV_m_to_v_m(self, dbuV_m: float) -> float:
         """
@@ -824,10 +765,7 @@ class SignalUnitConverter:
         公式:
             E,V/m = 10^(E,dBuV/m / 20) / 10^6
         """
-        try:
-            return 10 ** (dbuV_m / 20) * 1e-6 if dbuV_m > -math.inf else 0.0
-        except (ValueError, ZeroDivisionError):
-            return 0.0
+        return float(self.dbuV_m_to_v_m_array(dbuV_m))
 
     def dbm_to_v_m(self, dbm: float, frequency: float, distance: float = 1.0, antenna_gain: float = 1.0) -> float:
         """
@@ -846,10 +784,8 @@ class SignalUnitConverter:
             1. 先将dBm转换为dBμV/m
             2. 再将dBμV/m转换为V/m
         """
-        # 先转换为dBμV/m
-        dbuV_m = self.dbm_to_dbuV_m(dbm, frequency, distance, antenna_gain)
-        # 再转换为V/m
-        return self.dbuV_m_to_v_m(dbuV_m)
+        self._check_link_params(frequency, distance, antenna_gain)
+        return float(self.dbm_to_v_m_array(dbm, frequency, distance, antenna_gain))
 
     def v_m_to_dbm(self, v_m: float, frequency: float, distance: float = 1.0, antenna_gain: float = 1.0) -> float:
         """
@@ -868,10 +804,191 @@ class SignalUnitConverter:
             1. 先将V/m转换为dBμV/m
             2. 再将dBμV/m转换为dBm
         """
-        # 先转换为dBμV/m
-        dbuV_m = self.v_m_to_dbuV_m(v_m)
-        # 再转换为dBm
-        return self.dbuV_m_to_dbm(dbuV_m, frequency, distance, antenna_gain)
+        self._check_link_params(frequency, distance, antenna_gain)
+        return float(self.v_m_to_dbm_array(v_m, frequency, distance, antenna_gain))
+
+    # region 数组运算
+    # 以下方法接受标量或NumPy数组(值、频率、距离、增益可按广播规则组合)，
+    # 返回float64数组，整条扫描或整个校准文件的转换只需一次调用。
+    # 对应的标量方法是这些方法的简单包装。
+
+    def convert_power_array(self, values, from_unit: str, to_unit: str) -> np.ndarray:
+        """
+        功率单位批量转换
+
+        参数:
+            values: 功率值(标量或数组)
+            from_unit: 原单位 (dBm, mW, W, dBW, µW, nW)
+            to_unit: 目标单位 (dBm, mW, W, dBW, µW, nW)
+
+        返回:
+            转换后的数组，非正功率转换为对数单位时为-inf
+        """
+        from_unit = self._normalize_power_unit(from_unit)
+        to_unit = self._normalize_power_unit(to_unit)
+        values = np.asarray(values, dtype=np.float64)
+
+        if from_unit == to_unit:
+            return values.copy()
+
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            # 全部转换为mW作为中间单位
+            if from_unit in self.POWER_DB_REFERENCE_MW:
+                mW_values = 10 ** (values / 10) * self.POWER_DB_REFERENCE_MW[from_unit]
+            else:
+                mW_values = values * self.POWER_TO_MW[from_unit]
+
+            # 从mW转换为目标单位
+            if to_unit in self.POWER_DB_REFERENCE_MW:
+                reference = self.POWER_DB_REFERENCE_MW[to_unit]
+                converted = np.where(mW_values > 0, 10 * np.log10(mW_values / reference), -np.inf)
+            else:
+                converted = mW_values / self.POWER_TO_MW[to_unit]
+
+        # 处理极小值
+        return np.where((np.abs(converted) < 1e-12) & (converted != 0), 0.0, converted)
+
+    def convert_efield_array(self, values, from_unit: str, to_unit: str) -> np.ndarray:
+        """
+        电场强度单位批量转换
+
+        参数:
+            values: 场强值(标量或数组)
+            from_unit: 原单位 (V/m, mV/m, µV/m, dBμV/m)
+            to_unit: 目标单位 (V/m, mV/m, µV/m, dBμV/m)
+
+        返回:
+            转换后的数组
+        """
+        from_unit = self._normalize_efield_unit(from_unit)
+        to_unit = self._normalize_efield_unit(to_unit)
+        values = np.asarray(values, dtype=np.float64)
+
+        if from_unit == to_unit:
+            return values.copy()
+
+        # 全部转换为V/m作为中间单位
+        if from_unit == 'dBμV/m':
+            v_m_values = self.dbuV_m_to_v_m_array(values)
+        else:
+            v_m_values = values * self.EFIELD_TO_V_M[from_unit]
+
+        # 从V/m转换为目标单位
+        if to_unit == 'dBμV/m':
+            return self.v_m_to_dbuV_m_array(v_m_values)
+        return v_m_values / self.EFIELD_TO_V_M[to_unit]
+
+    def efield_to_power_density_array(self, efield, efield_unit: str = 'V/m') -> np.ndarray:
+        """
+        电场强度批量转换为功率密度 (W/m²)
+
+        参数:
+            efield: 电场强度(标量或数组)
+            efield_unit: 电场强度单位
+
+        返回:
+            功率密度数组 (W/m²)
+        """
+        e_v_m = self.convert_efield_array(efield, efield_unit, 'V/m')
+        return (e_v_m ** 2) / self.Z0
+
+    def dbm_to_dbuV_m_array(self, dbm, frequency, distance=1.0, antenna_gain=1.0) -> np.ndarray:
+        """
+        dBm批量转换为dBμV/m (EdBuV/m = Pr,dBm - 20*log10(波长) + 126.75)
+
+        参数:
+            dbm: 发射功率 (dBm)
+            frequency: 频率 (Hz)
+            distance: 距离 (米)
+            antenna_gain: 天线增益 (无量纲)
+
+        返回:
+            电场强度数组 (dBμV/m)
+        """
+        dbm = np.asarray(dbm, dtype=np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            wavelength = self.SPEED_OF_LIGHT / np.asarray(frequency, dtype=np.float64)
+            return (dbm - 20 * np.log10(wavelength) + 126.75
+                    - 20 * np.log10(distance) + 10 * np.log10(antenna_gain))
+
+    def dbuV_m_to_dbm_array(self, dbuV_m, frequency, distance=1.0, antenna_gain=1.0) -> np.ndarray:
+        """
+        dBμV/m批量转换为dBm (dbm_to_dbuV_m_array的逆运算)
+
+        参数:
+            dbuV_m: 电场强度 (dBμV/m)
+            frequency: 频率 (Hz)
+            distance: 距离 (米)
+            antenna_gain: 天线增益 (无量纲)
+
+        返回:
+            发射功率数组 (dBm)
+        """
+        dbuV_m = np.asarray(dbuV_m, dtype=np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            wavelength = self.SPEED_OF_LIGHT / np.asarray(frequency, dtype=np.float64)
+            return (dbuV_m + 20 * np.log10(wavelength) - 126.75
+                    + 20 * np.log10(distance) - 10 * np.log10(antenna_gain))
+
+    def v_m_to_dbuV_m_array(self, v_m) -> np.ndarray:
+        """
+        V/m批量转换为dBμV/m，非正值为-inf
+
+        参数:
+            v_m: 电场强度 (V/m)
+
+        返回:
+            电场强度数组 (dBμV/m)
+        """
+        v_m = np.asarray(v_m, dtype=np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(v_m > 0, 20 * np.log10(v_m * 1e6), -np.inf)
+
+    def dbuV_m_to_v_m_array(self, dbuV_m) -> np.ndarray:
+        """
+        dBμV/m批量转换为V/m，-inf和NaN为0
+
+        参数:
+            dbuV_m: 电场强度 (dBμV/m)
+
+        返回:
+            电场强度数组 (V/m)
+        """
+        dbuV_m = np.asarray(dbuV_m, dtype=np.float64)
+        with np.errstate(over='ignore', invalid='ignore'):
+            return np.where(dbuV_m > -np.inf, 10 ** (dbuV_m / 20) * 1e-6, 0.0)
+
+    def dbm_to_v_m_array(self, dbm, frequency, distance=1.0, antenna_gain=1.0) -> np.ndarray:
+        """
+        dBm批量转换为V/m (先转换为dBμV/m，再转换为V/m)
+
+        参数:
+            dbm: 发射功率 (dBm)
+            frequency: 频率 (Hz)
+            distance: 距离 (米)
+            antenna_gain: 天线增益 (无量纲)
+
+        返回:
+            电场强度数组 (V/m)
+        """
+        return self.dbuV_m_to_v_m_array(self.dbm_to_dbuV_m_array(dbm, frequency, distance, antenna_gain))
+
+    def v_m_to_dbm_array(self, v_m, frequency, distance=1.0, antenna_gain=1.0) -> np.ndarray:
+        """
+        V/m批量转换为dBm (先转换为dBμV/m，再转换为dBm)
+
+        参数:
+            v_m: 电场强度 (V/m)
+            frequency: 频率 (Hz)
+            distance: 距离 (米)
+            antenna_gain: 天线增益 (无量纲)
+
+        返回:
+            发射功率数组 (dBm)
+        """
+        return self.dbuV_m_to_dbm_array(self.v_m_to_dbuV_m_array(v_m), frequency, distance, antenna_gain)
+
+    # endregion
 
 
 if __name__ == '__main__':
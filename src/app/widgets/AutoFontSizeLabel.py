@@ -10,6 +10,7 @@ class AutoFontSizeLabel(QLabel):
         self._default_font_size = 20
         self._content_margin = 10
         self._fixed_height = 40  # 新增：固定高度值
+        self._applied_font_size = None
         
         # 设置大小策略：水平扩展，垂直固定
         self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
@@ -89,11 +90,8 @@ class AutoFontSizeLabel(QLabel):
         return best_size
     
     def _apply_font_size(self, size):
-        # 应用新字体
-        self.setStyleSheet(f"""
-            AutoFontSizeLabel {{
-                font-size: {size}pt;
-                background: {self.palette().color(self.backgroundRole()).name()};
-                color: {self.palette().color(self.foregroundRole()).name()};
-            }}
-        """)
+        # 应用新字体(只设置字号，颜色由上级样式表按状态属性决定；字号不变时不重新设置样式表)
+        if size == self._applied_font_size:
+            return
+        self._applied_font_size = size
+        self.setStyleSheet(f"AutoFontSizeLabel {{ font-size: {size}pt; }}")
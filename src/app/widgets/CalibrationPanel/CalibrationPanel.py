@@ -90,6 +90,15 @@ class CalibrationPanel(QWidget):
     def current_step(self):
         return self._view.current_step
     
+    @property
+    def power_meter(self):
+        """已连接的功率计实例，未连接时为None"""
+        return self._model.power_meter.instance
+    
+    def set_scpi(self, scpi):
+        """设置RNX设备SCPI接口，用于校准时切换链路极化"""
+        self._controller.set_scpi(scpi)
+    
     def update_instrument_status(self, instrument_type: str, status: str, connected: bool):
         """Update instrument connection status display"""
         self._controller.update_instrument_status(instrument_type, status, connected)
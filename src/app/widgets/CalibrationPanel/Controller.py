@@ -1,14 +1,21 @@
 # app/widgets/CalibrationPanel/Controller.py
+import os
+import numpy as np
 import pandas as pd
-from typing import List, Dict
+from typing import List, Dict, Optional
 from scipy.interpolate import interp1d
 
-from PyQt5.QtCore import QObject, pyqtSignal
+from PyQt5.QtCore import QObject, Qt, pyqtSignal
 from PyQt5.QtWidgets import QMessageBox, QFileDialog
 from app.controllers.CalibrationFileManager import CalibrationFileManager
+from app.dialogs.CalibrationSearchDialog import CalibrationSearchDialog
+from app.models.CalibrationColumns import CalibrationColumns
 from app.utils.SignalUnitConverter import SignalUnitConverter
 from app.instruments.factory import InstrumentFactory
 from app.threads.CalibrationThread import CalibrationService, CalibrationPoint
+from app.utils.AdaptiveFrequencySampler import AdaptiveFrequencySampler
+from app.utils.FeedBands import link_mode_for
+from app.core.ui_scheduler import ui_scheduler
 from .Model import InstrumentInfo
 
 
@@ -20,6 +27,11 @@ class CalibrationController(QObject):
     calibration_triggered_with_list = pyqtSignal(list, float)  # (freq_list, ref)
     calibration_stopped = pyqtSignal()
     data_exported = pyqtSignal()
+    # 中止校准后排队关闭文件(排在校准线程已发出的校准点批次之后)
+    _session_close_requested = pyqtSignal()
+
+    # 校准线程向界面发送进度和校准点的最高频率(Hz)
+    UI_UPDATE_RATE_HZ = 10.0
 
     def __init__(self, view, model):
         super().__init__()
@@ -32,6 +44,13 @@ class CalibrationController(QObject):
         # 初始化单位转换器
         self._converter = SignalUnitConverter()
         self._horn_gain_interpolator = None  # 初始化插值器为None
+        self._sampler = None  # 自适应采样器，仅范围模式使用
+        self._ref_powers: List[float] = []  # 多参考功率列表，为空时使用单一参考功率
+        self._polarization = "THETA"
+        self._scpi = None  # RNX设备SCPI接口，用于切换链路极化
+        self._last_link_mode = None
+        self._patch_source: Optional[str] = None  # 局部重测的源校准文件
+        self._patch_freqs: List[float] = []  # 局部重测的频点(GHz)
 
         # 初始化校准文件管理器
         self.cal_manager = CalibrationFileManager(
@@ -40,6 +59,7 @@ class CalibrationController(QObject):
         )
 
         # 连接信号
+        self._session_close_requested.connect(self.cal_manager.close_session, Qt.QueuedConnection)
         self._connect_signals()
         self._update_button_states()
 
@@ -48,16 +68,23 @@ class CalibrationController(QObject):
         self._view.btn_connect.clicked.connect(self._on_connect)
         self._view.btn_auto_detect.clicked.connect(self._auto_detect_instruments)
         self._view.btn_start.clicked.connect(self._on_start)
+        self._view.btn_patch.clicked.connect(self._on_patch)
         self._view.btn_stop.clicked.connect(self._on_stop)
         self._view.btn_export.clicked.connect(self._on_export)
         self._view.btn_import.clicked.connect(self._import_freq_list)
         self._view.range_mode.toggled.connect(self._update_mode_ui)
+        self._view.adaptive_mode.toggled.connect(self._update_adaptive_ui)
+        self._view.ratio_mode.toggled.connect(self._update_ratio_ui)
         self._view.btn_import_gain.clicked.connect(self._import_antenna_gain)
 
         # 连接校准服务信号
         self.calibration_triggered.connect(self._start_calibration_process)
         self.calibration_triggered_with_list.connect(self._start_calibration_with_list_process)
 
+    def set_scpi(self, scpi):
+        """设置RNX设备SCPI接口"""
+        self._scpi = scpi
+
     def set_log_callback(self, callback):
         """设置日志回调"""
         self._log_callback = callback
@@ -112,6 +139,36 @@ class CalibrationController(QObject):
                 self.instruments_connected.emit(sig_gen_addr, power_meter_addr)
             else:
                 raise Exception("无法识别功率计类型")
+            
+            # 可选的Phi通道功率计(双极化并行测量)
+            phi_addr = self._view.power_meter_phi_address.text().strip()
+            if phi_addr:
+                phi_meter = InstrumentFactory.create_power_meter(phi_addr, power_meter_name)
+                if not phi_meter:
+                    raise Exception("无法识别Phi通道功率计类型")
+                self._model.power_meter_phi = InstrumentInfo(
+                    address=phi_addr,
+                    model=phi_meter.model,
+                    name=power_meter_name,
+                    connected=True,
+                    instance=phi_meter
+                )
+                self._log(f"Phi通道功率计连接成功: {phi_meter.idn}", "SUCCESS")
+            
+            # 可选的参考耦合器功率计(比值模式)
+            ref_addr = self._view.reference_meter_address.text().strip()
+            if ref_addr:
+                ref_meter = InstrumentFactory.create_power_meter(ref_addr, power_meter_name)
+                if not ref_meter:
+                    raise Exception("无法识别参考功率计类型")
+                self._model.reference_meter = InstrumentInfo(
+                    address=ref_addr,
+                    model=ref_meter.model,
+                    name=power_meter_name,
+                    connected=True,
+                    instance=ref_meter
+                )
+                self._log(f"参考功率计连接成功: {ref_meter.idn}", "SUCCESS")
 
         except Exception as e:
             self._log(f"仪器连接失败: {str(e)}", "ERROR")
@@ -192,6 +249,20 @@ class CalibrationController(QObject):
             except:
                 pass
             self._model.power_meter = InstrumentInfo(address="", model="", name="")
+            
+        if self._model.power_meter_phi.instance:
+            try:
+                self._model.power_meter_phi.instance.close()
+            except:
+                pass
+            self._model.power_meter_phi = InstrumentInfo(address="", model="", name="")
+            
+        if self._model.reference_meter.instance:
+            try:
+                self._model.reference_meter.instance.close()
+            except:
+                pass
+            self._model.reference_meter = InstrumentInfo(address="", model="", name="")
 
     # endregion
 
@@ -267,6 +338,47 @@ class CalibrationController(QObject):
     # region 校准流程控制
     def _on_start(self):
         """处理开始校准按钮点击"""
+        self._patch_source = None
+        self._start_calibration()
+
+    def _on_patch(self):
+        """
+        处理局部重测: 选择已有校准文件，重测其中位于当前频率范围内的频点
+        (频点列表模式下重测导入的频点)，完成后生成替换这些频点的新版本
+        """
+        files = CalibrationSearchDialog.get_files(self._view, self.cal_manager, title="选择要修补的校准文件")
+        if not files:
+            return
+        
+        source = self.cal_manager.load_calibration_file(files[0])
+        if source is None:
+            QMessageBox.warning(self._view, "警告", "无法加载所选校准文件")
+            return
+        
+        if self._view.range_mode.isChecked():
+            columns = source.get('columns')
+            if columns is None:
+                columns = CalibrationColumns.from_points(source['data'])
+            freqs = np.unique(np.round(columns['freq'], 6))
+            start, stop = self._view.start_freq.value(), self._view.stop_freq.value()
+            patch_freqs = freqs[(freqs >= start) & (freqs <= stop)].tolist()
+        else:
+            patch_freqs = sorted(set(self._freq_list))
+        
+        if not patch_freqs:
+            QMessageBox.warning(self._view, "警告", "所选频率范围内没有需要重测的频点")
+            return
+        
+        self._patch_source = files[0]
+        self._patch_freqs = patch_freqs
+        self._log(
+            f"局部重测: {os.path.basename(files[0])}, {len(patch_freqs)}个频点 "
+            f"({patch_freqs[0]:.3f}-{patch_freqs[-1]:.3f}GHz)", "INFO"
+        )
+        self._start_calibration()
+
+    def _start_calibration(self):
+        """校验参数、创建校准文件并启动校准(设置了局部重测源文件时只测量重测频点)"""
         # 确定极化模式
         if self._view.theta_radio.isChecked():
             polarization = "THETA"
@@ -274,16 +386,56 @@ class CalibrationController(QObject):
             polarization = "PHI"
         else:
             polarization = "DUAL"
+            if not self._model.power_meter_phi.instance and not self._can_switch_link():
+                QMessageBox.warning(self._view, "警告", "双极化校准需要连接Phi通道功率计或RNX设备(用于切换链路极化)")
+                return
+        self._polarization = polarization
+        
+        ratio_mode = self._view.ratio_mode.isChecked()
+        if ratio_mode and not self._model.reference_meter.instance:
+            QMessageBox.warning(self._view, "警告", "比值模式需要连接参考功率计")
+            return
+        
+        # 解析多参考功率
+        try:
+            self._ref_powers = self._parse_ref_power_list(self._view.ref_power_list.text())
+        except ValueError as e:
+            QMessageBox.warning(self._view, "警告", f"多参考功率格式错误:\n{str(e)}")
+            return
         
         # 构建基础参数
         base_param = {
             'ref_power': self._view.ref_power.value(),
             'polarization': polarization,
             'distance': 1.0,  # 默认距离1米
-            'operator': "SYSTEM"  # 默认操作员
+            'operator': "SYSTEM",  # 默认操作员
+            'averaging': self._view.averaging.value()
         }
+        if ratio_mode:
+            base_param['measurement_mode'] = 'RATIO'
+            base_param['coupling_db'] = self._view.coupling_db.value()
+        if len(self._ref_powers) > 1:
+            # 与合并文件一致，多参考功率记为"-10.0_-5.0"
+            base_param['ref_power'] = '_'.join(f"{p:.1f}" for p in self._ref_powers)
+        elif self._ref_powers:
+            base_param['ref_power'] = self._ref_powers[0]
         
-        if self._view.range_mode.isChecked():
+        if self._patch_source:
+            # 局部重测: 按频点列表测量，完成后与源文件合成新版本
+            self._sampler = None
+            self.cal_manager.create_new_calibration(
+                equipment_meta=self._prepare_equipment_meta(),
+                freq_params={
+                    'start_ghz': self._patch_freqs[0],
+                    'stop_ghz': self._patch_freqs[-1],
+                    'step_ghz': "FreqList",
+                    'custom_freqs': self._patch_freqs,
+                },
+                base_param=base_param,
+                version_notes=f"Patch measurement for {os.path.basename(self._patch_source)}"
+            )
+            self.calibration_triggered_with_list.emit(self._patch_freqs, self._primary_ref_power())
+        elif self._view.range_mode.isChecked():
             # 范围模式
             start = self._view.start_freq.value()
             stop = self._view.stop_freq.value()
@@ -301,17 +453,34 @@ class CalibrationController(QObject):
                 'step_ghz': step,
                 'custom_freqs': []
             }
+            version_notes = "Auto generated calibration file"
+            
+            if self._view.adaptive_mode.isChecked():
+                # 自适应模式: 步进作为粗扫步进，实际点数由误差收敛决定
+                self._sampler = AdaptiveFrequencySampler(
+                    start_ghz=start,
+                    stop_ghz=stop,
+                    coarse_step_ghz=step,
+                    tolerance_db=self._view.adaptive_tolerance.value(),
+                    max_points=self._view.adaptive_max_points.value()
+                )
+                freq_params['step_ghz'] = 'Adaptive'
+                freq_params['max_points'] = self._sampler.max_points
+                base_param['adaptive_tolerance_db'] = self._sampler.tolerance_db
+                version_notes = "Auto generated calibration file with adaptive frequency sampling"
+            else:
+                self._sampler = None
             
             # 创建校准文件
             self.cal_manager.create_new_calibration(
                 equipment_meta=equipment_meta,
                 freq_params=freq_params,
                 base_param=base_param,
-                version_notes="Auto generated calibration file"
+                version_notes=version_notes
             )
             
             # 触发校准信号
-            self.calibration_triggered.emit(start, stop, step, base_param['ref_power'])
+            self.calibration_triggered.emit(start, stop, step, self._primary_ref_power())
         else:
             # 频点列表模式
             if not self._freq_list:
@@ -336,19 +505,47 @@ class CalibrationController(QObject):
             )
             
             # 触发校准信号
-            self.calibration_triggered_with_list.emit(self._freq_list, base_param['ref_power'])
-
+            self.calibration_triggered_with_list.emit(self._freq_list, self._primary_ref_power())
+
+
+    def _parse_ref_power_list(self, text: str) -> List[float]:
+        """解析多参考功率输入(逗号/空格/分号分隔)，去重并保持输入顺序"""
+        values = []
+        for item in text.replace(';', ',').replace(' ', ',').split(','):
+            item = item.strip()
+            if not item:
+                continue
+            value = float(item)
+            if not -50 <= value <= 10:
+                raise ValueError(f"参考功率超出范围(-50~10dBm): {value}")
+            if value not in values:
+                values.append(value)
+        return values
+
+    def _primary_ref_power(self) -> float:
+        """当前校准使用的首个参考功率"""
+        return self._ref_powers[0] if self._ref_powers else self._view.ref_power.value()
 
     def _start_calibration_process(self, start: float, stop: float, step: float, ref_power: float):
         """处理范围模式校准启动"""
+        if self._sampler is not None:
+            freq_list = self._sampler.coarse_grid().tolist()
+            self._log(
+                f"自适应采样: 粗扫{len(freq_list)}点, 容差{self._sampler.tolerance_db:.2f}dB, "
+                f"点数上限{self._sampler.max_points}", "INFO"
+            )
+            self._execute_calibration(freq_list, ref_power, sampler=self._sampler)
+            return
         freq_list = [start + i * step for i in range(int((stop - start) / step) + 1)]
         self._execute_calibration(freq_list, ref_power)
  
     def _start_calibration_with_list_process(self, freq_list: List[float], ref_power: float):
         """处理频点列表模式校准启动"""
+        self._sampler = None
         self._execute_calibration(freq_list, ref_power)
 
-    def _execute_calibration(self, freq_list: List[float], ref_power: float):
+    def _execute_calibration(self, freq_list: List[float], ref_power: float,
+                             sampler: AdaptiveFrequencySampler = None):
         """执行校准流程"""
         if not hasattr(self._model, 'signal_gen') or not hasattr(self._model, 'power_meter'):
             QMessageBox.warning(self._view, "警告", "请先连接仪器")
@@ -362,6 +559,12 @@ class CalibrationController(QObject):
         # 转换为Hz单位
         freq_list_hz = [f * 1e9 for f in freq_list]
         
+        # 按预计点数预分配模型列存储
+        ref_count = max(len(self._ref_powers), 1)
+        self._model.reset_calibration((sampler.max_points if sampler else len(freq_list)) * ref_count)
+        if len(self._ref_powers) > 1:
+            self._log(f"多参考功率扫描: {', '.join(f'{p:.1f}' for p in self._ref_powers)} dBm", "INFO")
+        
         # 启动校准服务
         self._calibration_service.start_calibration(
             signal_source=self._model.signal_gen.instance,
@@ -369,14 +572,66 @@ class CalibrationController(QObject):
             freq_list=freq_list_hz,
             ref_power=ref_power,
             progress_callback=self._update_progress,
-            point_callback=self._save_calibration_point,
+            points_callback=self._save_calibration_points,
             finished_callback=self._on_calibration_finished,
-            error_callback=self._on_calibration_error
+            error_callback=self._on_calibration_error,
+            sampler=sampler,
+            ui_rate_hz=self.UI_UPDATE_RATE_HZ,
+            ref_powers=self._ref_powers if len(self._ref_powers) > 1 else None,
+            averaging=self._view.averaging.value(),
+            **self._polarization_options(),
+            **self._ratio_options()
         )
 
+    def _can_switch_link(self) -> bool:
+        """RNX设备是否已连接，可通过CONFigure:LINK切换极化"""
+        return self._scpi is not None and self._scpi.is_connected
+
+    def _polarization_options(self) -> Dict:
+        """构建极化测量参数: 优先双功率计并行，其次单功率计链路切换"""
+        options = {'polarization': self._polarization}
+        phi_meter = self._model.power_meter_phi.instance
+        if self._polarization == "DUAL" and phi_meter:
+            options['power_meter_phi'] = phi_meter
+            self._log("双极化: 使用两个功率计并行测量", "INFO")
+        elif self._polarization == "DUAL" and self._can_switch_link():
+            # 单极化校准不切换链路，保持原有的链路设置
+            self._last_link_mode = None
+            options['polarization_switch'] = self._switch_link_polarization
+            self._log("双极化: 单功率计通过链路切换测量", "INFO")
+        return options
+
+    def _ratio_options(self) -> Dict:
+        """构建比值模式参数"""
+        if not self._view.ratio_mode.isChecked() or not self._model.reference_meter.instance:
+            return {}
+        self._log(
+            f"比值模式: 参考耦合度{self._view.coupling_db.value():.2f}dB, "
+            f"平均次数{self._view.averaging.value()}", "INFO"
+        )
+        return {
+            'reference_meter': self._model.reference_meter.instance,
+            'coupling_db': self._view.coupling_db.value()
+        }
+
+    def _switch_link_polarization(self, freq_hz: float, polarization: str) -> bool:
+        """
+        切换RNX链路到指定频段和极化(在校准线程中调用)
+        :return: 链路是否发生了切换
+        """
+        link_mode = link_mode_for(freq_hz / 1e9, polarization)
+        if link_mode is None or link_mode == self._last_link_mode:
+            return False
+        self._scpi.send_command(f"CONFigure:LINK {link_mode}", expect_response=False)
+        self._last_link_mode = link_mode
+        return True
+
     def _on_stop(self):
         """处理停止校准"""
         self._calibration_service.stop_calibration()
+        # 线程结束前发出的校准点批次仍在事件队列中，关闭文件排在其后，保证已测数据全部写入
+        self._session_close_requested.emit()
+        self._patch_source = None
         self.calibration_stopped.emit()
         self._update_progress(0, "校准已中止")
 
@@ -426,11 +681,54 @@ class CalibrationController(QObject):
 
     # region 校准结果处理
     def _update_progress(self, value: int, message: str):
-        """更新进度显示"""
+        """更新进度显示(按帧合并，只显示最新进度)"""
+        ui_scheduler.schedule((self, 'progress'), self._apply_progress, value, message)
+
+    def _apply_progress(self, value: int, message: str):
         self._view.progress_bar.setValue(value)
         self._view.current_step.setText(message)
         self._update_button_states()
 
+    def _save_calibration_points(self, points: List[CalibrationPoint]):
+        """保存一批校准点(天线增益和V/M值按批一次计算)，每批只输出一条汇总日志"""
+        if not points or not self.cal_manager.active_file:
+            return  # 校准文件已关闭(中止或出错后迟到的批次)
+
+        try:
+            freq_hz = np.array([point.freq_hz for point in points], dtype=np.float64)
+            if self._horn_gain_interpolator is None:
+                horn_gains = np.zeros(len(points))
+            else:
+                horn_gains = np.asarray(self._horn_gain_interpolator(freq_hz / 1e9), dtype=np.float64)
+            distance = np.array([point.distance for point in points], dtype=np.float64)
+            theta_corrected = np.array([point.measured_theta for point in points]) - horn_gains
+            phi_corrected = np.array([point.measured_phi for point in points]) - horn_gains
+            theta_vm = self._converter.dbm_to_v_m_array(theta_corrected, freq_hz, distance)
+            phi_vm = self._converter.dbm_to_v_m_array(phi_corrected, freq_hz, distance)
+        except Exception:
+            # 批量计算失败时逐点计算，出错的点使用默认值
+            for point in points:
+                self._save_calibration_point(point)
+        else:
+            for point, values in zip(points, zip(horn_gains.tolist(), theta_corrected.tolist(), phi_corrected.tolist(),
+                                                 theta_vm.tolist(), phi_vm.tolist())):
+                (point.horn_gain, point.theta_corrected, point.phi_corrected,
+                 point.theta_corrected_vm, point.phi_corrected_vm) = values
+                self._model.add_calibration_point(point)
+            self.cal_manager.add_calibration_points(points)
+
+        last = points[-1]
+        self._log(
+            f"已保存{len(points)}个校准点 "
+            f"({points[0].freq_hz / 1e9:.3f}-{last.freq_hz / 1e9:.3f}GHz) | "
+            f"最新: 测量值(θ): {last.measured_theta:.2f}dBm | "
+            f"测量值(φ): {last.measured_phi:.2f}dBm | "
+            f"天线增益: {last.horn_gain:.2f}dBi | "
+            f"场强(θ): {last.theta_corrected_vm:.2f}V/m | "
+            f"场强(φ): {last.phi_corrected_vm:.2f}V/m",
+            "DEBUG"
+        )
+
     def _save_calibration_point(self, point: CalibrationPoint):
         """保存单个校准点，包含天线增益计算和V/M计算"""
         try:
@@ -460,19 +758,6 @@ class CalibrationController(QObject):
             # 保存到模型和文件
             self._model.add_calibration_point(point)
             self.cal_manager.add_calibration_point(point)
-            
-            # 记录详细信息到日志
-            self._log(
-                f"频率: {freq_ghz:.3f}GHz | "
-                f"测量值(θ): {point.measured_theta:.2f}dBm | "
-                f"测量值(φ): {point.measured_phi:.2f}dBm | "
-                f"天线增益: {horn_gain:.2f}dBi | "
-                f"实际值(θ): {point.theta_corrected:.2f}dB | "
-                f"实际值(φ): {point.phi_corrected:.2f}dB | "
-                f"场强(θ): {point.theta_corrected_vm:.2f}V/m | "
-                f"场强(φ): {point.phi_corrected_vm:.2f}V/m",
-                "DEBUG"
-            )
         except Exception as e:
             self._log(f"计算场强值时出错: {str(e)}", "ERROR")
             # 设置默认值以防出错
@@ -484,12 +769,41 @@ class CalibrationController(QObject):
 
     def _on_calibration_finished(self, results: List[CalibrationPoint]):
         """校准完成处理"""
-        self.cal_manager.finalize_calibration("The calibration file for actual calibrated output")
+        if not self.cal_manager.active_file:
+            return  # 校准文件已关闭(校准已中止)
+        if self._patch_source:
+            self._finish_patch(results)
+            return
+        notes = "The calibration file for actual calibrated output"
+        if self._sampler is not None:
+            notes += f" (adaptive sampling, {len(results)} points)"
+        self.cal_manager.finalize_calibration(notes)
         self._update_progress(100, "校准完成")
         QMessageBox.information(self._view, "完成", f"校准成功完成!\n共校准{len(results)}个频点")
         
+    def _finish_patch(self, results: List[CalibrationPoint]):
+        """局部重测完成: 保存重测数据，再生成替换对应频点的新版本"""
+        source, self._patch_source = self._patch_source, None
+        patch_csv, _ = self.cal_manager.finalize_calibration("Patch measurement")
+        try:
+            patched_csv, _ = self.cal_manager.patch_calibration(source, patch_csv)
+        except Exception as e:
+            self._log(f"校准文件修补失败: {str(e)}", "ERROR")
+            self._update_progress(0, "修补失败")
+            QMessageBox.critical(self._view, "错误", f"校准文件修补失败:\n{str(e)}\n重测数据已保存: {patch_csv}")
+            return
+        
+        self._log(f"校准文件修补完成: {patched_csv}", "SUCCESS")
+        self._update_progress(100, "局部重测完成")
+        QMessageBox.information(
+            self._view, "完成",
+            f"局部重测完成!\n共重测{len(results)}个频点\n新版本: {os.path.basename(patched_csv)}"
+        )
+
     def _on_calibration_error(self, error_msg: str):
         """校准错误处理"""
+        self.cal_manager.close_session()  # 已测数据落盘并关闭文件
+        self._patch_source = None
         self._update_progress(0, f"错误: {error_msg}")
         QMessageBox.critical(self._view, "错误", error_msg)
         self._cleanup_instruments()
@@ -558,6 +872,18 @@ class CalibrationController(QObject):
         self._view._update_mode_visibility()
         # self._update_button_states()  # 确保模式切换时更新按钮状态
 
+    def _update_ratio_ui(self, checked: bool):
+        """更新比值模式UI，参考通道抵消漂移后可使用较低的平均次数"""
+        self._view._update_ratio_visibility()
+        if checked and self._view.averaging.value() == 10:
+            self._view.averaging.setValue(2)
+        elif not checked and self._view.averaging.value() == 2:
+            self._view.averaging.setValue(10)
+
+    def _update_adaptive_ui(self, checked: bool):
+        """更新自适应采样UI"""
+        self._view._update_adaptive_visibility()
+
     def _update_button_states(self):
         """根据当前状态更新按钮可用性"""
         is_running = 0 < self._view.progress_bar.value() < 100
@@ -578,6 +904,7 @@ class CalibrationController(QObject):
         self._view.btn_start.setEnabled(not is_running and is_connected and 
                                     (self._view.range_mode.isChecked() or has_freq_list))
         
+        self._view.btn_patch.setEnabled(not is_running and is_connected)
         self._view.btn_stop.setEnabled(is_running)
         self._view.btn_export.setEnabled(
             not is_running and 
@@ -1,6 +1,8 @@
 # app/widgets/CalibrationPanel/Model.py
+import numpy as np
 from dataclasses import dataclass
 from typing import Dict, List, Optional, Union
+from app.models.CalibrationColumns import CalibrationColumns
 from app.threads.CalibrationThread import CalibrationPoint
 from app.instruments.interfaces import SignalSource
 from app.instruments.interfaces import PowerSensor
@@ -23,27 +25,54 @@ class FrequencyParams:
 
 @dataclass
 class CalibrationData:
-    frequencies: List[float]  # GHz
-    measured_theta: List[float]  # dBm
-    measured_phi: List[float]  # dBm
-    horn_gains: List[float]  # dB
-    theta_corrected: List[float]  # dB
-    phi_corrected: List[float]  # dB
-    theta_corrected_vm: List[float]  # dBμV/m
-    phi_corrected_vm: List[float]  # dBμV/m
+    columns: CalibrationColumns  # 列式存储，以下各字段均为其只读视图
     reference_power: float  # dBm
     timestamp: str
     instrument_info: Dict[str, str]
     frequency_mode: str  # "range" 或 "list"
     antenna_gain: Optional[Dict[float, float]] = None
 
+    @property
+    def frequencies(self) -> np.ndarray:  # GHz
+        return self.columns['freq']
+
+    @property
+    def measured_theta(self) -> np.ndarray:  # dBm
+        return self.columns['theta']
+
+    @property
+    def measured_phi(self) -> np.ndarray:  # dBm
+        return self.columns['phi']
+
+    @property
+    def horn_gains(self) -> np.ndarray:  # dB
+        return self.columns['horn_gain']
+
+    @property
+    def theta_corrected(self) -> np.ndarray:  # dB
+        return self.columns['theta_corrected']
+
+    @property
+    def phi_corrected(self) -> np.ndarray:  # dB
+        return self.columns['phi_corrected']
+
+    @property
+    def theta_corrected_vm(self) -> np.ndarray:  # V/m
+        return self.columns['theta_corrected_vm']
+
+    @property
+    def phi_corrected_vm(self) -> np.ndarray:  # V/m
+        return self.columns['phi_corrected_vm']
+
 class CalibrationModel:
     def __init__(self):
         self._data: Optional[CalibrationData] = None
         self.signal_gen: InstrumentInfo = InstrumentInfo(address="", model="", name="")
         self.power_meter: InstrumentInfo = InstrumentInfo(address="", model="", name="")
+        self.power_meter_phi: InstrumentInfo = InstrumentInfo(address="", model="", name="")  # 双极化Phi通道(可选)
+        self.reference_meter: InstrumentInfo = InstrumentInfo(address="", model="", name="")  # 比值模式参考功率计(可选)
         self._freq_list: List[float] = []
-        self._calibration_points: List[CalibrationPoint] = []
+        self._columns = CalibrationColumns()
         self.antenna_gain_data: Optional[List[Dict[str, float]]] = None
         self.antenna_model: str = "DEFAULT_ANT"  # 添加天线型号属性
         self.antenna_sn: str = "SN00000"  # 添加天线序列号属性
@@ -64,21 +93,33 @@ class CalibrationModel:
     def freq_list(self, freq_list: List[float]):
         self._freq_list = sorted(freq_list)
 
+    @property
+    def columns(self) -> CalibrationColumns:
+        return self._columns
+
+    def reset_calibration(self, expected_points: int):
+        """开始新的校准，按预计点数预分配列存储"""
+        self._columns = CalibrationColumns(expected_points)
+        self._data = None
+
     def add_calibration_point(self, point: CalibrationPoint):
         """添加校准点到模型，包含所有计算字段"""
-        self._calibration_points.append(point)
+        self._columns.append(
+            point.freq_hz / 1e9,
+            theta=point.measured_theta,
+            phi=point.measured_phi,
+            horn_gain=point.horn_gain,
+            theta_corrected=point.measured_theta - point.ref_power,
+            phi_corrected=point.measured_phi - point.ref_power,
+            theta_corrected_vm=point.theta_corrected_vm,
+            phi_corrected_vm=point.phi_corrected_vm,
+            reference_power=point.ref_power
+        )
         
         # 如果是第一个点，初始化数据结构
         if not self._data:
             self._data = CalibrationData(
-                frequencies=[point.freq_hz / 1e9],
-                measured_theta=[point.measured_theta],
-                measured_phi=[point.measured_phi],
-                horn_gains=[point.horn_gain],
-                theta_corrected=[point.measured_theta - point.ref_power],
-                phi_corrected=[point.measured_phi - point.ref_power],
-                theta_corrected_vm=[point.theta_corrected_vm],
-                phi_corrected_vm=[point.phi_corrected_vm],
+                columns=self._columns,
                 reference_power=point.ref_power,
                 timestamp=point.timestamp,
                 instrument_info={
@@ -89,16 +130,6 @@ class CalibrationModel:
                 frequency_mode="range" if not self._freq_list else "list",
                 antenna_gain=self.antenna_gain_data
             )
-        else:
-            # 追加数据点
-            self._data.frequencies.append(point.freq_hz / 1e9)
-            self._data.measured_theta.append(point.measured_theta)
-            self._data.measured_phi.append(point.measured_phi)
-            self._data.horn_gains.append(point.horn_gain)
-            self._data.theta_corrected.append(point.measured_theta - point.ref_power)
-            self._data.phi_corrected.append(point.measured_phi - point.ref_power)
-            self._data.theta_corrected_vm.append(point.theta_corrected_vm)
-            self._data.phi_corrected_vm.append(point.phi_corrected_vm)
 
     def update_instrument(self, instrument_type: str, address: str, model: str, name: str, connected: bool):
         """更新仪器信息"""
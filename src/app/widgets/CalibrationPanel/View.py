@@ -2,7 +2,8 @@
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QGroupBox, 
     QLabel, QPushButton, QDoubleSpinBox, QProgressBar, 
-    QFormLayout, QLineEdit, QRadioButton, QButtonGroup
+    QFormLayout, QLineEdit, QRadioButton, QButtonGroup,
+    QCheckBox, QSpinBox
 )
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QIcon,QColor
@@ -35,7 +36,7 @@ class CalibrationView(QWidget):
             Qt.WindowMinimizeButtonHint |
             Qt.WindowCloseButtonHint
         )
-        self.setFixedSize(700, 1000)  # 增加高度以容纳新控件
+        self.setFixedSize(700, 1120)  # 增加高度以容纳新控件
         
         # 设置窗口图标
         icon_path = "src/resources/icons/icon_calibration.png"
@@ -68,6 +69,10 @@ class CalibrationView(QWidget):
         self.power_meter_name.setPlaceholderText("功率计型号(如NRP50S)")
         self.signal_gen_address = QLineEdit("TCPIP0::192.168.1.10::inst0::INSTR")
         self.power_meter_address = QLineEdit("TCPIP0::192.168.1.11::inst0::INSTR")
+        self.power_meter_phi_address = QLineEdit()
+        self.power_meter_phi_address.setPlaceholderText("可选, 双极化时Phi通道功率计地址")
+        self.reference_meter_address = QLineEdit()
+        self.reference_meter_address.setPlaceholderText("可选, 比值模式参考耦合器功率计地址")
         self.btn_connect = QPushButton("连接仪器")
         
         # 频率模式选择
@@ -85,16 +90,31 @@ class CalibrationView(QWidget):
         self.stop_freq = QDoubleSpinBox()
         self.step_freq = QDoubleSpinBox()
         
+        # 自适应采样: 步进作为粗扫步进，仅在响应变化快的区间加密
+        self.adaptive_mode = QCheckBox("自适应采样")
+        self.adaptive_mode.setToolTip("先按步进粗扫，再在插值误差超过容差的区间自动加密频点")
+        self.adaptive_tolerance = QDoubleSpinBox()
+        self.adaptive_max_points = QSpinBox()
+        
         # 参考功率和极化选择合并到一个组
         self.basic_param_group = QGroupBox("基础参数")
         self.ref_power = QDoubleSpinBox()
+        self.ref_power_list = QLineEdit()
+        self.ref_power_list.setPlaceholderText("可选, 如 -10,-5 (每个频点依次测量)")
+        self.ref_power_list.setToolTip("填写多个参考功率时，在同一次校准中对每个频点依次步进各参考功率")
+        
+        # 比值模式: 参考耦合器功率计与DUT功率计同时读取，抵消信号源漂移
+        self.ratio_mode = QCheckBox("比值模式")
+        self.ratio_mode.setToolTip("使用参考耦合器上的功率计同时读取，以DUT/参考比值消除信号源漂移")
+        self.coupling_db = QDoubleSpinBox()
+        self.averaging = QSpinBox()
         
         # 极化选择
         self.theta_radio = QRadioButton("THETA")
         self.phi_radio = QRadioButton("PHI")
         self.dual_radio = QRadioButton("DUAL-T/P")
         self.theta_radio.setChecked(True)
-        self.dual_radio.setDisabled(True)
+        self.dual_radio.setToolTip("使用第二个功率计并行测量，或通过链路切换极化测量")
         
         # 频点列表控件
         self.freq_list_group = QGroupBox("频点列表")
@@ -104,6 +124,8 @@ class CalibrationView(QWidget):
         
         # 控制按钮
         self.btn_start = QPushButton("开始校准")
+        self.btn_patch = QPushButton("局部重测")
+        self.btn_patch.setToolTip("选择已有校准文件，重测当前频率范围(或导入的频点列表)内的频点并生成替换后的新版本")
         self.btn_stop = QPushButton("终止")
         self.btn_export = QPushButton("导出数据")
         
@@ -122,8 +144,20 @@ class CalibrationView(QWidget):
         self.stop_freq.setValue(40.0)
         self.step_freq.setRange(0.01, 1)
         self.step_freq.setValue(0.01)
+        self.adaptive_tolerance.setRange(0.01, 5.0)
+        self.adaptive_tolerance.setSingleStep(0.05)
+        self.adaptive_tolerance.setValue(0.2)
+        self.adaptive_max_points.setRange(10, 10000)
+        self.adaptive_max_points.setValue(400)
+        self.adaptive_tolerance.setEnabled(False)
+        self.adaptive_max_points.setEnabled(False)
         self.ref_power.setRange(-50, 10)
         self.ref_power.setValue(-30.0)
+        self.coupling_db.setRange(0.0, 60.0)
+        self.coupling_db.setValue(20.0)
+        self.coupling_db.setEnabled(False)
+        self.averaging.setRange(1, 1024)
+        self.averaging.setValue(10)
         self.progress_bar.setRange(0, 100)
 
     def _setup_ui_layout(self):
@@ -159,6 +193,8 @@ class CalibrationView(QWidget):
         instr_layout.addRow("信号源地址:", self.signal_gen_address)
         instr_layout.addRow("功率计型号:", self.power_meter_name)  # 新增行
         instr_layout.addRow("功率计地址:", self.power_meter_address)
+        instr_layout.addRow("功率计(PHI)地址:", self.power_meter_phi_address)
+        instr_layout.addRow("参考功率计地址:", self.reference_meter_address)
         instr_layout.addRow(antenna_layout)  # 添加天线信息布局
         instr_layout.addRow(self.btn_connect)
         self.instr_group.setLayout(instr_layout)
@@ -174,11 +210,24 @@ class CalibrationView(QWidget):
         param_layout.addRow("起始频率 (GHz):", self.start_freq)
         param_layout.addRow("终止频率 (GHz):", self.stop_freq)
         param_layout.addRow("步进 (GHz):", self.step_freq)
+        param_layout.addRow(self.adaptive_mode)
+        param_layout.addRow("插值容差 (dB):", self.adaptive_tolerance)
+        param_layout.addRow("最大点数:", self.adaptive_max_points)
         self.param_group.setLayout(param_layout)
         
         # 基础参数布局 (包含参考功率和极化选择)
         basic_param_layout = QFormLayout()
         basic_param_layout.addRow("参考功率 (dBm):", self.ref_power)
+        basic_param_layout.addRow("多参考功率 (dBm):", self.ref_power_list)
+        
+        # 测量模式布局
+        measure_layout = QHBoxLayout()
+        measure_layout.addWidget(self.ratio_mode)
+        measure_layout.addWidget(QLabel("耦合度 (dB):"))
+        measure_layout.addWidget(self.coupling_db)
+        measure_layout.addWidget(QLabel("平均次数:"))
+        measure_layout.addWidget(self.averaging)
+        basic_param_layout.addRow("测量模式:", measure_layout)
         
         # 极化选择布局
         polarization_layout = QHBoxLayout()
@@ -199,6 +248,7 @@ class CalibrationView(QWidget):
         # 按钮布局
         button_layout = QHBoxLayout()
         button_layout.addWidget(self.btn_start)
+        button_layout.addWidget(self.btn_patch)
         button_layout.addWidget(self.btn_stop)
         button_layout.addWidget(self.btn_export)
         
@@ -221,3 +271,13 @@ class CalibrationView(QWidget):
         is_range_mode = self.range_mode.isChecked()
         self.param_group.setVisible(is_range_mode)
         self.freq_list_group.setVisible(not is_range_mode)
+
+    def _update_ratio_visibility(self):
+        """根据比值模式开关启用/禁用耦合度输入"""
+        self.coupling_db.setEnabled(self.ratio_mode.isChecked())
+
+    def _update_adaptive_visibility(self):
+        """根据自适应采样开关启用/禁用相关控件"""
+        is_adaptive = self.adaptive_mode.isChecked()
+        self.adaptive_tolerance.setEnabled(is_adaptive)
+        self.adaptive_max_points.setEnabled(is_adaptive)
@@ -5,6 +5,7 @@ from PyQt5.QtCore import QTimer, QObject, pyqtSignal
 from PyQt5.QtGui import QTextCursor, QTextDocument, QIcon
 from datetime import datetime
 from PyQt5.QtWidgets import QFileDialog, QMessageBox
+from app.core.ui_scheduler import ui_scheduler
 
 class LogWidgetController(QObject):
     """日志控件的业务逻辑控制器"""
@@ -31,6 +32,7 @@ class LogWidgetController(QObject):
         self._auto_scroll = True
         self._show_timestamps = True
         self.enabled_levels = set(self.LEVELS.keys())
+        self._pending_html = []  # 尚未显示的日志行，按帧批量追加
 
         self.log_file = None
         self.log_dir = "logs"
@@ -104,18 +106,8 @@ class LogWidgetController(QObject):
         html.append(f'<span style="color:{color};font-weight:bold;">[{level}]</span>')
         html.append(f'<span style="color:{color};">{message}</span>')
         
-        self.view.append_html(" ".join(html))
-        
-        # 自动滚动
-        if self._auto_scroll:
-            QTimer.singleShot(10, self.view.scroll_to_bottom)
-        
-        # 限制最大行数
-        if self.view.text_edit.document().blockCount() > self.max_lines:
-            cursor = self.view.text_edit.textCursor()
-            cursor.movePosition(QTextCursor.Start)
-            cursor.select(QTextCursor.BlockUnderCursor)
-            cursor.removeSelectedText()
+        self._pending_html.append(" ".join(html))
+        ui_scheduler.schedule((self, 'append'), self._flush_pending)
         
         # 触发错误信号
         if level in ("ERROR", "CRITICAL"):
@@ -128,8 +120,29 @@ class LogWidgetController(QObject):
             self.log_file.write(log_entry)
             self.log_file.flush()  # 确保立即写入
 
+    def _flush_pending(self):
+        """把一帧内积累的日志一次追加到视图"""
+        if not self._pending_html:
+            return
+        lines, self._pending_html = self._pending_html, []
+        self.view.append_html("<br>".join(lines))
+        
+        # 限制最大行数
+        document = self.view.text_edit.document()
+        excess = document.blockCount() - self.max_lines
+        if excess > 0:
+            cursor = QTextCursor(document)
+            cursor.movePosition(QTextCursor.Start)
+            cursor.movePosition(QTextCursor.NextBlock, QTextCursor.KeepAnchor, excess)
+            cursor.removeSelectedText()
+        
+        # 自动滚动
+        if self._auto_scroll:
+            QTimer.singleShot(10, self.view.scroll_to_bottom)
+
     def clear(self):
         """清空日志"""
+        self._pending_html = []
         self.view.clear_content()
     
     def cleanup(self):
@@ -282,6 +295,7 @@ class LogWidgetController(QObject):
             if not file_path:
                 return
         
+        self._flush_pending()
         try:
             if file_path.endswith(".html"):
                 content = self.view.text_edit.toHtml()
@@ -2,8 +2,21 @@ from PyQt5.QtWidgets import QFileDialog
 from collections import defaultdict
 import os
 import re
+import numpy as np
 from app.controllers.CalibrationFileManager import CalibrationFileManager
 
+# 绘图系列名称与数据列的对应关系
+SERIES_COLUMNS = (
+    ('Theta(dBM)', 'theta'),
+    ('Phi(dBM)', 'phi'),
+    ('Theta_corrected(dBM)', 'theta_corrected'),
+    ('Phi_corrected(dBM)', 'phi_corrected'),
+    ('Horn_Gain(dBM)', 'horn_gain'),
+    ('Theta_V/M', 'theta_corrected_vm'),
+    ('Phi_V/M', 'phi_corrected_vm'),
+)
+
+
 class PlotController:
     def __init__(self, model, view):
         self.model = model
@@ -44,8 +57,36 @@ class PlotController:
             return
         
         # 准备绘图数据
+        columns = result.get('columns')
+        if columns is not None:
+            plot_data = self._series_from_columns(columns)
+        else:
+            plot_data = self._series_from_points(result['data'])
+        
+        # 从文件名生成标题
+        file_name = os.path.basename(file_path)
+        polarization = "双极化" if "DualPol" in file_name else "单极化"
+        ref_power_match = re.search(r"RefPwr([-\d.]+)dBm", file_name)
+        ref_power = ref_power_match.group(1) if ref_power_match else "未知"
+        
+        title = f"{polarization}校准 (参考功率: {ref_power} dBm)"
+        
+        # 绘制数据
+        self.plot_merged_data(plot_data, title)
+    
+    def _series_from_columns(self, columns):
+        """由列式数据按频率排序后整列生成绘图系列"""
+        order = np.argsort(columns['freq'], kind='stable')
+        freqs = columns['freq'][order].tolist()
+        return {
+            name: list(zip(freqs, columns[column][order].tolist()))
+            for name, column in SERIES_COLUMNS
+        }
+    
+    def _series_from_points(self, points):
+        """由数据点字典列表生成绘图系列"""
         plot_data = defaultdict(list)
-        for point in result['data']:
+        for point in points:
             freq = point['freq']
             
             # 添加所有可用数据系列
@@ -64,17 +105,7 @@ class PlotController:
         # 对每个系列按频率排序
         for series in plot_data.values():
             series.sort(key=lambda x: x[0])
-        
-        # 从文件名生成标题
-        file_name = os.path.basename(file_path)
-        polarization = "双极化" if "DualPol" in file_name else "单极化"
-        ref_power_match = re.search(r"RefPwr([-\d.]+)dBm", file_name)
-        ref_power = ref_power_match.group(1) if ref_power_match else "未知"
-        
-        title = f"{polarization}校准 (参考功率: {ref_power} dBm)"
-        
-        # 绘制数据
-        self.plot_merged_data(plot_data, title)
+        return plot_data
     
     def plot_merged_data(self, data_dict, title="合并校准数据"):
         """绘制合并后的校准数据"""
@@ -3,6 +3,7 @@ from PyQt5.QtGui import (QColor, QPainter, QPen, QFont,
                          QLinearGradient, QPainterPath, QBrush, QPolygonF)
 from PyQt5.QtCore import Qt, QPointF, QRectF, QTimer, QPoint
 import math
+from app.core.ui_scheduler import ui_scheduler
 
 class SimpleLinkDiagram(QLabel):
     def __init__(self, parent=None):
@@ -72,7 +73,7 @@ class SimpleLinkDiagram(QLabel):
             self.pulse_radius = 0
             self.pulse_alpha = 0
         
-        self.update()
+        self._request_repaint()
         
     def update_animation(self):
         """更新动画进度"""
@@ -83,7 +84,7 @@ class SimpleLinkDiagram(QLabel):
             self.radiation_progress = (self.radiation_progress + 0.15) % 1.0
         else:
             self.radiation_progress = 0
-        self.update()
+        self._request_repaint()
 
     def set_link(self, link_mode):
         """设置链路模式并启动过渡动画"""
@@ -116,15 +117,19 @@ class SimpleLinkDiagram(QLabel):
             self.old_link = None
             self.new_link = None
         
-        self.update()
+        self._request_repaint()
         
+    def _request_repaint(self):
+        """各动画定时器只推进状态，重绘由界面刷新调度器按帧合并"""
+        ui_scheduler.schedule((self, 'repaint'), self.update)
+
     def set_source_state(self, state):
         """设置信号源状态"""
         if isinstance(state, str):
             self.source_on = state.upper() == "ON"
         else:
             self.source_on = bool(state)
-        self.update()
+        self._request_repaint()
 
     def paintEvent(self, a0):
         super().paintEvent(a0)
@@ -2,6 +2,8 @@ from PyQt5.QtCore import QObject, pyqtSignal, QTimer
 from enum import Enum, auto
 from .Model import StatusPanelModel
 from .View import StatusPanelView
+from .RenderCache import RenderCache
+from app.core.ui_scheduler import ui_scheduler
 
 class FeedState(Enum):
     """馈源模组状态枚举"""
@@ -51,6 +53,10 @@ class StatusPanelController(QObject):
         # 界面获取数据
         self._main_window = None
         
+        # 状态颜色通过动态属性切换，样式表只在此设置一次；界面更新只在内容变化时才设置控件
+        self._render = RenderCache()
+        self.view.setStyleSheet(self.model.build_stylesheet())
+        
         self.setup_connections()
         self.initialize_units()
 
@@ -254,9 +260,7 @@ class StatusPanelController(QObject):
         self._operation_confirm_count = 0  # 初始化计数器
         
         # 更新UI显示操作状态
-        self.model.style_status['motion_label']['text'] = \
-            f"{axis}轴{'复位' if operation == 'HOMING' else '达位'}中..."
-        self.model.style_status['motion_label']['style'] = "color: #ff8f00;"
+        self.model.set_motion_label(f"{axis}轴{'复位' if operation == 'HOMING' else '达位'}中...", 'busy')
         self.update_ui()
         
         # 启动超时定时器(90秒)
@@ -291,8 +295,7 @@ class StatusPanelController(QObject):
         self.operating_axis = None
         
         # 恢复UI显示
-        self.model.style_status['motion_label']['text'] = "运动状态: 就绪"
-        self.model.style_status['motion_label']['style'] = "color: #228B22;"
+        self.model.set_motion_label("运动状态: 就绪", 'ready')
         self.update_ui()
         
         # 处理下一个待执行操作
@@ -366,7 +369,7 @@ class StatusPanelController(QObject):
                             if self._operation_confirm_count >= 2:
                                 self._on_operation_complete(True)
                                 self._operation_confirm_count = 0  # 重置计数器
-            self.update_ui()
+            self.request_ui_update()
 
 
     def update_src_status(self, status: dict):
@@ -411,7 +414,7 @@ class StatusPanelController(QObject):
                     else:
                         formatted_status[key] = value
                 self.model.update_src_status(formatted_status)
-            self.update_ui()
+            self.request_ui_update()
 
 
 
@@ -427,18 +430,20 @@ class StatusPanelController(QObject):
                     self._on_operation_complete(True)
                 else:
                     # 操作仍在进行中
-                    self.model.style_status['motion_label']['text'] = \
-                        f"{self.operating_axis}轴{'复位' if self.current_operation == 'HOMING' else '达位'}中..."
-                    self.model.style_status['motion_label']['style'] = "color: #ff8f00;"
+                    self.model.set_motion_label(
+                        f"{self.operating_axis}轴{'复位' if self.current_operation == 'HOMING' else '达位'}中...", 'busy')
             else:
                 # 无状态更新，保持当前显示
                 pass
         else:
             # 无操作，显示就绪状态
-            self.model.style_status['motion_label']['text'] = "运动状态: 就绪"
-            self.model.style_status['motion_label']['style'] = "color: #228B22;"
+            self.model.set_motion_label("运动状态: 就绪", 'ready')
         
-        self.update_ui()
+        self.request_ui_update()
+
+    def request_ui_update(self):
+        """登记界面刷新，状态轮询产生的多次更新在一帧内只刷新一次"""
+        ui_scheduler.schedule((self, 'ui'), self.update_ui)
 
     def update_ui(self):
         # 更新运动模组状态
@@ -449,13 +454,9 @@ class StatusPanelController(QObject):
                 
                 # 更新速度标签
                 speed_text = status.get('speed', '-')
-                self.view.motion_speed[axis].setText(speed_text)
-                
-                # 确保速度样式被应用
-                self.model.update_speed_style(axis, speed_text)
-                speed_style = self.model.style_status.get(f'speed_{axis}', {})
-                if speed_style:
-                    self.view.motion_speed[axis].setStyleSheet(speed_style.get('style', ''))
+                speed_label = self.view.motion_speed[axis]
+                self._render.set_text(speed_label, speed_text)
+                self._render.set_property(speed_label, 'speedLevel', self.model.get_speed_level(speed_text))
         
         # 更新信号源状态
         src = self.model.src_status
@@ -467,23 +468,22 @@ class StatusPanelController(QObject):
         # 更新校准文件状态
         cal_style = self.model.style_status.get('cal_file')
         if cal_style:
-            self.view.cal_file_status.setText(cal_style['text'])
-            self.view.cal_file_status.setStyleSheet(cal_style['style'])
+            self._render.set_text(self.view.cal_file_status, cal_style['text'])
+            self._render.set_property(self.view.cal_file_status, 'calState', cal_style['state'])
             
         # 更新运动状态标签
         motion_style = self.model.style_status.get('motion_label')
         if motion_style:
-            self.view.motion_label.setText(motion_style['text'])
-            self.view.motion_label.setStyleSheet(motion_style['style'])
+            self._render.set_text(self.view.motion_label, motion_style['text'])
+            self._render.set_property(self.view.motion_label, 'motionState', motion_style['state'])
             
         # 更新单位组合框颜色
         self._update_unit_combo_colors()
 
     def _update_status_label(self, label, text):
         """更新状态标签"""
-        label.setText(str(text).strip())
-        style = self.model.get_status_style(text)
-        label.setStyleSheet(style)
+        self._render.set_text(label, str(text).strip())
+        self._render.set_property(label, 'statusState', self.model.get_status_state(text))
 
     def _update_unit_combo_colors(self):
         """更新单位组合框颜色"""
@@ -493,8 +493,8 @@ class StatusPanelController(QObject):
             power_color = self.model.unit_converter.get_efield_unit_color(power_unit)
         else:
             power_color = self.model.unit_converter.get_power_unit_color(power_unit)
-        self.view.power_unit_combo.setStyleSheet(
-            f"background: {power_color}; color: white;"
+        self._render.set_style_sheet(
+            self.view.power_unit_combo, f"background: {power_color}; color: white;"
         )
         
         # 原始功率单位组合框
@@ -503,27 +503,18 @@ class StatusPanelController(QObject):
             raw_power_color = self.model.unit_converter.get_efield_unit_color(raw_power_unit)
         else:
             raw_power_color = self.model.unit_converter.get_power_unit_color(raw_power_unit)
-        self.view.raw_power_unit_combo.setStyleSheet(
-            f"background: {raw_power_color}; color: white;"
+        self._render.set_style_sheet(
+            self.view.raw_power_unit_combo, f"background: {raw_power_color}; color: white;"
         )
         
         # 频率单位组合框(固定颜色)
         freq_color = "#0078d7"
-        self.view.freq_unit_combo.setStyleSheet(
-            f"background: {freq_color}; color: white;"
+        self._render.set_style_sheet(
+            self.view.freq_unit_combo, f"background: {freq_color}; color: white;"
         )
 
 
     def set_cal_file_style(self, text: str, state: str):
         """设置校准文件状态样式"""
-        styles = {
-            'loaded': "background:#b6f5c6; color:#0078d7;",
-            'missing': "background:#fff9c4; color:#0078d7;",
-            'invalid': "background:#ffcdd2; color:#d32f2f;"
-        }
-        
-        self.model.update_style_status('cal_file', {
-            'text': text,
-            'style': styles.get(state, styles['missing'])
-        })
+        self.model.set_cal_file_state(text, state)
         self.update_ui()
@@ -9,14 +9,29 @@ class StatusPanelModel:
         self.style_status = {
             'cal_file': {
                 'text': 'Calib Miss',
+                'state': 'invalid',
                 'style': "background:#ffcdd2; color:#d32f2f;"  # 默认错误样式
             },
             'motion_label': {
                 'text': '运动状态: 就绪',
+                'state': 'ready',
                 'style': "color: #228B22;"
             }
         }
         
+        # 校准文件状态颜色
+        self.cal_file_colors = {
+            'loaded': "background:#b6f5c6; color:#0078d7;",
+            'missing': "background:#fff9c4; color:#0078d7;",
+            'invalid': "background:#ffcdd2; color:#d32f2f;"
+        }
+        
+        # 运动状态标签颜色
+        self.motion_colors = {
+            'ready': "color: #228B22;",
+            'busy': "color: #ff8f00;"
+        }
+        
         # 速度颜色映射
         self.speed_colors = {
             "LOW": "#ffe082",
@@ -35,6 +50,7 @@ class StatusPanelModel:
             'default': "background:#f5faff; color:#0078d7; border:2px solid #0078d7; border-radius:8px;",
             'error': "background:#ffcdd2; color:#d32f2f; border:2px solid #0078d7; border-radius:8px;"
         }
+        self._status_state_cache: Dict[str, str] = {}  # 状态文本 -> status_colors键
 
         # 运动模组状态
         self.motion_status = {
@@ -81,13 +97,28 @@ class StatusPanelModel:
         if element in self.style_status:
             self.style_status[element].update(style)
             
-    def update_speed_style(self, axis: str, speed_text: str):
-        """更新速度标签样式"""
-        # 确保速度文本是字符串并去除前后空格
+    def set_cal_file_state(self, text: str, state: str):
+        """更新校准文件状态(state: loaded/missing/invalid)"""
+        if state not in self.cal_file_colors:
+            state = 'missing'
+        self.update_style_status('cal_file', {
+            'text': text,
+            'state': state,
+            'style': self.cal_file_colors[state]
+        })
+
+    def set_motion_label(self, text: str, state: str):
+        """更新运动状态标签(state: ready/busy)"""
+        self.update_style_status('motion_label', {
+            'text': text,
+            'state': state,
+            'style': self.motion_colors[state]
+        })
+
+    def get_speed_level(self, speed_text: str) -> str:
+        """速度文本对应的speed_colors键，无法识别时为'default'"""
         speed_text = str(speed_text).strip().upper()
-        
-        # 匹配速度级别
-        speed_level = "UNKOWN"  # 默认值
+        speed_level = "default"
         if "LOW" in speed_text:
             speed_level = "LOW"
         if "MID1" in speed_text:
@@ -98,6 +129,13 @@ class StatusPanelModel:
             speed_level = "MID3"
         elif "HIGH" in speed_text:
             speed_level = "HIGH"
+        return speed_level
+            
+    def update_speed_style(self, axis: str, speed_text: str):
+        """更新速度标签样式"""
+        # 确保速度文本是字符串并去除前后空格
+        speed_text = str(speed_text).strip().upper()
+        speed_level = self.get_speed_level(speed_text)
         
         bg = self.speed_colors.get(speed_level, "#f5faff")
         style = f"background:{bg}; color:#0078d7; border:2px solid #0078d7; border-radius:8px;"
@@ -107,19 +145,41 @@ class StatusPanelModel:
             self.style_status[f'speed_{axis}'] = {}
         self.style_status[f'speed_{axis}'].update({
             'style': style,
+            'level': speed_level,
             'text': speed_text  # 同时保存文本
         })
 
+    def get_status_state(self, text: str) -> str:
+        """根据文本获取状态(status_colors的键)，结果按文本缓存"""
+        text = str(text)
+        state = self._status_state_cache.get(text)
+        if state is not None:
+            return state
+        upper = text.upper()
+        if "ERROR" in upper or any(x in upper for x in ["超时", "TIMEOUT", "连接失败"]):
+            state = 'error'
+        else:
+            state = next((key for key in self.status_colors if key in upper), 'default')
+        if len(self._status_state_cache) >= 1024:
+            self._status_state_cache.clear()  # 功率/频率读数不断变化，防止无限增长
+        self._status_state_cache[text] = state
+        return state
 
     def get_status_style(self, text: str):
         """根据文本获取状态样式"""
-        text = str(text).upper()
-        if "ERROR" in text:
-            return self.status_colors['error']
-        if any(x in text for x in ["超时", "TIMEOUT", "连接失败"]):
-            return self.status_colors['error']
-        for key in self.status_colors:
-            if key in text:
-                return self.status_colors[key]
-        return self.status_colors['default']
+        return self.status_colors[self.get_status_state(text)]
+
+    def build_stylesheet(self) -> str:
+        """
+        生成状态面板样式表: 各状态颜色写成动态属性选择器，
+        控件只需切换属性值(statusState/speedLevel/calState/motionState)，无需逐次设置样式表
+        """
+        rules = [f'QLabel[statusState="{key}"] {{ {style} }}' for key, style in self.status_colors.items()]
+        speed_base = "color:#0078d7; border:2px solid #0078d7; border-radius:8px; padding: 2px; margin: 1px;"
+        speed_levels = dict(self.speed_colors, default="#f5faff")
+        rules += [f'QLabel[speedLevel="{level}"] {{ background:{bg}; {speed_base} }}'
+                  for level, bg in speed_levels.items()]
+        rules += [f'QLabel[calState="{state}"] {{ {style} }}' for state, style in self.cal_file_colors.items()]
+        rules += [f'QLabel[motionState="{state}"] {{ {style} }}' for state, style in self.motion_colors.items()]
+        return "\n".join(rules)
 
@@ -0,0 +1,48 @@
+from typing import Any, Dict, Tuple
+
+from PyQt5.QtWidgets import QWidget
+
+
+class RenderCache:
+    """
+    记录每个控件最近一次设置的文本、动态属性和样式表，
+    与上次相同时跳过设置，避免无变化的重绘和样式重新计算(polish)
+    """
+
+    def __init__(self):
+        self._applied: Dict[Tuple[int, str], Any] = {}
+
+    def _changed(self, widget: QWidget, key: str, value) -> bool:
+        cache_key = (id(widget), key)
+        if self._applied.get(cache_key, self) == value:
+            return False
+        self._applied[cache_key] = value
+        return True
+
+    def set_text(self, widget: QWidget, text: str) -> bool:
+        """设置文本，返回是否有变化"""
+        if not self._changed(widget, 'text', text):
+            return False
+        widget.setText(text)
+        return True
+
+    def set_property(self, widget: QWidget, name: str, value) -> bool:
+        """设置动态属性并按样式表中的属性选择器重新计算样式，返回是否有变化"""
+        if not self._changed(widget, name, value):
+            return False
+        widget.setProperty(name, value)
+        style = widget.style()
+        style.unpolish(widget)
+        style.polish(widget)
+        return True
+
+    def set_style_sheet(self, widget: QWidget, style: str) -> bool:
+        """设置样式表，返回是否有变化"""
+        if not self._changed(widget, 'styleSheet', style):
+            return False
+        widget.setStyleSheet(style)
+        return True
+
+    def clear(self):
+        """清空记录(控件被外部修改后调用，下一次更新会重新设置)"""
+        self._applied.clear()
@@ -67,13 +67,7 @@ class StatusPanelView(QWidget):
             
             self.motion_speed[axis] = QLabel("-")
             self.motion_speed[axis].setProperty("statusValue", True)
-
-
-            # 添加初始样式
-            self.motion_speed[axis].setStyleSheet(
-                "background:#f5faff; color:#0078d7; border:2px solid #0078d7; border-radius:8px;"
-                "padding: 2px; margin: 1px;"  # 添加内边距和外边距
-            )
+            self.motion_speed[axis].setProperty("speedLevel", "default")  # 颜色由状态面板样式表按速度级别选择
 
             self.motion_grid.addWidget(self.motion_speed[axis], i+1, 3)
         
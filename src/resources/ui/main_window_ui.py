@@ -107,6 +107,8 @@ class MainWindowUI(QMainWindow):
         self.raw_power_input.setPlaceholderText("信号源实际输出")
         self.power_btn = QPushButton("设置功率")
         self.power_query_btn = QPushButton("查询功率")
+        self.leveling_check = QCheckBox("闭环调平")
+        self.leveling_check.setToolTip("设置功率时用校准面板连接的功率计反复测量并修正，直到场强达到目标")
 
         self.output_combo = QComboBox()
         self.output_combo.addItems(["ON", "OFF"])
@@ -170,6 +172,29 @@ class MainWindowUI(QMainWindow):
             self.plot_action = QAction("数据绘图", self)
         self.plot_action.setStatusTip("打开数据绘图工具")
         self.toolbar.addAction(self.plot_action)
+
+        # 测试计划
+        icon_path = "src/resources/icons/icon_plan.png"
+        if Path(icon_path).exists():
+            self.test_plan_action = QAction(QIcon(icon_path), "测试计划", self)
+        else:
+            self.test_plan_action = QAction("测试计划", self)
+        self.test_plan_action.setStatusTip("按频点列表执行测试计划")
+        self.toolbar.addAction(self.test_plan_action)
+
+        # 测试序列
+        icon_path = "src/resources/icons/icon_sequence.png"
+        if Path(icon_path).exists():
+            self.sequence_action = QAction(QIcon(icon_path), "测试序列", self)
+        else:
+            self.sequence_action = QAction("测试序列", self)
+        self.sequence_action.setStatusTip("在后台执行测试序列")
+        self.toolbar.addAction(self.sequence_action)
+
+        self.sequence_pause_action = QAction("暂停序列", self)
+        self.sequence_pause_action.setStatusTip("暂停/继续测试序列")
+        self.sequence_pause_action.setEnabled(False)
+        self.toolbar.addAction(self.sequence_pause_action)
         
         # 添加分隔线
         self.toolbar.addSeparator()
@@ -307,6 +332,7 @@ class MainWindowUI(QMainWindow):
         src_layout.addWidget(self.power_unit_combo, 1, 3)
         src_layout.addWidget(self.power_btn, 1, 4)
         src_layout.addWidget(self.power_query_btn, 1, 5)
+        src_layout.addWidget(self.leveling_check, 1, 6)
         
         # 第三行 - RF输出
         src_layout.addWidget(QLabel("RF输出:"), 2, 0)
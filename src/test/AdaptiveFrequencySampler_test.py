@@ -0,0 +1,58 @@
+import unittest
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))  # 添加src目录
+
+import numpy as np
+
+from app.utils.AdaptiveFrequencySampler import AdaptiveFrequencySampler
+
+
+class TestAdaptiveFrequencySampler(unittest.TestCase):
+    """AdaptiveFrequencySampler 单元测试类"""
+
+    def setUp(self):
+        self.sampler = AdaptiveFrequencySampler(8.0, 40.0, 1.0, tolerance_db=0.05, max_points=300)
+
+    def test_coarse_grid(self):
+        """测试粗扫频点包含起止频率"""
+        grid = self.sampler.coarse_grid()
+        self.assertEqual(len(grid), 33)
+        self.assertAlmostEqual(grid[0], 8.0)
+        self.assertAlmostEqual(grid[-1], 40.0)
+
+    def test_linear_response_converges(self):
+        """测试线性响应不需要加密"""
+        freqs = self.sampler.coarse_grid()
+        values = -0.5 * freqs + 3.0
+        self.assertEqual(self.sampler.refine(freqs, values).size, 0)
+
+    def test_refine_only_near_resonance(self):
+        """测试只在响应变化快的区域插入频点"""
+        def response(f):
+            return -0.2 * f + 4.0 * np.exp(-((f - 20.0) / 0.8) ** 2)
+
+        freqs = self.sampler.coarse_grid()
+        for _ in range(20):
+            new_freqs = self.sampler.refine(freqs, response(freqs))
+            if new_freqs.size == 0:
+                break
+            self.assertTrue(np.all((new_freqs > 15.0) & (new_freqs < 25.0)))
+            freqs = np.concatenate([freqs, new_freqs])
+
+        self.assertLessEqual(len(freqs), self.sampler.max_points)
+        dense = np.linspace(8.0, 40.0, 3201)
+        order = np.argsort(freqs)
+        error = np.abs(np.interp(dense, freqs[order], response(freqs[order])) - response(dense))
+        self.assertLess(error.max(), 0.1)
+
+    def test_budget_limit(self):
+        """测试点数预算限制"""
+        sampler = AdaptiveFrequencySampler(8.0, 40.0, 1.0, tolerance_db=1e-6, max_points=40)
+        freqs = sampler.coarse_grid()
+        new_freqs = sampler.refine(freqs, np.sin(freqs * 3))
+        self.assertEqual(new_freqs.size, 40 - len(freqs))
+
+
+if __name__ == '__main__':
+    unittest.main()
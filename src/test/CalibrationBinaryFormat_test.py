@@ -0,0 +1,92 @@
+import unittest
+import sys
+import os
+import json
+import tempfile
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))  # 添加src目录
+
+import numpy as np
+
+from app.controllers import CalibrationBinaryFormat
+from app.models.CalibrationColumns import CalibrationColumns
+
+
+class TestCalibrationBinaryFormat(unittest.TestCase):
+    """RNXC v2 二进制格式单元测试类"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "cal.bin")
+        self.meta = {'base_param': {'ref_power': -10.0, 'polarization': 'DUAL'}}
+        self.columns = CalibrationColumns.from_arrays(
+            freq=np.array([8.0, 8.123456789, 9.0]),
+            theta=np.array([-10.5, -11.25, -12.0]),
+            reference_power=np.array([-10.0, -10.0, -5.0]),
+            polarization=np.array(['THETA', 'PHI', 'DUAL'])
+        )
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_roundtrip(self):
+        """测试写入后读取的数据与元数据一致(频率保持float64精度)"""
+        CalibrationBinaryFormat.write(self.path, self.columns, self.meta)
+        self.assertTrue(CalibrationBinaryFormat.is_v2(self.path))
+
+        meta, columns = CalibrationBinaryFormat.read(self.path)
+        self.assertEqual(meta, self.meta)
+        self.assertEqual(len(columns), 3)
+        self.assertEqual(columns['freq'][1], 8.123456789)
+        np.testing.assert_array_equal(columns['theta'], self.columns['theta'])
+        self.assertEqual(columns.point(2)['polarization'], 'DUAL')
+        self.assertEqual(columns.point(2)['reference_power'], -5.0)
+
+    def test_columns_aligned(self):
+        """测试列数据块按64字节对齐"""
+        CalibrationBinaryFormat.write(self.path, self.columns, self.meta)
+        buffer = np.memmap(self.path, dtype=np.uint8, mode='r')
+        _, table = CalibrationBinaryFormat._parse_layout(buffer)
+        self.assertTrue(all(int(offset) % 64 == 0 for offset in table['offset']))
+
+    def test_checksum(self):
+        """测试文件内容被修改后校验失败，截断后结构检查失败"""
+        CalibrationBinaryFormat.write(self.path, self.columns, self.meta)
+        self.assertTrue(CalibrationBinaryFormat.verify_checksum(self.path))
+
+        with open(self.path, 'r+b') as f:
+            f.seek(-40, os.SEEK_END)
+            f.write(b'\xff')
+        self.assertFalse(CalibrationBinaryFormat.verify_checksum(self.path))
+
+        with open(self.path, 'r+b') as f:
+            f.truncate(200)
+        with self.assertRaises(ValueError):
+            CalibrationBinaryFormat.read_meta(self.path)
+
+    def test_load_v1(self):
+        """测试v1文件(含REFList扩展)映射为列视图，数据点字典按需构建"""
+        meta = {'base_param': {'ref_power': 'REFList', 'polarization': 'DUAL'}}
+        records = np.zeros(2, dtype=CalibrationBinaryFormat.V1_REFLIST_POINT_DTYPE)
+        records['freq'] = [8.0, 8.5]
+        records['theta'] = [-10.0, -11.0]
+        records['reference_power'] = [-10.0, -5.0]
+        records['polarization'] = [b'THETA', b'PHI']
+        meta_bytes = json.dumps(meta).encode('utf-8')
+        with open(self.path, 'wb') as f:
+            f.write(b'RNXC' + bytes([1]) + len(meta_bytes).to_bytes(4, 'little') + meta_bytes)
+            f.write(records.tobytes())
+
+        version, loaded_meta, columns = CalibrationBinaryFormat.load(self.path)
+        self.assertEqual(version, 1)
+        self.assertEqual(loaded_meta, meta)
+        points = columns.points()
+        self.assertEqual(len(points), 2)
+        self.assertEqual(points[1]['freq'], 8.5)
+        self.assertEqual(points[1]['polarization'], 'PHI')
+        self.assertEqual(points[0]['reference_power'], -10.0)
+        self.assertEqual([p['theta'] for p in points], [-10.0, -11.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+import sys
+import os
+import tempfile
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))  # 添加src目录
+
+import numpy as np
+
+from app.controllers.CalibrationCache import CalibrationCache
+from app.models.CalibrationColumns import CalibrationColumns
+
+
+class TestCalibrationCache(unittest.TestCase):
+    """CalibrationCache 单元测试类"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "cal.csv")
+        with open(self.path, 'w') as f:
+            f.write("data")
+        self.columns = CalibrationColumns.from_arrays(
+            freq=np.linspace(8.0, 12.0, 5), theta=np.full(5, -10.0)
+        )
+        self.meta = {'base_param': {'ref_power': -10.0}}
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_hit_and_invalidate_on_change(self):
+        """测试命中缓存，文件变化后条目失效"""
+        cache = CalibrationCache()
+        self.assertIsNone(cache.get(self.path))
+        cache.put(self.path, self.meta, self.columns)
+
+        result = cache.get(self.path)
+        self.assertEqual(result['meta'], self.meta)
+        self.assertEqual(result['data'][4]['freq'], 12.0)
+        result['meta']['base_param']['ref_power'] = 0.0
+        self.assertEqual(cache.get(self.path)['meta'], self.meta)
+
+        with open(self.path, 'a') as f:
+            f.write("changed")
+        self.assertIsNone(cache.get(self.path))
+
+    def test_lru_eviction(self):
+        """测试超出条目数时淘汰最久未使用的文件"""
+        cache = CalibrationCache(max_entries=1)
+        other = os.path.join(self.tmpdir.name, "other.csv")
+        with open(other, 'w') as f:
+            f.write("other")
+        cache.put(self.path, self.meta, self.columns)
+        cache.put(other, self.meta, self.columns)
+        self.assertIsNone(cache.get(self.path))
+        self.assertIsNotNone(cache.get(other))
+
+    def test_spill(self):
+        """测试较大的CSV解析结果落盘后可由新的缓存实例加载"""
+        spill_dir = os.path.join(self.tmpdir.name, "cache")
+        CalibrationCache(spill_min_points=1).put(self.path, self.meta, self.columns, spill_dir=spill_dir)
+
+        result = CalibrationCache().get(self.path, spill_dir=spill_dir)
+        self.assertEqual(result['meta'], self.meta)
+        np.testing.assert_array_equal(result['columns']['freq'], self.columns['freq'])
+
+    def test_invalidate_spill(self):
+        """测试文件被覆盖或移动前释放缓存条目并删除落盘文件"""
+        spill_dir = os.path.join(self.tmpdir.name, "cache")
+        cache = CalibrationCache(spill_min_points=1)
+        cache.put(self.path, self.meta, self.columns, spill_dir=spill_dir)
+        self.assertEqual(len(os.listdir(spill_dir)), 1)
+
+        cache.invalidate(self.path, spill_dir=spill_dir)
+        self.assertEqual(os.listdir(spill_dir), [])
+        self.assertIsNone(cache.get(self.path, spill_dir=spill_dir))
+
+
+if __name__ == '__main__':
+    unittest.main()
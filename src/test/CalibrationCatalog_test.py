@@ -0,0 +1,73 @@
+import unittest
+import sys
+import os
+import tempfile
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))  # 添加src目录
+
+from app.controllers.CalibrationCatalog import CalibrationCatalog
+
+
+class TestCalibrationCatalog(unittest.TestCase):
+    """CalibrationCatalog 单元测试类"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.summarized = []
+        self.catalog = CalibrationCatalog(os.path.join(self.tmpdir.name, "catalog.sqlite3"), self._summarize)
+        self.files = {
+            'x.csv': {'start_ghz': 8.0, 'stop_ghz': 11.0, 'polarization': 'THETA', 'ref_powers': ',-20.0,'},
+            'ka.csv': {'start_ghz': 26.5, 'stop_ghz': 40.0, 'polarization': 'PHI', 'ref_powers': ',-10.0,-5.0,'},
+        }
+        for name in self.files:
+            with open(self._path(name), 'w') as f:
+                f.write(name)
+
+    def tearDown(self):
+        self.catalog.close()
+        self.tmpdir.cleanup()
+
+    def _path(self, name):
+        return os.path.join(self.tmpdir.name, name)
+
+    def _summarize(self, path):
+        self.summarized.append(os.path.basename(path))
+        return self.files.get(os.path.basename(path))
+
+    def _paths(self):
+        return [self._path(name) for name in self.files if os.path.exists(self._path(name))]
+
+    def test_incremental_refresh(self):
+        """测试未变化的文件不重复读取，删除的文件从索引中移除"""
+        self.assertEqual(self.catalog.refresh(self._paths()), 2)
+        self.assertEqual(self.catalog.refresh(self._paths()), 0)
+        self.assertEqual(len(self.summarized), 2)
+
+        with open(self._path('x.csv'), 'a') as f:
+            f.write('changed')
+        self.assertEqual(self.catalog.refresh(self._paths()), 1)
+
+        os.remove(self._path('ka.csv'))
+        self.catalog.refresh(self._paths())
+        self.assertEqual([r['filename'] for r in self.catalog.query()], ['x.csv'])
+
+    def test_query(self):
+        """测试按频段、极化和参考功率查询"""
+        self.catalog.refresh(self._paths())
+        self.assertEqual([r['filename'] for r in self.catalog.query(band='KA')], ['ka.csv'])
+        self.assertEqual([r['filename'] for r in self.catalog.query(polarization='theta')], ['x.csv'])
+        self.assertEqual([r['filename'] for r in self.catalog.query(ref_power=-5)], ['ka.csv'])
+        self.assertEqual(self.catalog.query(band='KU'), [])
+
+    def test_digest(self):
+        """测试校验结果在文件变化后失效"""
+        self.catalog.record_digest(self._path('x.csv'), 'abc', True)
+        self.assertTrue(self.catalog.is_verified(self._path('x.csv')))
+
+        with open(self._path('x.csv'), 'a') as f:
+            f.write('changed')
+        self.assertFalse(self.catalog.is_verified(self._path('x.csv')))
+
+
+if __name__ == '__main__':
+    unittest.main()
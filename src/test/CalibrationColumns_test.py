@@ -0,0 +1,100 @@
+import unittest
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))  # 添加src目录
+
+import numpy as np
+
+from app.models.CalibrationColumns import CalibrationColumns, CalibrationPoints
+
+
+class TestCalibrationColumns(unittest.TestCase):
+    """CalibrationColumns 单元测试类"""
+
+    POINTS = [
+        {'freq': 8.0, 'theta': -10.0, 'phi': -11.0, 'horn_gain': 1.5,
+         'theta_corrected': -11.5, 'phi_corrected': -12.5,
+         'theta_corrected_vm': 0.1, 'phi_corrected_vm': 0.2},
+        {'freq': 9.0, 'theta': -20.0, 'phi': -21.0, 'horn_gain': 2.5,
+         'theta_corrected': -22.5, 'phi_corrected': -23.5,
+         'theta_corrected_vm': 0.3, 'phi_corrected_vm': 0.4,
+         'reference_power': -5.0, 'polarization': 'PHI'},
+    ]
+
+    def test_append_growth(self):
+        """测试逐点追加超出预分配容量时扩容并保留已有数据"""
+        columns = CalibrationColumns(16)
+        for i in range(20):
+            columns.append(8.0 + i, theta=-float(i), polarization='theta')
+        self.assertEqual(len(columns), 20)
+        self.assertEqual(columns.capacity, 32)
+        np.testing.assert_array_equal(columns['freq'], 8.0 + np.arange(20))
+        np.testing.assert_array_equal(columns['theta'], -np.arange(20.0))
+        self.assertTrue(np.isnan(columns['reference_power']).all())
+        self.assertFalse(columns.has_reference_power)
+        self.assertTrue(columns.has_polarization)
+
+    def test_extend(self):
+        """测试批量追加按需扩容，缺失的列按默认值填充"""
+        columns = CalibrationColumns(16)
+        columns.append(7.0)
+        columns.extend(freq=np.linspace(8.0, 12.0, 30), theta=-10.0, polarization='DUAL')
+        self.assertEqual(len(columns), 31)
+        self.assertGreaterEqual(columns.capacity, 31)
+        self.assertEqual(columns['freq'][0], 7.0)
+        self.assertEqual(columns['theta'][1], -10.0)
+        self.assertEqual(columns['phi'][1], 0.0)
+        self.assertEqual(columns.polarization_names()[1:].tolist(), ['DUAL'] * 30)
+        with self.assertRaises(ValueError):
+            columns.extend(theta=[1.0])
+
+    def test_column_view(self):
+        """测试column()返回长度为当前点数的只读视图"""
+        columns = CalibrationColumns(16)
+        columns.append(8.0)
+        columns.append(9.0)
+        view = columns.column('freq')
+        self.assertEqual(len(view), 2)
+        self.assertFalse(view.flags.writeable)
+        with self.assertRaises(ValueError):
+            view[0] = 1.0
+        # 视图引用底层数组，不复制
+        self.assertTrue(np.shares_memory(view, columns['freq']))
+
+    def test_points_round_trip(self):
+        """测试数据点字典与列式存储互相转换后一致"""
+        columns = CalibrationColumns.from_points(self.POINTS)
+        self.assertEqual(columns.to_points(), self.POINTS)
+        self.assertTrue(columns.has_reference_power)
+
+        copy = CalibrationColumns.from_arrays(**{name: columns[name] for name in CalibrationColumns.COLUMNS})
+        self.assertEqual(copy.to_points(), self.POINTS)
+
+    def test_lazy_points(self):
+        """测试惰性数据点序列的索引、负索引和切片"""
+        columns = CalibrationColumns.from_arrays(freq=np.arange(10.0), theta=np.arange(10.0) - 20)
+        points = columns.points()
+        self.assertIsInstance(points, CalibrationPoints)
+        self.assertEqual(len(points), 10)
+        self.assertEqual(points[-1]['freq'], 9.0)
+        self.assertEqual([point['freq'] for point in points[2:8:3]], [2.0, 5.0])
+        self.assertEqual(points[3:1], [])
+        with self.assertRaises(IndexError):
+            points[10]
+
+        # 每次访问构建新的字典，修改不会写回列数据
+        points[0]['theta'] = 0.0
+        self.assertEqual(points[0]['theta'], -20.0)
+
+    def test_polarization_names(self):
+        """测试极化编码与字符串互相转换，未记录的为空字符串"""
+        columns = CalibrationColumns.from_arrays(
+            freq=np.arange(4.0), polarization=['theta', 'PHI', 'DUAL', 'unknown']
+        )
+        self.assertEqual(columns.polarization_names().tolist(), ['THETA', 'PHI', 'DUAL', ''])
+        self.assertEqual(columns.point(1)['polarization'], 'PHI')
+        self.assertNotIn('polarization', columns.point(3))
+
+
+if __name__ == '__main__':
+    unittest.main()
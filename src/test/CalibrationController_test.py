@@ -0,0 +1,128 @@
+import unittest
+import sys
+import os
+import tempfile
+import threading
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))  # 添加src目录
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication
+
+from app.widgets.CalibrationPanel.View import CalibrationView
+from app.widgets.CalibrationPanel.Model import CalibrationModel
+from app.widgets.CalibrationPanel.Controller import CalibrationController
+
+
+class FakeSource:
+    """模拟信号源，第stop_at个频点开始时通知测试并等待中止"""
+
+    def __init__(self, stop_at: int):
+        self.stop_at = stop_at
+        self.frequencies = []
+        self.reached = threading.Event()
+        self.resume = threading.Event()
+
+    def reset(self):
+        pass
+
+    def set_power(self, power_dbm):
+        pass
+
+    def set_output(self, state):
+        pass
+
+    def set_frequency(self, freq_hz):
+        self.frequencies.append(freq_hz)
+        if len(self.frequencies) == self.stop_at:
+            self.reached.set()
+            self.resume.wait(5)
+
+
+class FakeSensor:
+    """模拟功率计，读数固定"""
+
+    def reset(self):
+        pass
+
+    def set_frequency_correction(self, offset_db):
+        pass
+
+    def set_averaging(self, count):
+        pass
+
+    def measure_power(self, freq_hz=None):
+        return -10.0
+
+
+class TestCalibrationController(unittest.TestCase):
+    """CalibrationController 单元测试类"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.tmpdir.name)  # 控制器在当前目录下创建calibrations
+        self.logs = []
+        self.controller = CalibrationController(CalibrationView(), CalibrationModel())
+        self.controller.set_log_callback(lambda msg, level="INFO": self.logs.append((msg, level)))
+
+    def tearDown(self):
+        self.controller.cal_manager.catalog.close()
+        os.chdir(self.cwd)
+        self.tmpdir.cleanup()
+
+    def test_stop_with_queued_batch(self):
+        """测试中止时线程已发出但尚未处理的校准点批次仍写入文件后才关闭文件"""
+        manager = self.controller.cal_manager
+        freqs = [8.0, 9.0, 10.0, 11.0, 12.0]
+        manager.create_new_calibration(
+            {'operator': 'TEST', 'signal_gen': ('SG', 'SG001'), 'power_meter': ('PM', 'PM001'),
+             'antenna': ('ANT', 'ANT001'), 'environment': (25.0, 50.0)},
+            {'start_ghz': 8.0, 'stop_ghz': 12.0, 'step_ghz': 'FreqList', 'custom_freqs': freqs},
+            {'ref_power': -10.0, 'polarization': 'THETA'}
+        )
+        path = manager.active_file
+        self.controller._model.reset_calibration(len(freqs))
+
+        source = FakeSource(stop_at=4)
+        self.controller._calibration_service.start_calibration(
+            signal_source=source,
+            power_meter=FakeSensor(),
+            freq_list=[f * 1e9 for f in freqs],
+            ref_power=-10.0,
+            progress_callback=lambda *args: None,
+            points_callback=self.controller._save_calibration_points,
+            finished_callback=self.controller._on_calibration_finished,
+            error_callback=self.controller._on_calibration_error,
+            dwell_time=0,
+            ui_rate_hz=1e-3  # 校准点只在线程结束时整批发出
+        )
+        self.assertTrue(source.reached.wait(5))
+        threading.Timer(0.1, source.resume.set).start()
+        self.controller._on_stop()
+        self.assertIsNotNone(manager.active_file)  # 批次处理前文件仍打开
+
+        self.app.processEvents()
+        self.assertIsNone(manager.active_file)
+        rows = [line for line in Path(path).read_text(encoding='utf-8').splitlines() if line[:1].isdigit()]
+        self.assertEqual(len(rows), 4)
+        self.assertFalse([msg for msg, level in self.logs if level == "ERROR"])
+
+    def test_polarization_switch_only_for_dual(self):
+        """测试只有双极化单功率计校准才通过链路切换极化"""
+        class ConnectedScpi:
+            is_connected = True
+
+        self.controller._scpi = ConnectedScpi()
+        self.controller._polarization = "THETA"
+        self.assertNotIn('polarization_switch', self.controller._polarization_options())
+        self.controller._polarization = "DUAL"
+        self.assertIn('polarization_switch', self.controller._polarization_options())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,192 @@
+import unittest
+import sys
+import hashlib
+import tempfile
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))  # 添加src目录
+
+import numpy as np
+
+from app.controllers.CalibrationFileManager import CalibrationFileManager
+from app.threads.CalibrationThread import CalibrationPoint
+
+
+class TestCalibrationFileManager(unittest.TestCase):
+    """CalibrationFileManager 合并与修补单元测试类"""
+
+    EQUIPMENT = {
+        'operator': 'TEST',
+        'signal_gen': ('SG', 'SG001'),
+        'power_meter': ('PM', 'PM001'),
+        'antenna': ('ANT', 'ANT001'),
+        'environment': (25.0, 50.0)
+    }
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.manager = CalibrationFileManager(base_dir=self.tmpdir.name, log_callback=lambda msg, level="INFO": None)
+
+    def tearDown(self):
+        self.manager.catalog.close()
+        self.tmpdir.cleanup()
+
+    def _calibrate(self, freqs, polarization, value, notes=None):
+        """生成一个所有测量值都为value的校准文件"""
+        self.manager.create_new_calibration(
+            self.EQUIPMENT,
+            {'start_ghz': freqs[0], 'stop_ghz': freqs[-1], 'step_ghz': 'FreqList', 'custom_freqs': list(freqs)},
+            {'ref_power': -10.0, 'polarization': polarization},
+            version_notes=notes
+        )
+        for freq in freqs:
+            self.manager.add_data_point(freq, {
+                'theta': value, 'phi': value, 'horn_gain': 1.0,
+                'theta_corrected': value, 'phi_corrected': value,
+                'theta_corrected_vm': value, 'phi_corrected_vm': value
+            })
+        csv_path, _ = self.manager.finalize_calibration()
+        return csv_path
+
+    def _columns(self, path):
+        return self.manager.load_calibration_file(path)['columns']
+
+    def test_merge_polarizations(self):
+        """测试相同频点的THETA和PHI数据合并为DUAL"""
+        theta = self._calibrate([8.0, 9.0], 'THETA', -10.0)
+        phi = self._calibrate([9.0, 10.0], 'PHI', -20.0)
+        merged, _ = self.manager.merge_calibration_files([theta, phi])
+
+        columns = self._columns(merged)
+        np.testing.assert_array_equal(columns['freq'], [8.0, 9.0, 10.0])
+        self.assertEqual(columns.polarization_names().tolist(), ['THETA', 'DUAL', 'PHI'])
+        self.assertEqual(columns.point(1)['theta'], -10.0)
+        self.assertEqual(columns.point(1)['phi'], -20.0)
+
+    def test_patch(self):
+        """测试局部重测只替换对应频点的同极化数据，版本说明记录来源"""
+        source = self._calibrate([8.0, 9.0, 10.0, 11.0], 'DUAL', -10.0, notes="Original run")
+        patch = self._calibrate([9.0, 10.0], 'THETA', -12.0)
+        patched, _ = self.manager.patch_calibration(source, patch)
+
+        result = self.manager.load_calibration_file(patched)
+        columns = result['columns']
+        np.testing.assert_array_equal(columns['freq'], [8.0, 9.0, 10.0, 11.0])
+        np.testing.assert_array_equal(columns['theta'], [-10.0, -12.0, -12.0, -10.0])
+        np.testing.assert_array_equal(columns['phi'], [-10.0, -10.0, -10.0, -10.0])
+        self.assertEqual(columns.polarization_names().tolist(), ['DUAL'] * 4)
+
+        notes = result['meta']['version_notes']
+        self.assertIn("2 points replaced", notes)
+        self.assertIn(Path(source).name, notes)
+        self.assertIn("Original run", notes)
+
+    def test_patch_merged_file(self):
+        """测试修补合并文件得到的新版本不被当作已合并文件跳过"""
+        theta = self._calibrate([8.0, 9.0], 'THETA', -10.0)
+        phi = self._calibrate([8.0, 9.0], 'PHI', -20.0)
+        merged, _ = self.manager.merge_calibration_files([theta, phi])
+        self.assertTrue(self.manager._is_merged_file(merged))
+
+        patch = self._calibrate([9.0], 'THETA', -12.0)
+        patched, _ = self.manager.patch_calibration(merged, patch)
+        self.assertFalse(self.manager._is_merged_file(patched))
+        self.assertIn("Merged calibration file", self.manager.load_calibration_file(patched)['meta']['version_notes'])
+
+    def test_adaptive_finalize(self):
+        """测试自适应校准完成时数据行按频率排序，文件头记录实际点数"""
+        self.manager.create_new_calibration(
+            self.EQUIPMENT,
+            {'start_ghz': 8.0, 'stop_ghz': 12.0, 'step_ghz': 'Adaptive', 'max_points': 400},
+            {'ref_power': -10.0, 'polarization': 'THETA'}
+        )
+        for freq in [8.0, 10.0, 12.0, 9.0, 11.0, 8.5]:
+            self.manager.add_data_point(freq, {'theta': -freq, 'phi': -freq})
+        csv_path, bin_path = self.manager.finalize_calibration()
+
+        self.assertTrue(self.manager.verify_csv_digest(csv_path))
+        text = Path(csv_path).read_text(encoding='utf-8')
+        self.assertIn("!  Points: 6\n", text)
+        expected = [8.0, 8.5, 9.0, 10.0, 11.0, 12.0]
+        rows = [line.split(',') for line in text.splitlines() if line[:1].isdigit()]
+        self.assertEqual([float(row[0]) for row in rows], expected)
+        self.assertEqual([float(row[1]) for row in rows], [-f for f in expected])
+        columns = self.manager.load_calibration_file(bin_path, use_cache=False)['columns']
+        np.testing.assert_array_equal(columns['freq'], expected)
+        self.assertEqual(self.manager.catalog.get(csv_path)['points'], 6)
+
+    def test_close_session(self):
+        """测试中止校准时关闭写入会话，已写入的数据保留在文件中"""
+        self.manager.create_new_calibration(
+            self.EQUIPMENT,
+            {'start_ghz': 8.0, 'stop_ghz': 9.0, 'step_ghz': 'FreqList', 'custom_freqs': [8.0, 9.0]},
+            {'ref_power': -10.0, 'polarization': 'THETA'}
+        )
+        self.manager.add_data_point(8.0, {'theta': -10.0, 'phi': -10.0})
+        session = self.manager._session
+        path = self.manager.active_file
+        self.manager.close_session()
+
+        self.assertTrue(session.closed)
+        self.assertIsNone(self.manager.active_file)
+        self.assertIn("8.000000,-10.00", Path(path).read_text(encoding='utf-8'))
+        with self.assertRaises(RuntimeError):
+            self.manager.add_data_point(9.0, {'theta': -10.0, 'phi': -10.0})
+
+    def test_add_calibration_points(self):
+        """测试批量添加校准点与逐点添加写入相同的数据"""
+        def points():
+            return [
+                CalibrationPoint(freq_hz=freq * 1e9, expected_power=-10.0, measured_power=-12.0, delta=-2.0,
+                                 timestamp='', measured_theta=-12.0 - freq, measured_phi=-13.0,
+                                 ref_power=-10.0, horn_gain=15.5, distance=2.0)
+                for freq in (8.0, 9.5, 12.0)
+            ]
+
+        results = []
+        for batch in (False, True):
+            self.manager.create_new_calibration(
+                self.EQUIPMENT,
+                {'start_ghz': 8.0, 'stop_ghz': 12.0, 'step_ghz': 'FreqList', 'custom_freqs': [8.0, 9.5, 12.0]},
+                {'ref_power': -10.0, 'polarization': 'DUAL'}
+            )
+            if batch:
+                self.assertEqual(self.manager.add_calibration_points(points()), 3)
+            else:
+                for point in points():
+                    self.manager.add_calibration_point(point)
+            csv_path, _ = self.manager.finalize_calibration()
+            results.append(self._columns(csv_path))
+
+        for name in ('freq', 'theta', 'horn_gain', 'theta_corrected', 'phi_corrected_vm'):
+            np.testing.assert_array_equal(results[0][name], results[1][name])
+
+    def _write_fixture(self, path, body: bytes, digest: str):
+        """写入指定内容和MD5行的CSV文件"""
+        Path(path).write_bytes(body + f"!MD5: {digest}\n".encode('ascii'))
+        return str(path)
+
+    def test_crlf_digest(self):
+        """测试Windows文本模式写出的文件(MD5按CRLF计算)可以通过校验，校验失败仍可加载"""
+        source = self._calibrate([8.0, 9.0], 'THETA', -10.0)
+        raw = Path(source).read_bytes()
+        body = raw[:raw.rfind(b'\n!MD5:') + 1].replace(b'\r\n', b'\n')
+        crlf_body = body.replace(b'\n', b'\r\n')
+        crlf_digest = hashlib.md5(crlf_body).hexdigest()
+
+        # CRLF文件及其MD5
+        crlf_file = self._write_fixture(Path(self.tmpdir.name) / "crlf.csv", crlf_body, crlf_digest)
+        self.assertTrue(self.manager.verify_csv_digest(crlf_file))
+        # 换行已转换为LF，但MD5仍是CRLF内容的
+        lf_file = self._write_fixture(Path(self.tmpdir.name) / "lf.csv", body, crlf_digest)
+        self.assertTrue(self.manager.verify_csv_digest(lf_file))
+
+        # MD5不匹配但内容可以解析: 警告后照常加载
+        bad_file = self._write_fixture(Path(self.tmpdir.name) / "bad.csv", body, "0" * 32)
+        self.assertFalse(self.manager.verify_csv_digest(bad_file))
+        result = self.manager.load_calibration_file(bad_file, verify_digest=True)
+        self.assertIsNotNone(result)
+        np.testing.assert_array_equal(result['columns']['freq'], [8.0, 9.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
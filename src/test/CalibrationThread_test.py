@@ -0,0 +1,258 @@
+import unittest
+import sys
+import threading
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))  # 添加src目录
+
+from PyQt5.QtCore import QCoreApplication
+
+from app.threads.CalibrationThread import CalibrationThread
+
+
+class FakeSource:
+    """模拟信号源，记录设置命令"""
+
+    def __init__(self):
+        self.commands = []
+        self.freq_hz = None
+        self.power_dbm = None
+
+    def reset(self):
+        pass
+
+    def set_frequency(self, freq_hz):
+        self.freq_hz = freq_hz
+        self.commands.append(('freq', freq_hz))
+
+    def set_power(self, power_dbm):
+        self.power_dbm = power_dbm
+        self.commands.append(('power', power_dbm))
+
+    def set_output(self, state):
+        self.commands.append(('output', state))
+
+
+class FakeSensor:
+    """模拟功率计，读数为信号源设置功率加offset_db，第fail_after次读数后出错"""
+
+    def __init__(self, source: FakeSource, offset_db: float = 0.0, fail_after: int = None):
+        self.source = source
+        self.offset_db = offset_db
+        self.fail_after = fail_after
+        self.reads = 0
+
+    def reset(self):
+        pass
+
+    def set_frequency_correction(self, offset_db):
+        pass
+
+    def set_averaging(self, count):
+        pass
+
+    def measure_power(self, freq_hz=None):
+        self.reads += 1
+        if self.fail_after is not None and self.reads > self.fail_after:
+            raise IOError("功率计无响应")
+        return self.source.power_dbm + self.offset_db
+
+
+class DriftingSource(FakeSource):
+    """实际输出功率随频点漂移的模拟信号源(power_dbm为实际输出)"""
+
+    def __init__(self, drift_step_db: float):
+        super().__init__()
+        self.drift_step_db = drift_step_db
+        self.drift_db = 0.0
+        self.nominal_dbm = None
+
+    def set_frequency(self, freq_hz):
+        super().set_frequency(freq_hz)
+        self.drift_db += self.drift_step_db
+        self.power_dbm = self.nominal_dbm + self.drift_db
+
+    def set_power(self, power_dbm):
+        super().set_power(power_dbm)
+        self.nominal_dbm = power_dbm
+        self.power_dbm = power_dbm + self.drift_db
+
+
+class BarrierSensor(FakeSensor):
+    """只有与另一个功率计同时读取时才返回的模拟功率计"""
+
+    def __init__(self, source: FakeSource, offset_db: float, barrier: threading.Barrier):
+        super().__init__(source, offset_db)
+        self.barrier = barrier
+
+    def measure_power(self, freq_hz=None):
+        self.barrier.wait()
+        return super().measure_power(freq_hz)
+
+
+class LinkSensor(FakeSensor):
+    """读数随链路极化变化的模拟功率计，settle为首次切换后的读数过渡量"""
+
+    OFFSETS = {'THETA': -3.0, 'PHI': -6.0}
+
+    def __init__(self, source: FakeSource, settle=()):
+        super().__init__(source)
+        self.polarization = None
+        self.switches = []
+        self._settle = list(settle)
+
+    def switch(self, freq_hz, polarization):
+        self.switches.append((freq_hz, polarization))
+        switched = polarization != self.polarization
+        self.polarization = polarization
+        return switched
+
+    def measure_power(self, freq_hz=None):
+        self.reads += 1
+        transient = self._settle.pop(0) if self._settle else 0.0
+        return self.source.power_dbm + self.OFFSETS[self.polarization] + transient
+
+
+class TestCalibrationThread(unittest.TestCase):
+    """CalibrationThread 单元测试类(直接调用run()，信号在当前线程同步发出)"""
+
+    FREQS = [8e9, 9e9, 10e9, 11e9]
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QCoreApplication.instance() or QCoreApplication([])
+
+    def setUp(self):
+        self.source = FakeSource()
+
+    def _run(self, sensor=None, freq_list=None, **options):
+        """运行校准，返回(批次列表, 完成结果, 错误列表, 进度列表)"""
+        options.setdefault('dwell_time', 0)
+        options.setdefault('power_settle_time', 0)
+        thread = CalibrationThread(
+            self.source, sensor or FakeSensor(self.source, -3.0),
+            self.FREQS if freq_list is None else freq_list, -10.0, **options
+        )
+        batches, finished, errors, progress = [], [], [], []
+        thread.points_completed.connect(batches.append)
+        thread.calibration_finished.connect(finished.append)
+        thread.error_occurred.connect(errors.append)
+        thread.progress_updated.connect(lambda value, message: progress.append((value, message)))
+        thread.run()
+        self.thread = thread
+        return batches, finished, errors, progress
+
+    def test_batched_points(self):
+        """测试校准点按UI刷新率批量发送，结束时发送剩余的点"""
+        batches, finished, errors, progress = self._run(ui_rate_hz=1e-3)
+        self.assertEqual([len(batch) for batch in batches], [4])
+        self.assertEqual(len(finished), 1)
+        self.assertEqual([point.freq_hz for point in finished[0]], self.FREQS)
+        self.assertEqual(errors, [])
+        self.assertEqual(progress[-1], (100, "校准完成"))
+        self.assertEqual(finished[0][0].measured_theta, -13.0)
+
+    def test_unthrottled_points(self):
+        """测试ui_rate_hz为0时逐点发送"""
+        batches, _, _, progress = self._run(ui_rate_hz=0)
+        self.assertEqual([len(batch) for batch in batches], [1, 1, 1, 1])
+        self.assertEqual([value for value, _ in progress[:4]], [25, 50, 75, 100])
+
+    def test_flush_on_error(self):
+        """测试出错时已完成的点仍整批发出"""
+        sensor = FakeSensor(self.source, fail_after=2)
+        batches, finished, errors, _ = self._run(sensor, ui_rate_hz=1e-3)
+        self.assertEqual([len(batch) for batch in batches], [2])
+        self.assertEqual(finished, [])
+        self.assertEqual(len(errors), 1)
+        self.assertIn("10.000GHz", errors[0])
+        self.assertEqual(self.source.commands[-1], ('output', False))
+
+    def test_ref_power_sweep(self):
+        """测试多参考功率嵌套扫描: 每个频点只设置一次频率，依次步进各参考功率"""
+        _, finished, _, _ = self._run(freq_list=[8e9, 9e9], ref_powers=[-10.0, -5.0, 0.0])
+        points = finished[0]
+        self.assertEqual([(p.freq_hz, p.ref_power) for p in points],
+                         [(8e9, -10.0), (8e9, -5.0), (8e9, 0.0), (9e9, -10.0), (9e9, -5.0), (9e9, 0.0)])
+        self.assertEqual([p.measured_theta for p in points], [-13.0, -8.0, -3.0] * 2)
+
+        commands = [c for c in self.source.commands if c[0] != 'output']
+        self.assertEqual(commands, [
+            ('power', -10.0),
+            ('freq', 8e9), ('power', -5.0), ('power', 0.0),
+            ('freq', 9e9), ('power', -10.0), ('power', -5.0), ('power', 0.0),
+        ])
+
+    def test_dual_sensors_parallel(self):
+        """测试双极化两个功率计同时读取，分别记录Theta/Phi"""
+        barrier = threading.Barrier(2, timeout=2)
+        _, finished, errors, _ = self._run(
+            BarrierSensor(self.source, -3.0, barrier), polarization="DUAL",
+            power_meter_phi=BarrierSensor(self.source, -6.0, barrier)
+        )
+        self.assertEqual(errors, [])
+        self.assertEqual({(p.measured_theta, p.measured_phi) for p in finished[0]}, {(-13.0, -16.0)})
+
+    def test_link_switch(self):
+        """测试单功率计通过链路切换测量双极化，每个频点先测当前极化"""
+        sensor = LinkSensor(self.source)
+        _, finished, _, _ = self._run(
+            sensor, freq_list=[8e9, 9e9, 10e9], polarization="DUAL",
+            polarization_switch=sensor.switch, switch_settle_time=0
+        )
+        self.assertEqual({(p.measured_theta, p.measured_phi) for p in finished[0]}, {(-13.0, -16.0)})
+        self.assertEqual([pol for _, pol in sensor.switches],
+                         ["THETA", "PHI", "PHI", "THETA", "THETA", "PHI"])
+
+    def test_link_switch_settle_time(self):
+        """测试首次切换时实测稳定时间，并使用稳定后的读数"""
+        sensor = LinkSensor(self.source, settle=[1.0, 0.3, 0.0])
+        _, finished, _, progress = self._run(
+            sensor, freq_list=[8e9], polarization="DUAL", polarization_switch=sensor.switch
+        )
+        self.assertIsNotNone(self.thread.switch_settle_time)
+        self.assertTrue(any("极化切换稳定时间" in message for _, message in progress))
+        self.assertEqual((finished[0][0].measured_theta, finished[0][0].measured_phi), (-13.0, -16.0))
+
+    def test_single_polarization_without_switch(self):
+        """测试单极化且未提供链路切换时只测一次，两列记录相同读数"""
+        sensor = FakeSensor(self.source, -3.0)
+        _, finished, _, _ = self._run(sensor, polarization="PHI")
+        self.assertEqual(sensor.reads, len(self.FREQS))
+        self.assertEqual({(p.measured_theta, p.measured_phi) for p in finished[0]}, {(-13.0, -13.0)})
+
+    def test_dual_requires_second_channel(self):
+        """测试双极化既没有第二个功率计也不能切换链路时报错"""
+        _, finished, errors, _ = self._run(polarization="DUAL")
+        self.assertEqual(finished, [])
+        self.assertEqual(len(errors), 1)
+
+    def test_ratio_normalization(self):
+        """测试比值模式用参考功率计读数抵消信号源漂移"""
+        self.source = DriftingSource(0.37)
+        dut = FakeSensor(self.source, -3.0)
+        reference = FakeSensor(self.source, -20.0)
+        _, finished, _, _ = self._run(dut, reference_meter=reference, coupling_db=20.0)
+        for point in finished[0]:
+            self.assertAlmostEqual(point.measured_theta, -13.0)
+        self.assertEqual(reference.reads, len(self.FREQS))
+
+        # 不使用比值模式时读数包含漂移
+        self.source = DriftingSource(0.37)
+        _, finished, _, _ = self._run(FakeSensor(self.source, -3.0))
+        self.assertAlmostEqual(finished[0][-1].measured_theta, -13.0 + 0.37 * len(self.FREQS))
+
+    def test_ratio_dual_sensors(self):
+        """测试比值模式下双功率计与参考功率计一同读取，两个极化都归一化"""
+        self.source = DriftingSource(0.5)
+        _, finished, _, _ = self._run(
+            FakeSensor(self.source, -3.0), polarization="DUAL",
+            power_meter_phi=FakeSensor(self.source, -6.0),
+            reference_meter=FakeSensor(self.source, -30.0), coupling_db=30.0
+        )
+        for point in finished[0]:
+            self.assertAlmostEqual(point.measured_theta, -13.0)
+            self.assertAlmostEqual(point.measured_phi, -16.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))  # 添加src目录
+
+import numpy as np
+
+from app.controllers.CompensationEngine import CompensationEngine
+from app.models.CalibrationColumns import CalibrationColumns
+
+
+class TestCompensationEngine(unittest.TestCase):
+    """CompensationEngine 单元测试类"""
+
+    def setUp(self):
+        freqs = np.array([8.0, 9.0, 10.0, 11.0])
+        self.columns = CalibrationColumns.from_arrays(
+            freq=np.concatenate([freqs, freqs]),
+            theta_corrected=np.array([-10.0, -12.0, -14.0, -16.0, -25.0, -27.0, -29.0, -31.0]),
+            phi_corrected=np.full(8, -30.0),
+            reference_power=np.array([-10.0] * 4 + [-20.0] * 4),
+            polarization=np.array(['DUAL'] * 8)
+        )
+        self.engine = CompensationEngine(self.columns, {'ref_power': [-10.0, -20.0], 'polarization': 'DUAL'})
+
+    def test_interpolation_modes(self):
+        """测试最近点、线性和三次样条插值"""
+        self.assertAlmostEqual(self.engine.lookup(9.5, 'THETA'), -3.0)
+        self.assertAlmostEqual(self.engine.lookup(9.4, 'THETA', mode='nearest'), -2.0)
+        self.assertAlmostEqual(self.engine.lookup(9.5, 'THETA', mode='cubic'), -3.0)
+        self.assertAlmostEqual(self.engine.lookup(8.0, 'PHI'), -20.0)
+
+    def test_power_slope(self):
+        """测试由多个参考功率估计场强对输出功率的斜率"""
+        self.assertAlmostEqual(self.engine.power_slope(9.0, 'THETA', -15.0), 1.5)
+
+    def test_ref_power_and_range(self):
+        """测试按参考功率选择补偿表，超出频率范围返回None/NaN"""
+        self.assertAlmostEqual(self.engine.lookup(9.0, 'THETA', ref_power=-19.0), -7.0)
+        self.assertIsNone(self.engine.lookup(12.0, 'THETA'))
+
+        values = self.engine.lookup_array([7.0, 8.5, 10.5], 'THETA')
+        self.assertTrue(np.isnan(values[0]))
+        np.testing.assert_allclose(values[1:], [-1.0, -5.0])
+
+    def test_bilinear_ref_power(self):
+        """测试在两个参考功率之间按输出功率双线性插值，超出范围取边界"""
+        # 9.5GHz处: ref=-10补偿-3.0, ref=-20补偿-8.0
+        self.assertAlmostEqual(self.engine.interpolate(9.5, 'THETA', -15.0), -5.5)
+        self.assertAlmostEqual(self.engine.interpolate(9.5, 'THETA', 0.0), -3.0)
+        self.assertIsNone(self.engine.interpolate(7.0, 'THETA', -15.0))
+
+        values = self.engine.interpolate_array([8.0, 9.0, 10.0], 'THETA', [-10.0, -20.0, -12.5])
+        np.testing.assert_allclose(values, [0.0, -7.0, -5.25])
+
+    def test_dense_table(self):
+        """测试密集查找表与直接插值结果一致，超出范围返回None"""
+        table = self.engine.build_dense_table(step_ghz=0.01)
+        self.assertEqual(len(table), 301)
+        self.assertEqual(table.values.dtype, np.float32)
+        self.assertAlmostEqual(table.lookup(9.5, 'THETA'), -3.0, places=5)
+        self.assertAlmostEqual(table.lookup(9.5, 'THETA', -15.0), -5.5, places=5)
+        self.assertIsNone(table.lookup(11.5, 'PHI'))
+
+        self.assertIsNone(self.engine.build_dense_table(is_cancelled=lambda: True))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))  # 添加src目录
+
+from app.controllers.FieldLeveler import FieldLeveler
+
+
+class TestFieldLeveler(unittest.TestCase):
+    """FieldLeveler 单元测试类"""
+
+    def setUp(self):
+        self.leveler = FieldLeveler(tolerance_db=0.01)
+        self.source = None
+
+    def _set_power(self, power_dbm):
+        self.source = power_dbm
+
+    def _measure(self):
+        # 带轻微压缩的链路: 斜率约0.9
+        return 0.9 * self.source + 3.0 - 0.002 * (self.source + 10.0) ** 2
+
+    def test_converges_and_caches(self):
+        """测试割线法几次迭代收敛，缓存的目标第一次测量即收敛"""
+        result = self.leveler.level(10e9, -20.0, -23.0, self._set_power, self._measure, slope=1.0)
+        self.assertTrue(result.converged)
+        self.assertLessEqual(result.iterations, 4)
+        self.assertAlmostEqual(self._measure(), -20.0, delta=0.01)
+        self.assertFalse(result.from_cache)
+
+        repeat = self.leveler.level(10e9, -20.0, -23.0, self._set_power, self._measure)
+        self.assertTrue(repeat.from_cache)
+        self.assertEqual(repeat.iterations, 1)
+        self.assertEqual(repeat.source_dbm, result.source_dbm)
+
+    def test_power_limit(self):
+        """测试目标超出信号源功率范围时停止并报告未收敛"""
+        leveler = FieldLeveler(power_limits=(-30.0, 0.0))
+        result = leveler.level(10e9, 40.0, 0.0, self._set_power, self._measure)
+        self.assertFalse(result.converged)
+        self.assertEqual(result.source_dbm, 0.0)
+        self.assertIsNone(leveler.cached(10e9, 40.0))
+
+    def test_invalid_measurement(self):
+        """测试测量值为NaN时中止调平，不发送NaN功率也不缓存结果"""
+        readings = iter([-20.0, float('nan'), -10.0])
+        sent = []
+        result = self.leveler.level(10e9, -10.0, -20.0, sent.append, lambda: next(readings))
+        self.assertFalse(result.converged)
+        self.assertEqual(sent, [-20.0, -10.0])
+        self.assertIsNone(self.leveler.cached(10e9, -10.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
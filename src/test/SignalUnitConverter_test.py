@@ -1,5 +1,6 @@
 import unittest
 import math
+import numpy as np
 
 import time
 import sys
@@ -101,6 +102,14 @@ class TestSignalUnitConverter(unittest.TestCase):
         
         valid, val, unit = self.converter.validate_frequency("invalid")
         self.assertFalse(valid)
+        self.assertTrue(self.converter.validate_frequency(" 8.5 GHz ")[0])
+        # 输入框文本后追加了下拉框单位，输入的单位优先
+        self.assertEqual(self.converter.validate_frequency("8GHz GHz"), (True, 8.0, "GHz"))
+        self.assertEqual(self.converter.validate_frequency("10 MHz GHz"), (True, 10.0, "MHz"))
+        self.assertEqual(self.converter.validate_frequency("10 G GHz"), (True, 10.0, "GHz"))
+        self.assertEqual(self.converter.validate_frequency("10 GHz"), (True, 10.0, "GHz"))
+        self.assertFalse(self.converter.validate_frequency("1,500 MHz")[0])
+        self.assertFalse(self.converter.validate_frequency("12,5 GHz")[0])
     
     def test_validate_power(self):
         """测试功率验证"""
@@ -240,6 +249,47 @@ class TestSignalUnitConverter(unittest.TestCase):
         self.assertEqual(self.converter._normalize_efield_unit("v/m"), "V/m")
         self.assertEqual(self.converter._normalize_efield_unit("dbuv/m"), "dBμV/m")
 
+    def test_parse_input(self):
+        """测试输入解析支持指数、单位别名，并缓存解析结果"""
+        self.assertEqual(self.converter.validate_power("1e-3 W"), (True, 1e-3, "W"))
+        self.assertEqual(self.converter.validate_power("5 uv/m dBm"), (True, 5.0, "µV/m"))
+        self.assertEqual(self.converter.validate_power("10 dB W"), (True, 10.0, "dBW"))
+        self.assertEqual(self.converter.validate_frequency("2.4e9 Hz"), (True, 2.4e9, "Hz"))
+
+        self.converter.validate_power("-12.5 dBm")
+        hits = self.converter._parse_power.cache_info().hits
+        self.converter.validate_power("-12.5 dBm")
+        self.assertEqual(self.converter._parse_power.cache_info().hits, hits + 1)
+
+    def test_array_conversions(self):
+        """测试数组转换与标量转换结果一致，并支持广播"""
+        dbm = np.array([-30.0, -17.57, 0.0])
+        freqs = np.array([[1e9], [18.04e9]])
+        v_m = self.converter.dbm_to_v_m_array(dbm, freqs, 3.0)
+        self.assertEqual(v_m.shape, (2, 3))
+        for i, freq in enumerate(freqs[:, 0]):
+            for j, value in enumerate(dbm):
+                self.assertAlmostEqual(v_m[i, j], self.converter.dbm_to_v_m(value, freq, 3.0))
+
+        np.testing.assert_allclose(
+            self.converter.convert_power_array([0.0, 30.0], 'dBm', 'W'), [1e-3, 1.0]
+        )
+        np.testing.assert_array_equal(
+            self.converter.v_m_to_dbuV_m_array([0.0, -1.0]), [-math.inf, -math.inf]
+        )
+
+    def test_invalid_link_params(self):
+        """测试标量换算在频率、距离或增益非正时抛出ValueError，数组换算不抛出"""
+        with self.assertRaises(ValueError):
+            self.converter.dbm_to_dbuV_m(0, 0)
+        with self.assertRaises(ValueError):
+            self.converter.dbuV_m_to_dbm(100, 1e9, distance=-1)
+        with self.assertRaises(ValueError):
+            self.converter.dbm_to_v_m(0, 1e9, antenna_gain=0)
+        with self.assertRaises(ValueError):
+            self.converter.v_m_to_dbm(1, float('nan'))
+        self.assertTrue(np.isnan(self.converter.dbm_to_dbuV_m_array(0, -1e9)))
+
 if __name__ == '__main__':
 
     unittest.main()
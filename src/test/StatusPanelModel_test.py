@@ -0,0 +1,36 @@
+import unittest
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))  # 添加src目录
+
+from app.widgets.StatusPanel.Model import StatusPanelModel
+
+
+class TestStatusPanelModel(unittest.TestCase):
+    """StatusPanelModel 单元测试类"""
+
+    def setUp(self):
+        self.model = StatusPanelModel()
+
+    def test_status_state(self):
+        """测试状态文本到状态键的映射及与样式的一致性"""
+        self.assertEqual(self.model.get_status_state("OK"), 'OK')
+        self.assertEqual(self.model.get_status_state("no pa"), 'NO')
+        self.assertEqual(self.model.get_status_state("ERROR"), 'error')
+        self.assertEqual(self.model.get_status_state("连接失败"), 'error')
+        self.assertEqual(self.model.get_status_state("-20.00 dBm"), 'default')
+        self.assertEqual(self.model.get_status_style("OK"), self.model.status_colors['OK'])
+
+    def test_stylesheet(self):
+        """测试样式表包含所有状态的属性选择器"""
+        qss = self.model.build_stylesheet()
+        for key in self.model.status_colors:
+            self.assertIn(f'QLabel[statusState="{key}"]', qss)
+        for level in list(self.model.speed_colors) + ['default']:
+            self.assertIn(f'QLabel[speedLevel="{level}"]', qss)
+        self.assertEqual(self.model.get_speed_level("MID2 "), 'MID2')
+        self.assertEqual(self.model.get_speed_level("?"), 'default')
+
+
+if __name__ == '__main__':
+    unittest.main()
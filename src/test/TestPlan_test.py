@@ -0,0 +1,71 @@
+import unittest
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))  # 添加src目录
+
+import numpy as np
+
+from app.controllers.CompensationEngine import CompensationEngine
+from app.controllers.TestPlan import TestPlan
+from app.models.CalibrationColumns import CalibrationColumns
+from app.utils.FeedBands import feed_axis_for, FEED_BANDS
+
+
+class TestTestPlan(unittest.TestCase):
+    """TestPlan 单元测试类"""
+
+    def setUp(self):
+        freqs = np.array([8.0, 9.0, 10.0, 11.0])
+        columns = CalibrationColumns.from_arrays(
+            freq=np.concatenate([freqs, freqs]),
+            theta_corrected=np.array([-10.0, -12.0, -14.0, -16.0, -25.0, -27.0, -29.0, -31.0]),
+            phi_corrected=np.full(8, -30.0),
+            reference_power=np.array([-10.0] * 4 + [-20.0] * 4),
+            polarization=np.array(['DUAL'] * 8)
+        )
+        self.engine = CompensationEngine(columns, {'ref_power': [-10.0, -20.0], 'polarization': 'DUAL'})
+
+    def test_feed_axis(self):
+        """测试馈源轴与链路模式与feed_axis_for一致"""
+        bounds = [edge for band in FEED_BANDS.values() for edge in band]
+        freqs = np.array(sorted(bounds) + [1.0, 100.0])
+        plan = TestPlan.compile(freqs, -10.0, polarization='phi')
+        for i, freq in enumerate(freqs):
+            self.assertEqual(plan.axis(i), feed_axis_for(freq))
+            if plan.axis(i):
+                self.assertEqual(plan.link_mode(i), f"FEED_{feed_axis_for(freq)}_PHI")
+
+    def test_compensation(self):
+        """测试补偿后的设置功率(多参考功率时按估算输出功率再插值)"""
+        plan = TestPlan.compile([9.0, 9.5, 12.0], -15.0, engine=self.engine)
+        estimate = -15.0 - self.engine.lookup(9.0, 'THETA')
+        expected = self.engine.interpolate(9.0, 'THETA', estimate)
+        self.assertAlmostEqual(float(plan.steps['compensation_db'][0]), expected, places=5)
+        self.assertAlmostEqual(plan.steps['source_dbm'][0], -15.0 - expected, places=5)
+        # 超出校准范围: 不补偿并标记
+        self.assertFalse(plan.steps['in_range'][2])
+        self.assertEqual(plan.steps['source_dbm'][2], -15.0)
+
+    def test_target_units(self):
+        """测试目标电平单位换算和命令生成"""
+        plan = TestPlan.compile([10.0], 1.0, unit='mW')
+        self.assertAlmostEqual(plan.steps['target_dbm'][0], 0.0)
+        self.assertEqual(plan.commands(0), ["SOURce:FREQuency 10.000000GHz", "SOURce:POWer 0.00"])
+        plan = TestPlan.compile([10.0], 1.0, unit='V/m')
+        self.assertAlmostEqual(plan.steps['target_dbm'][0], plan.steps['source_dbm'][0])
+        self.assertTrue(np.isfinite(plan.steps['target_dbm'][0]))
+
+    def test_load_frequencies(self):
+        """测试读取暗室测试频点列表"""
+        path = Path(__file__).parent.parent.parent / "docs" / "通测暗室测试频点.csv"
+        if not path.exists():
+            self.skipTest("测试频点列表不存在")
+        freqs = TestPlan.load_frequencies(str(path))
+        self.assertGreater(len(freqs), 0)
+        plan = TestPlan.compile(freqs, -20.0)
+        self.assertEqual(len(plan), len(freqs))
+        self.assertGreaterEqual(plan.feed_changes, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
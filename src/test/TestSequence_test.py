@@ -0,0 +1,148 @@
+import unittest
+import sys
+import socket
+import threading
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))  # 添加src目录
+
+import numpy as np
+from PyQt5.QtCore import QMutex
+
+from app.core.scpi_commands import SCPICommands
+from app.core.tcp_client import TcpClient
+from app.controllers.TestPlan import TestPlan
+from app.controllers.TestSequence import TestSequence, SequenceRunner
+
+
+class FakeDevice:
+    """记录命令的模拟设备，馈源在查询moves次后到位"""
+
+    def __init__(self, moves=2, reached=()):
+        self.moves = moves
+        self.commands = []
+        self.reached = set(reached)
+        self._pending = {}
+
+    def send(self, cmd, expect_response=True):
+        self.commands.append(cmd)
+        if cmd.startswith("MOTion:"):
+            operation, axis = cmd.split(":")[1].split()
+            self._pending[(operation, axis)] = self.moves
+            return "OK"
+        if cmd.startswith("READ:MOTion:"):
+            operation, axis = cmd.split(":", 2)[2].split("? ")
+            key = (operation, axis)
+            if key in self._pending:
+                self._pending[key] -= 1
+                return "OK" if self._pending[key] <= 0 else "MOVING"
+            return "OK" if operation == "FEED" and axis in self.reached else "NO"
+        return "OK"
+
+
+class FakeDeviceServer:
+    """在socketpair另一端按行应答的模拟设备，供真实TcpClient连接"""
+
+    def __init__(self, device: FakeDevice):
+        self.device = device
+        self.client_sock, self._sock = socket.socketpair()
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def _serve(self):
+        buffer = b''
+        while True:
+            data = self._sock.recv(4096)
+            if not data:
+                return
+            buffer += data
+            while b'\n' in buffer:
+                line, buffer = buffer.split(b'\n', 1)
+                cmd = line.decode('utf-8')
+                resp = self.device.send(cmd)
+                if not cmd.startswith("CONFigure:LINK"):  # 链路配置命令没有应答
+                    self._sock.sendall(resp.encode('utf-8') + b'\r\n')
+
+    def close(self):
+        self.client_sock.close()
+        self._thread.join(1.0)
+        self._sock.close()
+
+
+class TestTestSequence(unittest.TestCase):
+    """TestSequence/SequenceRunner 单元测试类"""
+
+    def test_parse(self):
+        """测试JSON步骤解析和循环展开计数"""
+        sequence = TestSequence.from_list([
+            {"link": "feed_x_theta"}, {"feed": "x"},
+            {"loop": 3, "steps": [{"freq": "8.5"}, {"dwell": 0}]},
+        ])
+        self.assertEqual(len(sequence), 8)
+        self.assertEqual(sequence.steps[0].value, "FEED_X_THETA")
+        with self.assertRaises(ValueError):
+            TestSequence.from_list([{"feed": "Q"}])
+        with self.assertRaises(ValueError):
+            TestSequence.from_list([{"unknown": 1}])
+
+    def test_pipelined_feed(self):
+        """测试馈源运动期间继续发送频率和功率命令，测量前等待到位"""
+        device = FakeDevice(reached=("KU",))
+        runner = SequenceRunner(device.send, measure=lambda freq_hz: freq_hz / 1e9, poll_interval=0)
+        sequence = TestSequence.from_list([
+            {"feed": "X"}, {"freq": 9.0}, {"power": -20}, {"measure": "power"},
+        ])
+        timings = []
+        self.assertTrue(runner.run(sequence, step_callback=lambda *args: timings.append(args)))
+        self.assertEqual(len(timings), 4)
+
+        commands = device.commands
+        # 先复位已达位的KU轴，再发X轴达位
+        self.assertLess(commands.index("MOTion:HOME KU"), commands.index("MOTion:FEED X"))
+        # 频率和功率命令在X轴到位确认之前发送
+        feed = commands.index("MOTion:FEED X")
+        self.assertEqual(commands[feed + 1:feed + 3], ["SOURce:FREQuency 9.0GHz", "SOURce:POWer -20.0"])
+        self.assertIn("READ:MOTion:FEED? X", commands[feed + 3:])
+        self.assertEqual(len(runner.measurements), 1)
+        self.assertAlmostEqual(runner.measurements[0].value, 9.0)
+
+    def test_abort(self):
+        """测试中止"""
+        device = FakeDevice()
+        runner = SequenceRunner(device.send, poll_interval=0)
+        sequence = TestSequence.from_list([{"loop": 100, "steps": [{"freq": 10}]}])
+        count = []
+        completed = runner.run(sequence, step_callback=lambda *args: count.append(args),
+                               is_cancelled=lambda: len(count) >= 5)
+        self.assertFalse(completed)
+        self.assertEqual(len(device.commands), 5)
+
+    def test_from_plan(self):
+        """测试由测试计划生成序列(只在馈源轴变化时切换)"""
+        plan = TestPlan.compile(np.array([8.0, 10.0, 13.0, 14.0]), -20.0, dwell_s=0)
+        sequence = TestSequence.from_plan(plan)
+        feeds = [step.value for step in sequence.steps if step.action == 'feed']
+        self.assertEqual(feeds, [plan.axis(0), plan.axis(2)])
+        self.assertEqual(len(sequence), 4 * 3 + 2 * 2)
+
+    def test_scpi_sender(self):
+        """测试通过SCPICommands和真实TcpClient发送序列命令"""
+        server = FakeDeviceServer(FakeDevice())
+        self.addCleanup(server.close)
+        tcp_client = TcpClient()
+        tcp_client.sock, tcp_client.connected = server.client_sock, True
+        scpi = SCPICommands(tcp_client, QMutex())
+
+        # 与主窗口的序列命令发送方式一致
+        runner = SequenceRunner(
+            lambda cmd, expect_response: scpi.send_command(cmd, expect_response=expect_response)[1],
+            poll_interval=0)
+        sequence = TestSequence.from_list([
+            {"link": "FEED_X_THETA"}, {"feed": "X"}, {"freq": 9.0}, {"power": -20}, {"output": "ON"},
+        ])
+        self.assertTrue(runner.run(sequence))
+        self.assertIn("SOURce:POWer -20.0", server.device.commands)
+        self.assertEqual(server.device.commands[-1], "SOURce:OUTPut ON")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))  # 添加src目录
+
+from PyQt5.QtCore import QCoreApplication
+
+from app.core.ui_scheduler import UiUpdateScheduler
+
+
+class TestUiUpdateScheduler(unittest.TestCase):
+    """UiUpdateScheduler 单元测试类"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QCoreApplication.instance() or QCoreApplication([])
+
+    def test_coalesce(self):
+        """测试同一个键在一帧内只执行最后一次，并报告帧统计"""
+        scheduler = UiUpdateScheduler(fps=30)
+        applied, frames = [], []
+        scheduler.frame_rendered.connect(frames.append)
+        for i in range(10):
+            scheduler.schedule('progress', applied.append, i)
+        scheduler.schedule('other', applied.append, 'x')
+        scheduler.flush()
+
+        self.assertEqual(applied, [9, 'x'])
+        self.assertEqual(len(frames), 1)
+        self.assertEqual(frames[0].updates, 2)
+        self.assertEqual(frames[0].coalesced, 9)
+        self.assertEqual(scheduler.frame_count, 1)
+
+    def test_cancel_and_idle(self):
+        """测试取消更新，没有待刷新内容时不产生帧"""
+        scheduler = UiUpdateScheduler(fps=30)
+        applied = []
+        scheduler.schedule('a', applied.append, 1)
+        scheduler.cancel('a')
+        scheduler.flush()
+        self.assertEqual(applied, [])
+        self.assertEqual(scheduler.frame_count, 0)
+
+    def test_callback_error(self):
+        """测试回调出错时通过日志回调报告，其它更新照常执行"""
+        scheduler = UiUpdateScheduler(fps=30)
+        logs, applied = [], []
+        scheduler.set_log_callback(lambda msg, level="INFO": logs.append((msg, level)))
+        scheduler.schedule('bad', lambda: 1 / 0)
+        scheduler.schedule('good', applied.append, 1)
+        scheduler.flush()
+        self.assertEqual(applied, [1])
+        self.assertEqual(len(logs), 1)
+        self.assertEqual(logs[0][1], "ERROR")
+        self.assertIn("bad", logs[0][0])
+
+
+if __name__ == '__main__':
+    unittest.main()